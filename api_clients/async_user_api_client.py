@@ -0,0 +1,189 @@
+# api_clients/async_user_api_client.py
+
+import asyncio
+import logging
+import importlib.util
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from utils.async_runner import AsyncLoopThread
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 cần package h2 (httpx[http2]); thiếu thì dùng HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Client async cho các API liên quan đến user (REST API), cùng method với UserApiClient
+class AsyncUserApiClient:
+    """API Client async cho user operations trên một httpx.AsyncClient dùng chung.
+
+    Một client giữ một connection pool (HTTP/2 + keep-alive) nên hàng trăm
+    request chạy đồng thời bằng asyncio.gather chỉ dùng vài kết nối.
+    Client phải được dùng trên cùng một event loop đã tạo nó.
+    """
+
+    def __init__(self, base_url: str = "https://httpbin.org", http2: bool = True, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, timeout: float = 30.0, concurrency: int = 50):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("Package h2 is not installed, falling back to HTTP/1.1 (pip install 'httpx[http2]')")
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+            timeout=timeout,
+            headers={'Content-Type': 'application/json', 'User-Agent': f'python-httpx/{httpx.__version__}'},
+        )
+        self._stats: Dict[str, Any] = {"requests": 0, "errors": 0, "http_versions": {}}
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self._stats["errors"] += 1
+            raise
+        self._stats["requests"] += 1
+        versions = self._stats["http_versions"]
+        versions[response.http_version] = versions.get(response.http_version, 0) + 1
+        return response
+
+    async def login(self, username: str, password: str) -> httpx.Response:
+        """Login user với username và password"""
+        payload = {"username": username, "password": password}
+        return await self._request("POST", "/post", json=payload)
+
+    async def get_user_info(self, user_id: int) -> httpx.Response:
+        """Lấy thông tin user theo ID"""
+        return await self._request("GET", "/get", params={"user_id": user_id})
+
+    async def create_user(self, user_data: Dict[str, Any]) -> httpx.Response:
+        """Tạo user mới"""
+        return await self._request("POST", "/post", json=user_data)
+
+    async def update_user(self, user_id: int, user_data: Dict[str, Any]) -> httpx.Response:
+        """Cập nhật thông tin user"""
+        return await self._request("PUT", "/put", json={**user_data, "user_id": user_id})
+
+    async def delete_user(self, user_id: int) -> httpx.Response:
+        """Xóa user"""
+        return await self._request("DELETE", "/delete", params={"user_id": user_id})
+
+    async def gather(self, calls: Iterable[Callable[[], Awaitable[Any]]], concurrency: Optional[int] = None,
+                     return_exceptions: bool = False) -> List[Any]:
+        """Chạy nhiều request đồng thời (tối đa `concurrency` cùng lúc), giữ thứ tự kết quả.
+
+        Ví dụ: await client.gather(lambda i=i: client.get_user_info(i) for i in range(500))
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def _limited(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(_limited(call) for call in calls), return_exceptions=return_exceptions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Số request, lỗi và phiên bản HTTP đã dùng"""
+        return {**self._stats, "http_versions": dict(self._stats["http_versions"])}
+
+    async def aclose(self):
+        """Đóng connection pool"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncUserApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+_api_loop: Optional[AsyncLoopThread] = None
+_api_loop_lock = threading.Lock()
+
+
+def get_api_loop() -> AsyncLoopThread:
+    """Event loop nền dùng chung cho các PooledUserApiClient của process"""
+    global _api_loop
+    with _api_loop_lock:
+        if _api_loop is None:
+            _api_loop = AsyncLoopThread("api-loop").start()
+        return _api_loop
+
+
+def stop_api_loop():
+    """Dừng loop nền dùng chung (gọi khi kết thúc session, sau khi đã close các client)"""
+    global _api_loop
+    with _api_loop_lock:
+        if _api_loop is not None:
+            _api_loop.stop()
+            _api_loop = None
+
+
+# Facade sync (thay thế trực tiếp UserApiClient) chạy AsyncUserApiClient trên loop nền
+class PooledUserApiClient:
+    """API Client sync cho code/test sync, dùng chung connection pool HTTP/2 của AsyncUserApiClient.
+
+    Mỗi method chặn tới khi có response như UserApiClient; các method bulk_*
+    fan-out nhiều request cùng lúc trên loop nền rồi trả về list response.
+    """
+
+    def __init__(self, base_url: str = "https://httpbin.org", loop: Optional[AsyncLoopThread] = None, **client_options):
+        self.base_url = base_url
+        self.loop = loop or get_api_loop()
+        # httpx.AsyncClient phải được tạo trên loop sẽ dùng nó
+        self.async_client: AsyncUserApiClient = self.loop.run(self._create(base_url, client_options))
+
+    @staticmethod
+    async def _create(base_url: str, client_options: Dict[str, Any]) -> AsyncUserApiClient:
+        return AsyncUserApiClient(base_url, **client_options)
+
+    def login(self, username: str, password: str) -> httpx.Response:
+        """Login user với username và password"""
+        return self.loop.run(self.async_client.login(username, password))
+
+    def get_user_info(self, user_id: int) -> httpx.Response:
+        """Lấy thông tin user theo ID"""
+        return self.loop.run(self.async_client.get_user_info(user_id))
+
+    def create_user(self, user_data: Dict[str, Any]) -> httpx.Response:
+        """Tạo user mới"""
+        return self.loop.run(self.async_client.create_user(user_data))
+
+    def update_user(self, user_id: int, user_data: Dict[str, Any]) -> httpx.Response:
+        """Cập nhật thông tin user"""
+        return self.loop.run(self.async_client.update_user(user_id, user_data))
+
+    def delete_user(self, user_id: int) -> httpx.Response:
+        """Xóa user"""
+        return self.loop.run(self.async_client.delete_user(user_id))
+
+    # =====================
+    # Bulk (fan-out đồng thời)
+    # =====================
+    def bulk_create_users(self, users: Iterable[Dict[str, Any]], concurrency: Optional[int] = None) -> List[httpx.Response]:
+        """Tạo nhiều user cùng lúc"""
+        client = self.async_client
+        return self.loop.run(client.gather([lambda u=user: client.create_user(u) for user in users], concurrency))
+
+    def bulk_get_user_info(self, user_ids: Iterable[int], concurrency: Optional[int] = None) -> List[httpx.Response]:
+        """Lấy thông tin nhiều user cùng lúc"""
+        client = self.async_client
+        return self.loop.run(client.gather([lambda i=user_id: client.get_user_info(i) for user_id in user_ids],
+                                           concurrency))
+
+    def bulk_delete_users(self, user_ids: Iterable[int], concurrency: Optional[int] = None) -> List[httpx.Response]:
+        """Xóa nhiều user cùng lúc"""
+        client = self.async_client
+        return self.loop.run(client.gather([lambda i=user_id: client.delete_user(i) for user_id in user_ids],
+                                           concurrency))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.async_client.get_stats()
+
+    def close(self):
+        """Đóng connection pool (loop nền dùng chung vẫn chạy cho các client khác)"""
+        self.loop.run(self.async_client.aclose())
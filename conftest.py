@@ -5,12 +5,34 @@ import allure
 import logging
 import os
 import sys
+import time
+import inspect
 from datetime import datetime
-from playwright.sync_api import sync_playwright
 from config import settings
 from api_clients.user_api_client import UserApiClient
+from api_clients.async_user_api_client import PooledUserApiClient, stop_api_loop
 from api_clients.order_grpc_client import OrderGrpcClient
 from utils.common_functions import CommonFunctions
+from pages import InventoryPage, LoginPage
+from utils.browser_pool import BrowserPool, build_launch_args, parse_engines
+from utils.browser_server import load_server_endpoints
+from utils.context_pool import ContextPool
+from utils.memory_watchdog import MemoryWatchdog, memory_budget_from_optimizer
+from utils.auth_state import AuthStateCache, is_authenticated_as
+from utils.asset_cache import ASSET_CACHE_REPORT, AssetCache, merge_asset_cache_reports
+from utils.screenshot_service import SCREENSHOT_FORMATS, screenshot_service
+from utils.artifact_retention import RETENTION_MODES, ArtifactRetention, find_new_artifacts, parse_size, safe_artifact_name
+from utils.async_runner import AsyncBrowserRunner
+from utils.har_network import NETWORK_MODES, clear_recordings, har_network, merge_recordings
+from utils.resource_policy import RESOURCE_POLICIES, get_policy, resource_blocker
+from utils.retry_policy import retry_policy
+from utils.action_metrics import action_metrics, merge_action_reports
+from utils.readiness import readiness_registry
+from utils.handle_tracker import HANDLE_REPORT, handle_tracker
+from utils.adaptive_timeouts import ADAPTIVE_TIMEOUTS_REPORT, adaptive_timeouts, merge_timeout_reports
+from utils.wait_accounting import WAIT_ACCOUNTING_REPORT, merge_wait_reports, wait_accounting
+from utils.logging_pipeline import LoggingPipeline, logging_pipeline
+from utils.perf_reports import clear_worker_reports, merge_worker_reports, write_worker_report
 
 # Import performance optimization modules
 try:
@@ -23,15 +45,11 @@ except ImportError:
     test_data_manager = None
     test_suite_manager = None
 
-# Cấu hình logging để ghi log ra file và hiển thị ra màn hình
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('test.log'),
-        logging.StreamHandler()
-    ]
-)
+# Logging được cấu hình trong pytest_configure bằng logging_pipeline:
+# mỗi worker ghi logs/workers/test.<worker>.log qua queue, controller gộp vào test.log khi kết thúc
+
+# Thời điểm controller bắt đầu run (để tìm video còn sót sau run)
+RUN_STARTED_AT = pytest.StashKey[float]()
 
 # =====================
 # Thêm các tuỳ chọn dòng lệnh cho pytest (browser, base_url, headless)
@@ -42,7 +60,7 @@ def pytest_addoption(parser):
         "--test-browser",
         action="store",
         default="chromium",
-        help="Browser to use for testing: chromium, firefox, webkit"
+        help="Browser(s) to use for testing: chromium, firefox, webkit, a comma-separated list or 'all'"
     )
     parser.addoption(
         "--app-base-url",
@@ -75,6 +93,175 @@ def pytest_addoption(parser):
         default=None,
         help="Test suite name for mass testing"
     )
+    parser.addoption(
+        "--context-reuse",
+        action="store",
+        type=int,
+        default=20,
+        help="Max number of tests that reuse one BrowserContext (0 = unlimited, 1 = new context per test)"
+    )
+    parser.addoption(
+        "--auth-user",
+        action="store",
+        default="standard_user",
+        help="Test user whose cached storage_state pre-authenticates the page fixture"
+    )
+    parser.addoption(
+        "--auth-state-ttl",
+        action="store",
+        type=int,
+        default=600,
+        help="Seconds a cached storage_state in .auth/ stays valid"
+    )
+    parser.addoption(
+        "--no-auth-cache",
+        action="store_true",
+        default=False,
+        help="Disable pre-authenticated contexts, every test starts logged out"
+    )
+    parser.addoption(
+        "--test-video",
+        action="store",
+        default="on-failure",
+        choices=RETENTION_MODES,
+        help="Video retention: off, on-failure (keep videos of failed tests only) or always"
+    )
+    parser.addoption(
+        "--video-size",
+        action="store",
+        default="1280x720",
+        help="Video recording resolution WIDTHxHEIGHT, independent of the viewport"
+    )
+    parser.addoption(
+        "--video-dir-max-mb",
+        action="store",
+        type=float,
+        default=500,
+        help="Max total size of videos/ in MB, oldest videos are evicted first (0 = unlimited)"
+    )
+    parser.addoption(
+        "--test-trace",
+        action="store",
+        default="off",
+        choices=RETENTION_MODES,
+        help="Playwright tracing: off, on-failure (write trace zips of failed tests only) or always"
+    )
+    parser.addoption(
+        "--trace-dir-max-mb",
+        action="store",
+        type=float,
+        default=500,
+        help="Max total size of traces/ in MB, oldest traces are evicted first (0 = unlimited)"
+    )
+    parser.addoption(
+        "--network",
+        action="store",
+        default="live",
+        choices=NETWORK_MODES,
+        help="Network mode for UI tests: live, record (save a HAR per page-object entry URL into hars/, merged from every test at the end of the run) or replay (serve responses from hars/, no network)"
+    )
+    parser.addoption(
+        "--resource-policy",
+        action="store",
+        default=None,
+        choices=("settings",) + tuple(RESOURCE_POLICIES),
+        help="Request-blocking policy applied per context: settings (TestConfig.disable_images/disable_css), none, no-third-party, lean or mass (default: mass with --mass-test, otherwise settings)"
+    )
+    parser.addoption(
+        "--no-browser-server",
+        action="store_true",
+        default=False,
+        help="Always launch browsers locally even if scripts/browser_server.py has warm browser servers running"
+    )
+    parser.addoption(
+        "--memory-budget-mb",
+        action="store",
+        type=float,
+        default=None,
+        help="RSS budget of a worker's browser processes before contexts/browsers are recycled (default: memory_limit * RAM / workers, 0 = off; always off when connected to a browser server)"
+    )
+    parser.addoption(
+        "--asset-cache",
+        action="store_true",
+        default=False,
+        help="Serve JS/CSS/fonts/images from an on-disk cache in .asset_cache/ shared by all contexts and workers"
+    )
+    parser.addoption(
+        "--asset-cache-ttl",
+        action="store",
+        type=int,
+        default=3600,
+        help="Seconds a cached asset is served without revalidation (ETag/Last-Modified)"
+    )
+    parser.addoption(
+        "--screenshot-format",
+        action="store",
+        default="png",
+        choices=SCREENSHOT_FORMATS,
+        help="Image format of framework screenshots (jpeg is smaller and faster to write)"
+    )
+    parser.addoption(
+        "--screenshot-quality",
+        action="store",
+        type=int,
+        default=80,
+        help="JPEG quality (0-100) when --screenshot-format=jpeg"
+    )
+    parser.addoption(
+        "--retry-budget",
+        action="store",
+        type=int,
+        default=10,
+        help="Max number of action retries (BasePage/retry_action) per test before errors are raised immediately"
+    )
+    parser.addoption(
+        "--retry-sleep-budget",
+        action="store",
+        type=float,
+        default=10.0,
+        help="Max seconds one test may spend sleeping between retries"
+    )
+    parser.addoption(
+        "--readiness-baseline-rate",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Fraction of readiness waits that also wait for networkidle to measure the time saved (0-1)"
+    )
+    parser.addoption(
+        "--adaptive-timeouts",
+        action="store_true",
+        default=False,
+        help="Use per-selector timeouts learned from previous runs (.timeout_history.json) instead of the fixed ones"
+    )
+    parser.addoption(
+        "--adaptive-timeout-floor",
+        action="store",
+        type=int,
+        default=1000,
+        help="Lowest timeout in ms an adaptive timeout may shrink to"
+    )
+    parser.addoption(
+        "--test-log-level",
+        action="store",
+        default="INFO",
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        help="Level of framework logs written to the per-worker log files and test.log"
+    )
+    parser.addoption(
+        "--test-log-buffer",
+        action="store",
+        type=int,
+        default=500,
+        help="Number of log records (framework DEBUG+, libraries at --test-log-level) kept per test and attached to the report only when the test fails (0 = off)"
+    )
+    parser.addoption(
+        "--async-concurrency",
+        action="store",
+        type=int,
+        default=8,
+        help="Max number of async UI scenarios running at once on one worker's event loop"
+    )
     # Thêm option để disable Allure nếu có lỗi
     parser.addoption(
         "--no-allure",
@@ -86,12 +273,10 @@ def pytest_addoption(parser):
 # =====================
 # Cấu hình browser và context cho Playwright
 # =====================
-@pytest.fixture(scope="session")
-def browser_type_launch_args(request):
-    """Cấu hình các tham số khi khởi tạo browser"""
-    browser = request.config.getoption("--test-browser")
-    headless_option = request.config.getoption("--headless")
-    mass_test = request.config.getoption("--mass-test")
+def _resolve_headless(config):
+    """Xác định chế độ headless từ option --headless, môi trường CI và mass testing"""
+    headless_option = config.getoption("--headless")
+    mass_test = config.getoption("--mass-test")
     
     # Tự động detect CI environment và set headless=True
     # Kiểm tra các biến môi trường CI phổ biến
@@ -112,84 +297,42 @@ def browser_type_launch_args(request):
     else:
         headless = headless_option
         print(f"🎯 Manual headless mode: {headless}")
-    
-    if browser == "chromium":
-        args = [
-            "--no-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-web-security",
-            "--disable-features=VizDisplayCompositor"
-        ]
-        
-        # Add mass testing optimizations
-        if mass_test:
-            args.extend([
-                "--disable-images",  # Disable images for faster loading
-                "--disable-javascript",  # Disable JS if not needed
-                "--disable-plugins",
-                "--disable-extensions",
-                "--disable-background-timer-throttling",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-renderer-backgrounding",
-                "--disable-field-trial-config",
-                "--disable-ipc-flooding-protection"
-            ])
-        
-        return {
-            "headless": headless,
-            "args": args
-        }
-    elif browser == "firefox":
-        args = [
-            "--no-sandbox",
-            "--disable-dev-shm-usage"
-        ]
-        
-        if mass_test:
-            args.extend([
-                "--disable-images",
-                "--disable-javascript"
-            ])
-        
-        return {
-            "headless": headless,
-            "args": args
-        }
-    elif browser == "webkit":
-        args = [
-            "--no-sandbox",
-            "--disable-dev-shm-usage"
-        ]
-        
-        if mass_test:
-            args.extend([
-                "--disable-images",
-                "--disable-javascript"
-            ])
-        
-        return {
-            "headless": headless,
-            "args": args
-        }
-    else:
-        return {"headless": headless}
+    return headless
+
+@pytest.fixture(scope="session")
+def browser_engines(request):
+    """Danh sách browser engines được chọn qua --test-browser"""
+    return parse_engines(request.config.getoption("--test-browser"))
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(request, browser_engines):
+    """Cấu hình các tham số khi khởi tạo browser (cho engine đầu tiên)"""
+    headless = _resolve_headless(request.config)
+    return build_launch_args(browser_engines[0], headless, request.config.getoption("--mass-test"))
 
 @pytest.fixture(scope="session")
 def browser_context_args(request):
     """Cấu hình context cho browser (viewport, video, ...)."""
     mass_test = request.config.getoption("--mass-test")
+    video_mode = request.config.getoption("--test-video")
     
     context_args = {
         "viewport": {"width": 1920, "height": 1080},
         "ignore_https_errors": True,
-        "record_video_dir": "videos/",
-        "record_video_size": {"width": 1920, "height": 1080}
     }
     
+    # Video có độ phân giải riêng, không bắt buộc bằng viewport
+    if video_mode != "off":
+        context_args.update({
+            "record_video_dir": "videos/",
+            "record_video_size": parse_size(request.config.getoption("--video-size")) or context_args["viewport"]
+        })
+    
     # Optimize for mass testing
     if mass_test:
         context_args.update({
             "record_video_dir": None,  # Disable video recording for mass tests
+            "record_video_size": None,
             "record_har_path": None,   # Disable HAR recording
             "record_har_omit_content": True,
             "extra_http_headers": {
@@ -208,18 +351,160 @@ def base_url(request):
     return request.config.getoption("--app-base-url")
 
 @pytest.fixture(scope="session")
-def browser(browser_type_launch_args):
-    """Fixture tạo browser instance cho toàn bộ session test"""
-    with sync_playwright() as p:
-        browser_type = getattr(p, "chromium")  # Default to chromium
-        browser = browser_type.launch(**browser_type_launch_args)
-        yield browser
-        browser.close()
+def browser_pool(request, browser_engines):
+    """Fixture tạo browser pool cho mỗi xdist worker (session scope = worker scope)"""
+    headless = _resolve_headless(request.config)
+    mass_test = request.config.getoption("--mass-test")
+    launch_args = lambda engine: build_launch_args(engine, headless, mass_test)
+    # Browser server (scripts/browser_server.py start) đang chạy thì connect thay vì launch
+    endpoints = {} if request.config.getoption("--no-browser-server") else load_server_endpoints(browser_engines, launch_args)
+    pool = BrowserPool.from_optimizer(
+        browser_engines,
+        launch_args,
+        optimizer=performance_optimizer,
+        endpoints=endpoints,
+    )
+    pool.start()
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="session")
+def browser_engine(request, browser_engines):
+    """Engine của test hiện tại (được parametrize khi chọn nhiều engine)"""
+    return getattr(request, "param", browser_engines[0])
+
+@pytest.fixture(scope="function")
+def browser(browser_pool, browser_engine):
+    """Fixture lấy browser theo engine từ browser pool của worker"""
+    return browser_pool.acquire(browser_engine)
+
+@pytest.fixture(scope="session")
+def context_pool(request, browser_pool):
+    """Fixture tạo context pool cho mỗi worker (đóng trước browser pool)"""
+    trace_retention = request.getfixturevalue("trace_retention")
+    asset_cache = request.getfixturevalue("asset_cache")
+    
+    def _on_create(context):
+        # Tracing bắt đầu một lần cho mỗi context, mỗi test chỉ dùng một chunk
+        if trace_retention.enabled:
+            context.tracing.start(screenshots=True, snapshots=True, sources=False)
+        if asset_cache is not None:
+            asset_cache.attach(context)
+    
+    def _on_reset(context):
+        # unroute_all đã xoá mọi route: cài lại asset cache, policy chặn request sẽ được cài lại khi lease
+        resource_blocker.detach(context)
+        if asset_cache is not None:
+            asset_cache.attach(context)
+    
+    # HAR chỉ được ghi ra file khi context đóng, nên record mode không tái sử dụng context
+    max_uses = 1 if har_network.mode == "record" else request.config.getoption("--context-reuse")
+    pool = ContextPool(
+        max_uses=max_uses,
+        on_create=_on_create,
+        on_reset=_on_reset,
+    )
+    yield pool
+    pool.close_all()
+    logging.getLogger(__name__).info(f"Context pool: {pool.summary()}")
+    write_worker_report("context_pool", pool.get_stats())
+
+@pytest.fixture(scope="session")
+def asset_cache(request):
+    """Fixture asset cache trên đĩa (None nếu không bật --asset-cache)"""
+    if not request.config.getoption("--asset-cache"):
+        yield None
+        return
+    cache = AssetCache(ttl_seconds=request.config.getoption("--asset-cache-ttl"))
+    yield cache
+    write_worker_report(ASSET_CACHE_REPORT, cache.get_stats())
+
+@pytest.fixture(scope="session")
+def memory_watchdog(request, browser_pool, context_pool):
+    """Fixture giữ RSS của browser trong worker dưới ngân sách (recycle giữa các test)"""
+    budget_mb = request.config.getoption("--memory-budget-mb")
+    budget = memory_budget_from_optimizer(performance_optimizer) if budget_mb is None else int(budget_mb * 1024 * 1024)
+    watchdog = MemoryWatchdog(browser_pool, context_pool, budget_bytes=budget)
+    yield watchdog
+    if watchdog.enabled:
+        write_worker_report("memory_watchdog", watchdog.get_stats())
+
+@pytest.fixture(scope="session")
+def auth_state_cache(request):
+    """Fixture cache storage_state đã đăng nhập cho các test users"""
+    cache = AuthStateCache(ttl_seconds=request.config.getoption("--auth-state-ttl"))
+    yield cache
+    write_worker_report("auth_state", cache.get_stats())
+
+@pytest.fixture(scope="function")
+def auth_user(request):
+    """Username mà context của test được đăng nhập sẵn (None nếu test tự login)"""
+    if request.config.getoption("--no-auth-cache") or request.node.get_closest_marker("no_auth"):
+        return None
+    marker = request.node.get_closest_marker("auth_user")
+    return marker.args[0] if marker else request.config.getoption("--auth-user")
+
+@pytest.fixture(scope="session")
+def resource_policy_report():
+    """Ghi thống kê request bị chặn của worker khi kết thúc"""
+    yield resource_blocker
+    write_worker_report("resource_policy", resource_blocker.get_stats())
+
+@pytest.fixture(scope="function")
+def resource_policy(request, resource_policy_report):
+    """ResourcePolicy của test: marker resource_policy > --resource-policy > mass (--mass-test) > settings"""
+    marker = request.node.get_closest_marker("resource_policy")
+    name = marker.args[0] if marker else request.config.getoption("--resource-policy")
+    if name is None:
+        name = "mass" if request.config.getoption("--mass-test") else "settings"
+    return get_policy(name, settings.settings.test)
 
 @pytest.fixture(scope="function")
-def page(browser, base_url, request):
+def context(browser, context_pool, auth_state_cache, auth_user, request):
+    """Fixture lấy BrowserContext đã reset (và đã đăng nhập sẵn nếu có auth_user) từ context pool"""
+    context_args = dict(request.getfixturevalue("browser_context_args"))
+    if auth_user:
+        state_path = auth_state_cache.get_state_path(browser, auth_user)
+        if state_path:
+            context_args["storage_state"] = state_path
+    context = context_pool.acquire(browser, context_args)
+    resource_blocker.apply(context, request.getfixturevalue("resource_policy"))
+    trace_retention = request.getfixturevalue("trace_retention")
+    if trace_retention.enabled:
+        context.tracing.start_chunk(title=request.node.nodeid)
+    
+    yield context
+    
+    rep_call = getattr(request.node, "rep_call", None)
+    failed = bool(rep_call and rep_call.failed)
+    
+    # Chỉ ghi trace zip cho test cần giữ, các chunk còn lại bị bỏ mà không ghi đĩa
+    if trace_retention.enabled:
+        try:
+            if trace_retention.should_keep(failed):
+                trace_path = os.path.join(trace_retention.directory, f"{safe_artifact_name(request.node.nodeid)}.zip")
+                context.tracing.stop_chunk(path=trace_path)
+                trace_retention.keep(trace_path)
+                print(f"🧭 Trace saved: {trace_path} (open with: playwright show-trace {trace_path})")
+            else:
+                context.tracing.stop_chunk()
+                trace_retention.discard(None)
+        except Exception as e:
+            print(f"Warning: Error handling trace: {e}")
+    
+    blocked = resource_blocker.finish_test(context, request.node.nodeid)
+    if blocked["blocked"]:
+        print(f"🚫 Blocked {blocked['blocked']} requests (~{blocked['est_bytes_saved'] / 1024:.0f} KB)")
+    
+    # Context của test fail có thể còn state lạ, không đưa lại vào pool
+    context_pool.release(context, discard=failed)
+    
+    # Giữa hai test: recycle context/browser nếu RSS của worker vượt ngân sách
+    request.getfixturevalue("memory_watchdog").check()
+
+@pytest.fixture(scope="function")
+def page(context, base_url, request):
     """Fixture tạo page instance cho mỗi test function"""
-    context = browser.new_context(**request.getfixturevalue("browser_context_args"))
     page = context.new_page()
     page.set_default_timeout(30000)  # 30 seconds timeout
     page.set_default_navigation_timeout(30000)
@@ -235,6 +520,166 @@ def page(browser, base_url, request):
         page.close()
     except Exception as e:
         print(f"Warning: Error closing page: {e}")
+    
+    # Chỉ giữ video theo retention mode (mặc định: chỉ video của test fail)
+    if page.video:
+        video_retention = request.getfixturevalue("video_retention")
+        rep_call = getattr(request.node, "rep_call", None)
+        try:
+            video_path = page.video.path()
+            if video_retention.should_keep(bool(rep_call and rep_call.failed)):
+                # Đặt tên theo nodeid như trace: test cùng tên ở module khác không ghi đè video của nhau
+                kept_path = video_retention.keep(video_path, name=request.node.nodeid)
+                print(f"🎬 Video saved: {kept_path}")
+            else:
+                video_retention.discard(video_path, deleter=page.video.delete)
+        except Exception as e:
+            print(f"Warning: Error handling video: {e}")
+
+# =====================
+# Async fixtures: nhiều page đồng thời trên một event loop của worker
+# =====================
+@pytest.fixture(scope="session")
+def async_runner(request):
+    """Fixture tạo event loop + Playwright async API cho mỗi worker"""
+    headless = _resolve_headless(request.config)
+    mass_test = request.config.getoption("--mass-test")
+    runner = AsyncBrowserRunner(
+        lambda engine: build_launch_args(engine, headless, mass_test),
+        concurrency=request.config.getoption("--async-concurrency"),
+    )
+    runner.start()
+    yield runner
+    runner.close()
+    write_worker_report("async_runner", runner.get_stats())
+
+@pytest.fixture(scope="session")
+def async_context_args(browser_context_args):
+    """Context args cho async contexts (không record video vì nhiều page chạy cùng lúc)"""
+    return {key: value for key, value in browser_context_args.items()
+            if not key.startswith("record_video")}
+
+@pytest.fixture(scope="function")
+def async_browser(async_runner, browser_engine):
+    """Browser async dùng chung trong worker (không đóng trong test)"""
+    return async_runner.run(async_runner.get_browser(browser_engine))
+
+@pytest.fixture(scope="function")
+def async_context(async_runner, browser_engine, async_context_args):
+    """BrowserContext async mới cho mỗi test"""
+    context = async_runner.run(async_runner.new_context(browser_engine, **async_context_args))
+    yield context
+    try:
+        async_runner.run(context.close())
+    except Exception as e:
+        print(f"Warning: Error closing async context: {e}")
+
+@pytest.fixture(scope="function")
+def async_page(async_runner, async_context, request):
+    """Page async cho test `async def` (chạy trên loop của async_runner; các test vẫn chạy lần lượt)"""
+    page = async_runner.run(async_context.new_page())
+    page.set_default_timeout(30000)
+    page.set_default_navigation_timeout(30000)
+    print(f"🧪 Running async test: {request.node.name}")
+    yield page
+
+@pytest.fixture(scope="function")
+def async_scenarios(async_runner, browser_engine, async_context_args):
+    """Chạy đồng thời nhiều scenario `async def scenario(page)`, mỗi scenario một context riêng"""
+    def _run(scenarios, concurrency=None):
+        try:
+            return async_runner.run_many(scenarios, engine=browser_engine,
+                                         context_args=async_context_args, concurrency=concurrency)
+        finally:
+            screenshot_service.attach_deferred()
+    return _run
+
+@pytest.fixture(scope="session")
+def retry_policy_report():
+    """Ghi thống kê retry (theo loại lỗi, thời gian sleep, test có retry) của worker khi kết thúc"""
+    yield retry_policy
+    write_worker_report("retry_policy", retry_policy.get_stats())
+
+@pytest.fixture(scope="function", autouse=True)
+def retry_budget(request, retry_policy_report):
+    """Ngân sách retry riêng cho mỗi test"""
+    retry_policy.begin_test(request.node.nodeid)
+    yield retry_policy
+    retry_policy.end_test()
+
+@pytest.fixture(scope="session")
+def action_metrics_report():
+    """Ghi histogram latency của các action page object của worker khi kết thúc"""
+    yield action_metrics
+    write_worker_report("action_metrics", action_metrics.get_stats())
+
+@pytest.fixture(scope="function", autouse=True)
+def action_metrics_test(request, action_metrics_report):
+    """Gom latency action theo test (logs/perf/action_metrics.json: slowest_tests)"""
+    action_metrics.begin_test(request.node.nodeid)
+    yield action_metrics
+    action_metrics.end_test()
+
+@pytest.fixture(scope="session", autouse=True)
+def readiness_report():
+    """Ghi thống kê thời gian đợi readiness (và networkidle baseline) của worker khi kết thúc"""
+    yield readiness_registry
+    stats = readiness_registry.get_stats()
+    if stats["waits"] or stats["fallbacks"]:
+        write_worker_report("readiness", stats)
+
+@pytest.fixture(scope="session", autouse=True)
+def handle_leak_report():
+    """Ghi số ElementHandle tạo/dispose và các test để handle sống tới teardown của worker"""
+    yield handle_tracker
+    stats = handle_tracker.get_stats()
+    if stats["acquired"]:
+        write_worker_report(HANDLE_REPORT, stats)
+
+@pytest.fixture(scope="session", autouse=True)
+def adaptive_timeouts_report():
+    """Ghi mẫu thời gian resolve selector của worker để controller gộp vào lịch sử timeout"""
+    yield adaptive_timeouts
+    stats = adaptive_timeouts.get_stats()
+    if stats["samples"]:
+        write_worker_report(ADAPTIVE_TIMEOUTS_REPORT, stats)
+
+@pytest.fixture(scope="session", autouse=True)
+def wait_accounting_report():
+    """Ghi thời gian action / explicit wait / implicit wait / retry sleep theo test và call site của worker"""
+    yield wait_accounting
+    stats = wait_accounting.get_stats()
+    if stats["tests"]:
+        write_worker_report(WAIT_ACCOUNTING_REPORT, stats)
+
+@pytest.fixture(scope="session", autouse=True)
+def har_network_report():
+    """Ghi thống kê HAR record/replay của worker khi kết thúc"""
+    yield har_network
+    if har_network.enabled:
+        write_worker_report("har_network", har_network.get_stats())
+
+@pytest.fixture(scope="session")
+def trace_retention(request):
+    """Fixture quản lý retention của Playwright trace trong thư mục traces/"""
+    retention = ArtifactRetention(
+        "traces",
+        mode=request.config.getoption("--test-trace"),
+        max_total_mb=request.config.getoption("--trace-dir-max-mb"),
+    )
+    yield retention
+    write_worker_report("trace_retention", retention.get_stats())
+
+@pytest.fixture(scope="session")
+def video_retention(request):
+    """Fixture quản lý retention của video trong thư mục videos/"""
+    retention = ArtifactRetention(
+        "videos",
+        mode=request.config.getoption("--test-video"),
+        max_total_mb=request.config.getoption("--video-dir-max-mb"),
+    )
+    yield retention
+    write_worker_report("video_retention", retention.get_stats())
 
 # =====================
 # Performance monitoring fixtures
@@ -262,11 +707,14 @@ def test_data_optimized(request):
 class BaseTest:
     def login_quick(self, page, username, password):
         # Hàm login nhanh cho các test kế thừa
-        page.goto("https://www.saucedemo.com/")
-        page.fill("#user-name", username)
-        page.fill("#password", password)
-        page.click("#login-button")
-        page.wait_for_load_state("networkidle")
+        # Context đã đăng nhập sẵn (auth state cache) thì vào thẳng trang inventory
+        if is_authenticated_as(page.context, username):
+            InventoryPage(page).goto()
+            return
+        login_page = LoginPage(page)
+        login_page.goto()
+        login_page.login(username, password)
+        login_page.wait_for_navigation(InventoryPage)
 
 # =====================
 # API và gRPC client fixtures
@@ -276,6 +724,15 @@ def api_client():
     """Fixture tạo API client cho test"""
     return UserApiClient()
 
+@pytest.fixture(scope="session")
+def pooled_api_client():
+    """API client sync dùng chung một connection pool HTTP/2 trong worker (có bulk_* để fan-out request)"""
+    client = PooledUserApiClient()
+    yield client
+    write_worker_report("api_client", client.get_stats())
+    client.close()
+    stop_api_loop()
+
 @pytest.fixture(scope="function")
 def grpc_client():
     """Fixture tạo gRPC client cho test"""
@@ -333,35 +790,71 @@ def screenshot_on_failure(page, request):
     # Chụp screenshot nếu test fail
     if request.node.rep_call.failed:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_path = f"screenshots/failure_{request.node.name}_{timestamp}.png"
-        
-        # Đảm bảo thư mục tồn tại
-        os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
+        attach_name = None if request.config.getoption("--no-allure") else f"Failure Screenshot - {request.node.name}"
         
         try:
-            page.screenshot(path=screenshot_path, full_page=True)
+            screenshot_path = screenshot_service.capture(
+                page, f"failure_{request.node.name}_{timestamp}", attach_name=attach_name
+            )
             print(f"📸 Screenshot saved: {screenshot_path}")
-            
-            # Attach to Allure nếu có
-            if not request.config.getoption("--no-allure"):
-                with open(screenshot_path, "rb") as f:
-                    allure.attach(
-                        f.read(),
-                        f"Failure Screenshot - {request.node.name}",
-                        allure.attachment_type.PNG
-                    )
         except Exception as e:
             print(f"Warning: Could not take screenshot: {e}")
 
 # =====================
 # Pytest hooks
 # =====================
+def pytest_generate_tests(metafunc):
+    """Parametrize test theo engine khi --test-browser chọn nhiều browser"""
+    if "browser_engine" not in metafunc.fixturenames:
+        return
+    engines = parse_engines(metafunc.config.getoption("--test-browser"))
+    if len(engines) > 1:
+        metafunc.parametrize("browser_engine", engines, indirect=True, scope="session")
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Chạy test `async def` dùng async fixtures trên event loop của async_runner"""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj) or "async_runner" not in pyfuncitem.fixturenames:
+        return None
+    runner = pyfuncitem.funcargs["async_runner"]
+    argnames = pyfuncitem._fixtureinfo.argnames
+    kwargs = {name: pyfuncitem.funcargs[name] for name in argnames}
+    try:
+        runner.run(pyfuncitem.obj(**kwargs))
+    finally:
+        # Screenshot/attachment của async page được attach ở đây, trên thread của test
+        screenshot_service.attach_deferred()
+    return True
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook để capture test result cho screenshot"""
     outcome = yield
     rep = outcome.get_result()
     item.rep_call = rep
+    # Test fail: đưa log của riêng test này (ring buffer) vào report và Allure
+    if rep.failed:
+        test_log = logging_pipeline.test_log()
+        if test_log:
+            rep.sections.append((f"Test log buffer ({rep.when})", test_log))
+            if not item.config.getoption("--no-allure"):
+                allure.attach(test_log, f"Test log ({rep.when})", allure.attachment_type.TEXT)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Bắt đầu ring buffer log mới cho test"""
+    logging_pipeline.begin_test()
+    handle_tracker.begin_test(item.nodeid)
+    wait_accounting.begin_test(item.nodeid)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Dispose handle còn sống của test trước khi fixture đóng page/context"""
+    runner = getattr(item, "funcargs", {}).get("async_runner")
+    if runner is not None and handle_tracker.has_async_handles():
+        runner.run(handle_tracker.dispose_test_handles_async())
+    handle_tracker.end_test()
+    wait_accounting.end_test()
 
 # =====================
 # Allure directory fixtures
@@ -381,6 +874,35 @@ def allure_report_dir():
 # =====================
 def pytest_configure(config):
     """Cấu hình pytest khi khởi động"""
+    # Xoá báo cáo perf của lần chạy trước (chỉ trên controller, không phải xdist worker)
+    if not hasattr(config, "workerinput"):
+        clear_worker_reports()
+        LoggingPipeline.clear_worker_logs()
+        config.stash[RUN_STARTED_AT] = time.time()
+        clear_recordings()
+    
+    # Logging qua queue: file riêng cho worker, ring buffer cho test đang chạy
+    logging_pipeline.start(
+        level=getattr(logging, config.getoption("--test-log-level")),
+        buffer_size=config.getoption("--test-log-buffer"),
+        console=not hasattr(config, "workerinput"),
+    )
+    
+    # Chế độ network (live/record/replay) cho page objects
+    har_network.configure(config.getoption("--network"))
+    # Ngân sách retry cho mỗi test
+    retry_policy.configure(config.getoption("--retry-budget"), config.getoption("--retry-sleep-budget"))
+    # Tỉ lệ lần đợi readiness được đo thêm networkidle để so sánh
+    readiness_registry.configure(config.getoption("--readiness-baseline-rate"))
+    # Đo explicit wait: page.wait_for_timeout và time.sleep trên thread của test
+    wait_accounting.install()
+    # Timeout học từ lịch sử theo selector (mẫu luôn được ghi, chỉ áp dụng khi bật)
+    adaptive_timeouts.configure(config.getoption("--adaptive-timeouts"), config.getoption("--adaptive-timeout-floor"))
+    # Format/quality cho screenshot service
+    screenshot_service.configure(config.getoption("--screenshot-format"), config.getoption("--screenshot-quality"))
+    # Domain first-party cho policy chặn request bên thứ ba
+    resource_blocker.configure([config.getoption("--app-base-url"), settings.settings.test.base_url])
+    
     # Tạo thư mục cần thiết
     os.makedirs("allure-results", exist_ok=True)
     os.makedirs("allure-report", exist_ok=True)
@@ -406,8 +928,59 @@ def pytest_configure(config):
     if config.getoption("--optimize-performance") and performance_optimizer:
         performance_optimizer.start_monitoring()
 
+def pytest_sessionfinish(session, exitstatus):
+    """Gộp báo cáo perf của các worker khi kết thúc run"""
+    # Ghi nốt các screenshot đang ghi nền trước khi worker thoát
+    screenshot_service.shutdown()
+    if screenshot_service.get_stats()["captures"]:
+        write_worker_report("screenshots", screenshot_service.get_stats())
+    if hasattr(session.config, "workerinput"):
+        # Ghi nốt log trong queue để controller gộp được file của worker
+        logging_pipeline.stop()
+        return
+    merge_worker_reports("context_pool")
+    merge_worker_reports("auth_state")
+    merge_worker_reports("video_retention")
+    check_orphan_videos(session.config, exitstatus)
+    merge_worker_reports("trace_retention")
+    merge_worker_reports("async_runner")
+    merge_worker_reports("har_network")
+    if har_network.mode == "record":
+        merge_recordings()
+    merge_worker_reports("resource_policy")
+    merge_worker_reports("memory_watchdog")
+    merge_asset_cache_reports()
+    merge_worker_reports("screenshots")
+    merge_worker_reports("retry_policy")
+    merge_action_reports()
+    merge_worker_reports("readiness")
+    merge_worker_reports(HANDLE_REPORT)
+    merge_timeout_reports()
+    merge_wait_reports()
+    merge_worker_reports("api_client")
+    logging_pipeline.stop()
+    LoggingPipeline.merge_worker_logs()
+
+def check_orphan_videos(config, exitstatus):
+    """Run toàn pass với --test-video on-failure thì videos/ không được có file mới: xoá và cảnh báo nếu có"""
+    if exitstatus != 0 or config.getoption("--test-video") != "on-failure" or RUN_STARTED_AT not in config.stash:
+        return
+    orphans = find_new_artifacts("videos", config.stash[RUN_STARTED_AT])
+    if not orphans:
+        return
+    logging.getLogger(__name__).warning(
+        "%s video(s) left in videos/ after a passing run (not owned by any test): %s",
+        len(orphans), ", ".join(os.path.basename(path) for path in orphans))
+    for path in orphans:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 def pytest_unconfigure(config):
     """Cleanup khi pytest kết thúc"""
+    logging_pipeline.stop()
+    wait_accounting.uninstall()
     # Stop performance monitoring nếu có
     if config.getoption("--optimize-performance") and performance_optimizer:
         performance_optimizer.stop_monitoring()
@@ -433,15 +1006,5 @@ def allure_attach_screenshot(page):
     """Fixture để attach screenshot vào Allure"""
     def _attach_screenshot(description="Screenshot"):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_path = f"screenshots/allure_{timestamp}.png"
-        os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-        page.screenshot(path=screenshot_path, full_page=True)
-        
-        with open(screenshot_path, "rb") as f:
-            allure.attach(
-                f.read(),
-                f"{description} - {timestamp}",
-                allure.attachment_type.PNG
-            )
-        return screenshot_path
+        return screenshot_service.capture(page, f"allure_{timestamp}", attach_name=f"{description} - {timestamp}")
     return _attach_screenshot
\ No newline at end of file
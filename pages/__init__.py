@@ -33,25 +33,29 @@ Cấu trúc thư mục pages/:
 """
 
 # Import các base classes
-from .base import BasePage
+from .base import BasePage, AsyncBasePage
 
 # Import các page objects chính
-from .auth import LoginPage
-from .inventory import InventoryPage
+from .auth import LoginPage, AsyncLoginPage
+from .inventory import InventoryPage, AsyncInventoryPage
 
 # Import các locators
-from .locators.login_locators import LOGIN_PAGE_SELECTORS
-from .locators.inventory_locators import INVENTORY_PAGE_SELECTORS
+from .locators import LOGIN_PAGE_SELECTORS, INVENTORY_PAGE_SELECTORS, CART_PAGE_SELECTORS, get_catalog
 
 __all__ = [
     # Base classes
     'BasePage',
+    'AsyncBasePage',
     
     # Page Objects
     'LoginPage',
     'InventoryPage',
+    'AsyncLoginPage',
+    'AsyncInventoryPage',
     
     # Locators
     'LOGIN_PAGE_SELECTORS',
     'INVENTORY_PAGE_SELECTORS',
+    'CART_PAGE_SELECTORS',
+    'get_catalog',
 ] 
\ No newline at end of file
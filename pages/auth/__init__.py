@@ -6,5 +6,6 @@ Chứa các Page Objects liên quan đến authentication như login, register,
 """
 
 from .login_page import LoginPage
+from .async_login_page import AsyncLoginPage
 
-__all__ = ['LoginPage'] 
\ No newline at end of file
+__all__ = ['LoginPage', 'AsyncLoginPage'] 
\ No newline at end of file
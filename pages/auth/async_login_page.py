@@ -0,0 +1,57 @@
+from ..base.async_base_page import AsyncBasePage
+from playwright.async_api import Page
+from typing import Dict, Optional
+from ..locators.login_locators import LOGIN_PAGE_SELECTORS
+from utils.readiness import ReadinessCheck
+
+# Page Object async cho trang đăng nhập (Login Page), dùng với async_page / async_runner
+class AsyncLoginPage(AsyncBasePage):
+    URL = "https://www.saucedemo.com/"
+    READINESS = (ReadinessCheck(LOGIN_PAGE_SELECTORS["login_button"], state="visible"),)
+
+    def __init__(self, page: Page, selectors: Optional[Dict[str, str]] = None):
+        # Khởi tạo AsyncLoginPage với page async của Playwright và bộ selector
+        super().__init__(page)
+        self.selectors = selectors if selectors is not None else LOGIN_PAGE_SELECTORS
+
+    async def goto(self):
+        # Điều hướng tới trang login (đợi theo READINESS)
+        await super().goto(self.URL)
+
+    async def login(self, username: str, password: str):
+        # Thực hiện thao tác đăng nhập với username và password truyền vào (một round trip)
+        await self.fill_form({
+            self.selectors["username"]: username,
+            self.selectors["password"]: password,
+        }, submit=self.selectors["login_button"])
+
+    async def get_error_message(self) -> str:
+        # Lấy thông báo lỗi hiển thị trên trang (nếu có)
+        if await self.is_element_visible(self.selectors["error_message"]):
+            return await self.get_text(self.selectors["error_message"])
+        return ""
+
+    async def is_logged_in(self) -> bool:
+        # Kiểm tra đã login thành công chưa (dựa vào url hoặc element)
+        try:
+            return "inventory" in self.page.url or await self.is_element_visible(".inventory_list")
+        except Exception:
+            return False
+
+    async def validate_login_fields(self):
+        # Kiểm tra các trường trên form login có hiển thị không
+        await self.custom_assert(await self.is_element_visible(self.selectors["username"], timeout=10000), "Username field not visible")
+        await self.custom_assert(await self.is_element_visible(self.selectors["password"], timeout=10000), "Password field not visible")
+        await self.custom_assert(await self.is_element_visible(self.selectors["login_button"], timeout=10000), "Login button not visible")
+
+    async def is_username_enabled(self) -> bool:
+        # Kiểm tra trường username có enable không
+        return await self.is_element_enabled(self.selectors["username"])
+
+    async def is_password_enabled(self) -> bool:
+        # Kiểm tra trường password có enable không
+        return await self.is_element_enabled(self.selectors["password"])
+
+    async def is_login_button_enabled(self) -> bool:
+        # Kiểm tra nút login có enable không
+        return await self.is_element_enabled(self.selectors["login_button"])
@@ -2,37 +2,43 @@ from ..base.base_page import BasePage
 from playwright.sync_api import Page
 from typing import Dict, Optional
 from ..locators.login_locators import LOGIN_PAGE_SELECTORS
+from ..locators.catalog import LocatorSet, get_catalog
+from utils.readiness import ReadinessCheck
 
 # Page Object cho trang đăng nhập (Login Page) của ứng dụng
 class LoginPage(BasePage):
     URL = "https://www.saucedemo.com/"
+    # Trang login sẵn sàng khi nút login hiển thị (không cần đợi networkidle)
+    READINESS = (ReadinessCheck(LOGIN_PAGE_SELECTORS["login_button"], state="visible"),)
 
     def __init__(self, page: Page, selectors: Optional[Dict[str, str]] = None):
-        # Khởi tạo LoginPage với page của Playwright và bộ selector (mặc định dùng LOGIN_PAGE_SELECTORS)
+        # Khởi tạo LoginPage với page của Playwright và bộ selector (mặc định dùng LOGIN_PAGE_SELECTORS của catalog)
         super().__init__(page)
-        self.selectors = selectors if selectors is not None else LOGIN_PAGE_SELECTORS
+        catalog = get_catalog()
+        self.selectors = selectors if selectors is not None else catalog.selectors("LOGIN_PAGE_SELECTORS")
+        # Locator dựng sẵn: self.ui.login_button (bộ selector tuỳ chỉnh thì không qua kiểm tra của catalog)
+        self.ui = LocatorSet(self, selectors) if selectors is not None else catalog.bind(self, "LOGIN_PAGE_SELECTORS")
 
     def goto(self):
-        # Điều hướng tới trang login
+        # Điều hướng tới trang login (đợi theo READINESS)
         super().goto(self.URL)
-        # Đợi trang load hoàn toàn
-        self.page.wait_for_load_state("networkidle", timeout=10000)
 
     def login(self, username: str, password: str):
-        # Thực hiện thao tác đăng nhập với username và password truyền vào
-        self.fill_field(self.selectors["username"], username)
-        self.fill_field(self.selectors["password"], password)
-        self.click_button(self.selectors["login_button"])
+        # Thực hiện thao tác đăng nhập với username và password truyền vào (một round trip)
+        self.fill_form({
+            self.selectors["username"]: username,
+            self.selectors["password"]: password,
+        }, submit=self.selectors["login_button"])
 
     def get_error_message(self) -> str:
         # Lấy thông báo lỗi hiển thị trên trang (nếu có)
         try:
             # Đợi error message xuất hiện
-            self.page.wait_for_selector(self.selectors["error_message"], timeout=5000)
+            self.ui.error_message.wait_for(timeout=5000)
             if self.is_element_visible(self.selectors["error_message"]):
                 return self.get_text(self.selectors["error_message"])
         except Exception as e:
-            self.logger.warning(f"Error getting error message: {e}")
+            self.logger.warning("Error getting error message: %s", e)
         return ""
 
     def is_logged_in(self) -> bool:
@@ -48,10 +54,10 @@ class LoginPage(BasePage):
         # Đợi trang load và elements xuất hiện
         self.page.wait_for_load_state("domcontentloaded", timeout=10000)
         
-        # Đợi từng element với timeout dài hơn
-        self.page.wait_for_selector(self.selectors["username"], timeout=10000)
-        self.page.wait_for_selector(self.selectors["password"], timeout=10000)
-        self.page.wait_for_selector(self.selectors["login_button"], timeout=10000)
+        # Đợi từng element với timeout dài hơn (Locator, không giữ ElementHandle)
+        self.wait_for_selector(self.selectors["username"], timeout=10000)
+        self.wait_for_selector(self.selectors["password"], timeout=10000)
+        self.wait_for_selector(self.selectors["login_button"], timeout=10000)
         
         self.custom_assert(self.is_element_visible(self.selectors["username"]), "Username field not visible")
         self.custom_assert(self.is_element_visible(self.selectors["password"]), "Password field not visible")
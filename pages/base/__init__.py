@@ -6,5 +6,6 @@ Chứa các base classes và common functionality cho tất cả Page Objects.
 """
 
 from .base_page import BasePage
+from .async_base_page import AsyncBasePage
 
-__all__ = ['BasePage'] 
\ No newline at end of file
+__all__ = ['BasePage', 'AsyncBasePage'] 
\ No newline at end of file
@@ -0,0 +1,294 @@
+from playwright.async_api import ElementHandle, Page, TimeoutError as PlaywrightTimeoutError
+import logging
+from datetime import datetime
+import time
+import allure
+from typing import Optional, Dict, Any, List, Literal, Callable, Tuple, Type, Union
+from functools import wraps
+from utils.action_metrics import action_metrics, action_target
+from utils.adaptive_timeouts import adaptive_timeouts
+from utils.handle_tracker import handle_tracker
+from utils.har_network import har_network
+from utils.retry_policy import retry_policy
+from utils.wait_accounting import wait_accounting
+from utils.screenshot_service import screenshot_service
+from utils.readiness import ReadinessCheck, expected_url, readiness_registry, url_matches
+from .dom_scripts import EXTRACT_RECORDS_SCRIPT, FILL_FORM_SCRIPT, record_fields
+
+# Lớp cơ sở async cho các Page Object, dùng với Playwright async API để chạy nhiều page đồng thời
+class AsyncBasePage:
+    # Page object con khai báo URL + READINESS để goto/wait_for_navigation đợi đúng điều kiện thay vì networkidle
+    URL: Optional[str] = None
+    READINESS: Tuple[ReadinessCheck, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.URL and cls.__dict__.get("READINESS"):
+            readiness_registry.register(cls.URL, *cls.READINESS)
+
+    def __init__(self, page: Page, mass_test_mode: bool = False):
+        # Đối tượng page (async) của Playwright
+        self.page = page
+        # Logger cho từng class kế thừa (dưới "pages" để DEBUG vào ring buffer log của test)
+        self.logger = logging.getLogger(f"pages.{self.__class__.__name__}")
+        # Mass testing mode để tối ưu performance
+        self.mass_test_mode = mass_test_mode
+        # Performance metrics
+        self._performance_metrics = {
+            "page_loads": 0,
+            "total_load_time": 0,
+            "screenshots_taken": 0,
+            "retry_attempts": 0
+        }
+
+    @staticmethod
+    def performance_monitor(func: Callable):
+        """Decorator để monitor performance của các coroutine operations (histogram latency theo method/selector)"""
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            start_time = time.perf_counter()
+            scope = handle_tracker.open_scope()
+            wait_span = wait_accounting.enter("action")
+            depth_token, outermost = action_metrics.enter()
+            result = None
+            try:
+                result = await func(self, *args, **kwargs)
+                execution_time = time.perf_counter() - start_time
+                action_metrics.record(func.__name__, action_target(args, kwargs), execution_time,
+                                      outermost=outermost)
+
+                if self.mass_test_mode:
+                    self.logger.debug("%s executed in %.3fs", func.__name__, execution_time)
+
+                self._performance_metrics['total_load_time'] += execution_time
+                return result
+            except Exception as e:
+                execution_time = time.perf_counter() - start_time
+                action_metrics.record(func.__name__, action_target(args, kwargs), execution_time, error=True,
+                                      outermost=outermost)
+                self.logger.error("%s failed after %.3fs: %s", func.__name__, execution_time, e)
+                raise
+            finally:
+                await handle_tracker.close_scope_async(scope, result)
+                wait_accounting.exit(wait_span)
+                action_metrics.exit(depth_token)
+        return wrapper
+
+    @performance_monitor
+    async def goto(self, url: str, wait_until: Optional[Literal["commit", "domcontentloaded", "load", "networkidle"]] = None,
+                   timeout: int = 30000):
+        # Điều hướng tới một URL cụ thể.
+        # wait_until=None: URL có readiness khai báo thì chỉ đợi commit + readiness, không thì networkidle
+        self.logger.info("Navigating to %s", url)
+        use_readiness = wait_until is None and bool(readiness_registry.checks_for(url))
+        if use_readiness:
+            wait_until = "commit"
+        elif wait_until is None:
+            wait_until = "networkidle"
+            readiness_registry.record_fallback()
+
+        if self.mass_test_mode and wait_until == "networkidle":
+            wait_until = "domcontentloaded"  # Faster than networkidle
+
+        # --network=record/replay: gắn HAR của entry URL trước khi điều hướng
+        await har_network.attach_async(self.page, url)
+        await self.page.goto(url, wait_until=wait_until, timeout=timeout)
+        if use_readiness:
+            with wait_accounting.span("implicit_wait"):
+                await readiness_registry.wait_async(self.page, url, timeout=timeout)
+        self._performance_metrics["page_loads"] += 1
+
+    @performance_monitor
+    async def wait_for_selector(self, selector: str, timeout: int = 5000, state: Literal["attached", "detached", "hidden", "visible"] = "visible"):
+        # Chờ cho đến khi selector đạt trạng thái mong muốn
+        if self.mass_test_mode and timeout > 3000:
+            timeout = 3000
+
+        used = adaptive_timeouts.timeout(self, selector, timeout) if state in ("attached", "visible") else timeout
+        try:
+            with adaptive_timeouts.measure(self, selector, used, timeout), wait_accounting.span("implicit_wait"):
+                await self.page.locator(selector).first.wait_for(timeout=used, state=state)
+            return True
+        except PlaywrightTimeoutError:
+            self.logger.error("Timeout waiting for selector: %s", selector)
+            return False
+
+    async def take_screenshot(self, name: str = "", optimize: bool = True, clip: Optional[Dict[str, float]] = None):
+        # Chụp màn hình ra bytes, screenshot service ghi file nền; Allure attach trên test thread
+        # sau khi runner.run() trả về (coroutine này chạy trên loop thread của async runner)
+        if not name:
+            name = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
+
+        full_page = not (self.mass_test_mode and optimize)
+        options = screenshot_service.screenshot_options(full_page=full_page, clip=clip)
+        image = await self.page.screenshot(**options)
+        path = screenshot_service.save(image, name, options["type"], attach_name=name, source=self.page,
+                                       defer_attach=True)
+
+        self._performance_metrics["screenshots_taken"] += 1
+        self.logger.debug("Screenshot saved to %s", path)
+        return path
+
+    async def custom_assert(self, condition, message: str, take_screenshot: bool = True):
+        # Hàm assert tuỳ chỉnh, chụp màn hình khi fail
+        if not condition:
+            self.logger.error("Assertion failed: %s", message)
+
+            if take_screenshot:
+                await self.take_screenshot(f"assertion_failed_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png")
+
+            screenshot_service.defer_attachment(f"Assertion failed: {message}", "Error Details",
+                                                allure.attachment_type.TEXT)
+
+            assert condition, message
+
+    async def is_element_visible(self, selector: str, timeout: int = 5000) -> bool:
+        # Kiểm tra một phần tử có hiển thị trên trang không (Locator, không tạo ElementHandle)
+        try:
+            element = self.page.locator(selector).first
+            used = adaptive_timeouts.timeout(self, selector, timeout)
+            with adaptive_timeouts.measure(self, selector, used, timeout), wait_accounting.span("implicit_wait"):
+                await element.wait_for(timeout=used, state="attached")
+            return await element.is_visible()
+        except Exception as e:
+            self.logger.warning("Element %s not visible: %s", selector, e)
+            return False
+
+    async def is_element_enabled(self, selector: str) -> bool:
+        # Kiểm tra một phần tử có enable không
+        try:
+            return await self.page.locator(selector).first.is_enabled()
+        except Exception:
+            return False
+
+    async def _before_retry(self, error_class: str):
+        # Chạy trước mỗi lần retry: đợi trang ổn định nếu lỗi do navigation
+        self._performance_metrics["retry_attempts"] += 1
+        if error_class == "navigation":
+            try:
+                with wait_accounting.span("implicit_wait"):
+                    await self.page.wait_for_load_state("domcontentloaded")
+            except Exception as e:
+                self.logger.debug("Wait for load state before retry failed: %s", e)
+
+    @performance_monitor
+    async def fill_field(self, selector: str, value: str, timeout: int = 5000, retry: int = 2, clear_first: bool = True):
+        # Điền giá trị vào ô input, retry bằng retry_policy (asyncio.sleep, không chặn các page khác)
+        used = adaptive_timeouts.timeout(self, selector, timeout)
+
+        async def _fill():
+            self.logger.debug("Filling field %s", selector)
+            with adaptive_timeouts.measure(self, selector, used, timeout):
+                if clear_first:
+                    await self.page.fill(selector, "", timeout=used)
+                await self.page.fill(selector, value, timeout=used)
+
+        try:
+            await retry_policy.call_async(_fill, attempts=retry, description=f"Fill {selector}",
+                                          on_retry=self._before_retry)
+        except Exception as e:
+            await self.custom_assert(False, f"Failed to fill field {selector} after {retry} attempts: {e}")
+
+    @performance_monitor
+    async def click_button(self, selector: str, timeout: int = 5000, retry: int = 2, force: bool = False):
+        # Click vào button, retry bằng retry_policy (asyncio.sleep, không chặn các page khác)
+        used = adaptive_timeouts.timeout(self, selector, timeout)
+
+        async def _click():
+            self.logger.debug("Clicking button %s", selector)
+            with adaptive_timeouts.measure(self, selector, used, timeout):
+                await self.page.click(selector, timeout=used, force=force)
+
+        try:
+            await retry_policy.call_async(_click, attempts=retry, description=f"Click {selector}",
+                                          on_retry=self._before_retry)
+        except Exception as e:
+            await self.custom_assert(False, f"Failed to click button {selector} after {retry} attempts: {e}")
+
+    @performance_monitor
+    async def fill_form(self, fields: Dict[str, Any], submit: Optional[str] = None, timeout: int = 5000) -> bool:
+        # Điền nhiều field {selector: giá trị (bool cho checkbox)} rồi click submit trong MỘT lần evaluate
+        args = {"fields": [[selector, value] for selector, value in fields.items()], "submit": submit}
+        self.logger.debug("Filling form %s (submit: %s)", list(fields), submit)
+
+        async def _fill():
+            return await self.page.evaluate(FILL_FORM_SCRIPT, args)
+
+        # Có submit thì không retry: lần evaluate lỗi có thể đã submit form
+        result = await retry_policy.call_async(_fill, attempts=1 if submit else 2, description="Fill form",
+                                               on_retry=self._before_retry)
+        if result["missing"]:
+            try:
+                with wait_accounting.span("implicit_wait"):
+                    for selector in result["missing"]:
+                        await self.page.locator(selector).first.wait_for(state="visible", timeout=timeout)
+            except PlaywrightTimeoutError:
+                pass
+            result = await _fill()
+        await self.custom_assert(not result["missing"], f"Form fields not ready: {result['missing']}")
+        return result["submitted"]
+
+    @performance_monitor
+    async def get_text(self, selector: str, timeout: int = 5000) -> str:
+        # Lấy text của một phần tử trên trang
+        self.logger.debug("Getting text from %s", selector)
+        try:
+            await self.wait_for_selector(selector, timeout)
+            msg = await self.page.text_content(selector)
+            return msg if msg is not None else ""
+        except Exception as e:
+            self.logger.error("Error getting text from %s: %s", selector, e)
+            return ""
+
+    async def wait_for_navigation(self, expected: Union[str, "AsyncBasePage", Type["AsyncBasePage"]],
+                                  timeout: int = 10000):
+        # Chờ điều hướng tới trang expected: đợi URL đổi sang trang đó rồi mới đợi readiness (xem BasePage)
+        url = expected_url(expected)
+        deadline = time.perf_counter() + timeout / 1000
+        with wait_accounting.span("implicit_wait"):
+            try:
+                await self.page.wait_for_url(lambda current: url_matches(url, current), wait_until="commit",
+                                             timeout=timeout)
+                remaining = max(1.0, (deadline - time.perf_counter()) * 1000)
+                if not await readiness_registry.wait_async(self.page, timeout=remaining):
+                    readiness_registry.record_fallback()
+                    await self.page.wait_for_load_state("networkidle", timeout=remaining)
+            except PlaywrightTimeoutError:
+                self.logger.error("Navigation to %s not completed within %sms (current URL: %s)",
+                                  url, timeout, self.page.url)
+                raise
+
+    @performance_monitor
+    async def extract_records(self, selector: str,
+                              fields: Dict[str, Tuple[Optional[str], str]]) -> List[Dict[str, Any]]:
+        # Đọc text/attribute/visible/enabled của mọi element khớp selector trong MỘT round trip
+        records = await self.page.locator(selector).evaluate_all(EXTRACT_RECORDS_SCRIPT, record_fields(fields))
+        self.logger.debug("Extracted %s records from %s", len(records), selector)
+        return records
+
+    async def query_handle(self, selector: str) -> Optional[ElementHandle]:
+        # Chỉ dùng khi thật sự cần ElementHandle (ưu tiên Locator): handle được theo dõi và tự dispose
+        return handle_tracker.track(await self.page.query_selector(selector))
+
+    async def query_handles(self, selector: str) -> List[ElementHandle]:
+        # Giống query_handle cho mọi element khớp selector
+        return handle_tracker.track_all(await self.page.query_selector_all(selector))
+
+    def track_handle(self, handle):
+        # Đăng ký handle lấy từ API khác (evaluate_handle, wait_for_selector...) để được dispose tự động
+        return handle_tracker.track(handle)
+
+    async def get_element_count(self, selector: str) -> int:
+        # Đếm số lượng elements matching selector (một round trip, không tạo ElementHandle)
+        try:
+            return await self.page.locator(selector).count()
+        except Exception as e:
+            self.logger.error("Error counting elements %s: %s", selector, e)
+            return 0
+
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        # Lấy performance metrics của page
+        return {
+            **self._performance_metrics,
+            "avg_load_time": self._performance_metrics["total_load_time"] / max(self._performance_metrics["page_loads"], 1),
+        }
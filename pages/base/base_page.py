@@ -1,23 +1,61 @@
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import ElementHandle, Frame, Locator, Page, TimeoutError as PlaywrightTimeoutError
 import logging
-import os
 from datetime import datetime
 import time
+import weakref
 import allure
-from typing import Optional, Dict, Any, List, Literal, Callable
+from typing import Optional, Dict, Any, List, Literal, Callable, Tuple, Type, Union
 from functools import wraps
+from utils.action_metrics import action_metrics, action_target
+from utils.adaptive_timeouts import adaptive_timeouts
+from utils.handle_tracker import handle_tracker
+from utils.har_network import har_network
+from utils.resource_policy import get_policy, resource_blocker
+from utils.retry_policy import retry_policy
+from utils.wait_accounting import wait_accounting
+from utils.screenshot_service import screenshot_service
+from utils.readiness import ReadinessCheck, expected_url, readiness_registry, url_matches
+from .dom_scripts import EXTRACT_RECORDS_SCRIPT, FILL_FORM_SCRIPT, record_fields
+
+# Page object đang sống theo page: mỗi page chỉ có một listener framenavigated dùng chung,
+# page object bị bỏ đi tự rời WeakSet nên không tích tụ listener/tham chiếu
+_page_objects: "weakref.WeakKeyDictionary[Page, weakref.WeakSet]" = weakref.WeakKeyDictionary()
+
+
+def _register_page_object(page_object: "BasePage"):
+    page_objects = _page_objects.get(page_object.page)
+    if page_objects is None:
+        page_objects = _page_objects[page_object.page] = weakref.WeakSet()
+
+        def _on_frame_navigated(frame: Frame):
+            for live in list(page_objects):
+                live._on_frame_navigated(frame)
+        page_object.page.on("framenavigated", _on_frame_navigated)
+    page_objects.add(page_object)
+
 
 # Lớp cơ sở cho tất cả các Page Object, cung cấp các hàm thao tác chung với trang web
 class BasePage:
+    # Page object con khai báo URL + READINESS để goto/wait_for_navigation đợi đúng điều kiện thay vì networkidle
+    URL: Optional[str] = None
+    READINESS: Tuple[ReadinessCheck, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.URL and cls.__dict__.get("READINESS"):
+            readiness_registry.register(cls.URL, *cls.READINESS)
+
     def __init__(self, page: Page, mass_test_mode: bool = False):
         # Đối tượng page của Playwright để thao tác với browser
         self.page = page
-        # Logger để ghi log cho từng class kế thừa
-        self.logger = logging.getLogger(self.__class__.__name__)
+        # Logger cho từng class kế thừa (dưới "pages" để DEBUG vào ring buffer log của test)
+        self.logger = logging.getLogger(f"pages.{self.__class__.__name__}")
         # Mass testing mode để tối ưu performance
         self.mass_test_mode = mass_test_mode
-        # Cache cho selectors để tăng performance
-        self._selector_cache = {}
+        # Cache Locator theo (frame, selector), bị xoá khi frame điều hướng
+        self._locator_cache: Dict[Tuple[Frame, str], Locator] = {}
+        self._locator_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        _register_page_object(self)
         # Performance metrics
         self._performance_metrics = {
             "page_loads": 0,
@@ -28,17 +66,24 @@ class BasePage:
 
     @staticmethod
     def performance_monitor(func: Callable):
-        """Decorator để monitor performance của các operations"""
+        """Decorator để monitor performance của các operations (histogram latency theo method/selector).
+        Handle tạo trong action được dispose khi action kết thúc (xem utils/handle_tracker.py)."""
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
+            scope = handle_tracker.open_scope()
+            wait_span = wait_accounting.enter("action")
+            depth_token, outermost = action_metrics.enter()
+            result = None
             try:
                 result = func(self, *args, **kwargs)
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
+                action_metrics.record(func.__name__, action_target(args, kwargs), execution_time,
+                                      outermost=outermost)
                 
                 # Log performance metrics
                 if hasattr(self, 'mass_test_mode') and self.mass_test_mode:
-                    self.logger.debug(f"{func.__name__} executed in {execution_time:.3f}s")
+                    self.logger.debug("%s executed in %.3fs", func.__name__, execution_time)
                 
                 # Update metrics
                 if hasattr(self, '_performance_metrics'):
@@ -46,71 +91,97 @@ class BasePage:
                 
                 return result
             except Exception as e:
-                execution_time = time.time() - start_time
-                self.logger.error(f"{func.__name__} failed after {execution_time:.3f}s: {e}")
+                execution_time = time.perf_counter() - start_time
+                action_metrics.record(func.__name__, action_target(args, kwargs), execution_time, error=True,
+                                      outermost=outermost)
+                self.logger.error("%s failed after %.3fs: %s", func.__name__, execution_time, e)
                 raise
+            finally:
+                handle_tracker.close_scope(scope, result)
+                wait_accounting.exit(wait_span)
+                action_metrics.exit(depth_token)
         return wrapper
 
+    def locator(self, selector: str, frame: Optional[Frame] = None) -> Locator:
+        # Lấy Locator từ cache (tạo mới nếu frame đã điều hướng hoặc chưa có)
+        frame = frame or self.page.main_frame
+        key = (frame, selector)
+        cached = self._locator_cache.get(key)
+        if cached is not None:
+            self._locator_stats["hits"] += 1
+            return cached
+        self._locator_stats["misses"] += 1
+        locator = frame.locator(selector)
+        self._locator_cache[key] = locator
+        return locator
+
+    def _on_frame_navigated(self, frame: Frame):
+        # Document mới: bỏ các Locator của frame này
+        stale = [key for key in self._locator_cache if key[0] == frame]
+        for key in stale:
+            del self._locator_cache[key]
+        self._locator_stats["invalidations"] += len(stale)
+
     @performance_monitor
-    def goto(self, url: str, wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "networkidle"):
-        # Hàm điều hướng tới một URL cụ thể với performance optimization
-        self.logger.info(f"Navigating to {url}")
+    def goto(self, url: str, wait_until: Optional[Literal["commit", "domcontentloaded", "load", "networkidle"]] = None,
+             timeout: int = 30000):
+        # Hàm điều hướng tới một URL cụ thể với performance optimization.
+        # wait_until=None: URL có readiness khai báo thì chỉ đợi commit + readiness, không thì networkidle
+        self.logger.info("Navigating to %s", url)
+        use_readiness = wait_until is None and bool(readiness_registry.checks_for(url))
+        if use_readiness:
+            wait_until = "commit"
+        elif wait_until is None:
+            wait_until = "networkidle"
+            readiness_registry.record_fallback()
         
         # Optimize for mass testing
-        if self.mass_test_mode:
+        if self.mass_test_mode and wait_until == "networkidle":
             wait_until = "domcontentloaded"  # Faster than networkidle
         
-        self.page.goto(url, wait_until=wait_until)
+        # --network=record/replay: gắn HAR của entry URL trước khi điều hướng
+        har_network.attach(self.page, url)
+        self.page.goto(url, wait_until=wait_until, timeout=timeout)
+        if use_readiness:
+            with wait_accounting.span("implicit_wait"):
+                readiness_registry.wait(self.page, url, timeout=timeout)
         self._performance_metrics["page_loads"] += 1
 
     @performance_monitor
     def wait_for_selector(self, selector: str, timeout: int = 5000, state: Literal["attached", "detached", "hidden", "visible"] = "visible"):
-        # Chờ cho đến khi selector xuất hiện trên trang với caching
+        # Chờ cho đến khi selector đạt trạng thái mong muốn (luôn kiểm tra lại trên DOM hiện tại)
         if self.mass_test_mode and timeout > 3000:
             timeout = 3000  # Reduce timeout for mass testing
         
-        # Check cache first
-        if selector in self._selector_cache:
-            cached_state = self._selector_cache[selector]
-            if cached_state == state:
-                return True
-        
+        # Timeout học từ lịch sử của selector (--adaptive-timeouts), timeout yêu cầu là trần
+        used = adaptive_timeouts.timeout(self, selector, timeout) if state in ("attached", "visible") else timeout
         try:
-            self.page.wait_for_selector(selector, timeout=timeout, state=state)
-            # Cache the result
-            self._selector_cache[selector] = state
+            with adaptive_timeouts.measure(self, selector, used, timeout), wait_accounting.span("implicit_wait"):
+                self.locator(selector).first.wait_for(timeout=used, state=state)
             return True
         except PlaywrightTimeoutError:
-            self.logger.error(f"Timeout waiting for selector: {selector}")
+            self.logger.error("Timeout waiting for selector: %s", selector)
             return False
 
-    def take_screenshot(self, name: str = "", optimize: bool = True):
-        # Chụp màn hình toàn trang với optimization cho mass testing
+    def take_screenshot(self, name: str = "", optimize: bool = True, clip: Optional[Dict[str, float]] = None):
+        # Chụp màn hình toàn trang (hoặc vùng clip) với optimization cho mass testing
         if not name:
             name = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
         
-        path = os.path.join("screenshots", name)
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        
-        # Optimize screenshot for mass testing
-        if self.mass_test_mode and optimize:
-            # Take smaller screenshots for mass testing
-            self.page.screenshot(path=path, full_page=False)
-        else:
-            self.page.screenshot(path=path, full_page=True)
+        # Optimize screenshot for mass testing: chỉ chụp viewport
+        full_page = not (self.mass_test_mode and optimize)
+        # Ghi file và attach Allure do screenshot service xử lý (không đọc lại file)
+        path = screenshot_service.capture(self.page, name, full_page=full_page, clip=clip, attach_name=name)
         
         self._performance_metrics["screenshots_taken"] += 1
-        self.logger.info(f"Screenshot saved to {path}")
-        
-        # Attach to Allure report
-        allure.attach.file(path, name, allure.attachment_type.PNG)
+        self.logger.debug("Screenshot saved to %s", path)
         
         return path
 
     def custom_assert(self, condition, message: str, take_screenshot: bool = True):
         # Hàm assert tuỳ chỉnh với enhanced error handling
         if not condition:
-            self.logger.error(f"Assertion failed: {message}")
+            self.logger.error("Assertion failed: %s", message)
             
             if take_screenshot:
                 self.take_screenshot(f"assertion_failed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
@@ -121,127 +192,170 @@ class BasePage:
             assert condition, message
 
     def is_element_visible(self, selector: str, timeout: int = 5000) -> bool:
-        # Kiểm tra một phần tử có hiển thị trên trang không với caching
+        # Kiểm tra một phần tử có hiển thị trên trang không (dùng Locator đã cache)
         try:
             # Đợi element xuất hiện trước khi check visibility
-            self.page.wait_for_selector(selector, timeout=timeout, state="attached")
-            return self.page.is_visible(selector)
+            element = self.locator(selector).first
+            used = adaptive_timeouts.timeout(self, selector, timeout)
+            with adaptive_timeouts.measure(self, selector, used, timeout), wait_accounting.span("implicit_wait"):
+                element.wait_for(timeout=used, state="attached")
+            return element.is_visible()
         except Exception as e:
-            self.logger.warning(f"Element {selector} not visible: {e}")
+            self.logger.warning("Element %s not visible: %s", selector, e)
             return False
 
     def is_element_enabled(self, selector: str) -> bool:
         # Kiểm tra một phần tử có enable không
         try:
-            return self.page.is_enabled(selector)
+            return self.locator(selector).first.is_enabled()
         except Exception:
             return False
 
     def is_element_disabled(self, selector: str) -> bool:
         # Kiểm tra một phần tử có disable không
         try:
-            return self.page.is_disabled(selector)
+            return self.locator(selector).first.is_disabled()
         except Exception:
             return False
 
+    def _before_retry(self, error_class: str):
+        # Chạy trước mỗi lần retry: đợi trang ổn định nếu lỗi do navigation
+        self._performance_metrics["retry_attempts"] += 1
+        if error_class == "navigation":
+            try:
+                with wait_accounting.span("implicit_wait"):
+                    self.page.wait_for_load_state("domcontentloaded")
+            except Exception as e:
+                self.logger.debug("Wait for load state before retry failed: %s", e)
+
     @performance_monitor
     def fill_field(self, selector: str, value: str, timeout: int = 5000, retry: int = 2, clear_first: bool = True):
-        # Điền giá trị vào ô input với enhanced retry mechanism
-        for attempt in range(retry):
-            try:
-                self.logger.info(f"Filling field {selector} with value '{value}' (attempt {attempt+1})")
-                
-                # Clear field first if requested
+        # Điền giá trị vào ô input, retry theo loại lỗi bằng retry_policy
+        used = adaptive_timeouts.timeout(self, selector, timeout)
+
+        def _fill():
+            self.logger.debug("Filling field %s", selector)
+            element = self.locator(selector).first
+            with adaptive_timeouts.measure(self, selector, used, timeout):
                 if clear_first:
-                    self.page.fill(selector, "", timeout=timeout)
-                
-                self.page.fill(selector, value, timeout=timeout)
-                return
-            except Exception as e:
-                self.logger.warning(f"Fill failed (attempt {attempt+1}): {e}")
-                self._performance_metrics["retry_attempts"] += 1
-                
-                if attempt < retry - 1:
-                    time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                else:
-                    self.custom_assert(False, f"Failed to fill field {selector} after {retry} attempts")
+                    element.fill("", timeout=used)
+                element.fill(value, timeout=used)
+
+        try:
+            retry_policy.call(_fill, attempts=retry, description=f"Fill {selector}", on_retry=self._before_retry)
+        except Exception as e:
+            self.custom_assert(False, f"Failed to fill field {selector} after {retry} attempts: {e}")
 
     @performance_monitor
     def click_button(self, selector: str, timeout: int = 5000, retry: int = 2, force: bool = False):
-        # Click vào button với enhanced retry mechanism
-        for attempt in range(retry):
+        # Click vào button, retry theo loại lỗi bằng retry_policy
+        used = adaptive_timeouts.timeout(self, selector, timeout)
+
+        def _click():
+            self.logger.debug("Clicking button %s", selector)
+            with adaptive_timeouts.measure(self, selector, used, timeout):
+                self.locator(selector).first.click(timeout=used, force=force)
+
+        try:
+            retry_policy.call(_click, attempts=retry, description=f"Click {selector}", on_retry=self._before_retry)
+        except Exception as e:
+            self.custom_assert(False, f"Failed to click button {selector} after {retry} attempts: {e}")
+
+    @performance_monitor
+    def fill_form(self, fields: Dict[str, Any], submit: Optional[str] = None, timeout: int = 5000,
+                  frame: Optional[Frame] = None) -> bool:
+        # Điền nhiều field {selector: giá trị (bool cho checkbox)} rồi click submit trong MỘT lần evaluate.
+        # Selector phải là CSS (chạy bằng document.querySelector). Field chưa render/đang disable
+        # thì đợi field đó rồi thử lại một lần.
+        frame = frame or self.page.main_frame
+        args = {"fields": [[selector, value] for selector, value in fields.items()], "submit": submit}
+        self.logger.debug("Filling form %s (submit: %s)", list(fields), submit)
+
+        def _fill():
+            return frame.evaluate(FILL_FORM_SCRIPT, args)
+
+        # Có submit thì không retry: lần evaluate lỗi có thể đã submit form
+        result = retry_policy.call(_fill, attempts=1 if submit else 2, description="Fill form",
+                                   on_retry=self._before_retry)
+        if result["missing"]:
             try:
-                self.logger.info(f"Clicking button {selector} (attempt {attempt+1})")
-                
-                if force:
-                    self.page.click(selector, timeout=timeout, force=True)
-                else:
-                    self.page.click(selector, timeout=timeout)
-                return
-            except Exception as e:
-                self.logger.warning(f"Click failed (attempt {attempt+1}): {e}")
-                self._performance_metrics["retry_attempts"] += 1
-                
-                if attempt < retry - 1:
-                    time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                else:
-                    self.custom_assert(False, f"Failed to click button {selector} after {retry} attempts")
+                with wait_accounting.span("implicit_wait"):
+                    for selector in result["missing"]:
+                        self.locator(selector, frame).first.wait_for(state="visible", timeout=timeout)
+            except PlaywrightTimeoutError:
+                pass
+            result = _fill()
+        self.custom_assert(not result["missing"], f"Form fields not ready: {result['missing']}")
+        return result["submitted"]
 
+    @performance_monitor
     def get_text(self, selector: str, timeout: int = 5000) -> str:
         # Lấy text của một phần tử trên trang với error handling
-        self.logger.info(f"Getting text from {selector}")
+        self.logger.debug("Getting text from %s", selector)
         try:
             self.wait_for_selector(selector, timeout)
-            msg = self.page.text_content(selector)
+            msg = self.locator(selector).first.text_content()
             return msg if msg is not None else ""
         except Exception as e:
-            self.logger.error(f"Error getting text from {selector}: {e}")
+            self.logger.error("Error getting text from %s: %s", selector, e)
             return ""
 
     def get_attribute(self, selector: str, attribute: str, timeout: int = 5000) -> Optional[str]:
         # Lấy attribute của một phần tử
         try:
             self.wait_for_selector(selector, timeout)
-            return self.page.get_attribute(selector, attribute)
+            return self.locator(selector).first.get_attribute(attribute)
         except Exception as e:
-            self.logger.error(f"Error getting attribute {attribute} from {selector}: {e}")
+            self.logger.error("Error getting attribute %s from %s: %s", attribute, selector, e)
             return None
 
     def select_option(self, selector: str, value: str, timeout: int = 5000):
         # Chọn option từ dropdown
         try:
-            self.logger.info(f"Selecting option {value} from {selector}")
-            self.page.select_option(selector, value, timeout=timeout)
+            self.logger.debug("Selecting option %s from %s", value, selector)
+            self.locator(selector).first.select_option(value, timeout=timeout)
         except Exception as e:
-            self.logger.error(f"Error selecting option {value} from {selector}: {e}")
+            self.logger.error("Error selecting option %s from %s: %s", value, selector, e)
             raise
 
-    def wait_for_navigation(self, timeout: int = 10000):
-        # Chờ navigation hoàn thành
-        try:
-            self.page.wait_for_load_state("networkidle", timeout=timeout)
-        except Exception as e:
-            self.logger.warning(f"Navigation timeout: {e}")
+    def wait_for_navigation(self, expected: Union[str, "BasePage", Type["BasePage"]], timeout: int = 10000):
+        # Chờ điều hướng tới trang expected (URL/glob hoặc page object có URL): đợi URL đổi sang trang đó rồi
+        # mới đợi readiness của trang (chưa khai báo thì networkidle). Không tới được thì raise TimeoutError
+        url = expected_url(expected)
+        deadline = time.perf_counter() + timeout / 1000
+        with wait_accounting.span("implicit_wait"):
+            try:
+                self.page.wait_for_url(lambda current: url_matches(url, current), wait_until="commit", timeout=timeout)
+                remaining = max(1.0, (deadline - time.perf_counter()) * 1000)
+                if not readiness_registry.wait(self.page, timeout=remaining):
+                    readiness_registry.record_fallback()
+                    self.page.wait_for_load_state("networkidle", timeout=remaining)
+            except PlaywrightTimeoutError:
+                self.logger.error("Navigation to %s not completed within %sms (current URL: %s)",
+                                  url, timeout, self.page.url)
+                raise
 
     def get_performance_metrics(self) -> Dict[str, Any]:
         # Lấy performance metrics của page
         return {
             **self._performance_metrics,
             "avg_load_time": self._performance_metrics["total_load_time"] / max(self._performance_metrics["page_loads"], 1),
-            "cache_hit_rate": len(self._selector_cache) / max(self._performance_metrics["page_loads"], 1)
+            "locator_cache_hits": self._locator_stats["hits"],
+            "locator_cache_misses": self._locator_stats["misses"],
+            "locator_cache_invalidations": self._locator_stats["invalidations"],
+            "cache_hit_rate": self._locator_stats["hits"] / max(self._locator_stats["hits"] + self._locator_stats["misses"], 1)
         }
 
     def clear_cache(self):
-        # Clear selector cache
-        self._selector_cache.clear()
-        self.logger.info("Selector cache cleared")
+        # Clear Locator cache
+        self._locator_cache.clear()
+        self.logger.info("Locator cache cleared")
 
     def optimize_for_mass_testing(self):
         # Tối ưu page cho mass testing
         if self.mass_test_mode:
-            # Disable unnecessary features
-            self.page.route("**/*.{png,jpg,jpeg,gif,svg,ico}", lambda route: route.abort())
-            self.page.route("**/*.{css}", lambda route: route.abort())
+            # Chặn ảnh/font/CSS/bên thứ ba bằng policy "mass" (một route cho cả context)
+            resource_blocker.apply(self.page.context, get_policy("mass"))
             
             # Set faster timeouts
             self.page.set_default_timeout(5000)  # 5 seconds
@@ -252,28 +366,52 @@ class BasePage:
     def wait_for_network_idle(self, timeout: int = 10000):
         # Chờ network idle với timeout
         try:
-            self.page.wait_for_load_state("networkidle", timeout=timeout)
+            with wait_accounting.span("implicit_wait"):
+                self.page.wait_for_load_state("networkidle", timeout=timeout)
         except Exception as e:
-            self.logger.warning(f"Network idle timeout: {e}")
+            self.logger.warning("Network idle timeout: %s", e)
 
     def scroll_to_element(self, selector: str, timeout: int = 5000):
         # Scroll đến element
         try:
-            self.page.locator(selector).scroll_into_view_if_needed(timeout=timeout)
+            self.locator(selector).first.scroll_into_view_if_needed(timeout=timeout)
         except Exception as e:
-            self.logger.error(f"Error scrolling to {selector}: {e}")
+            self.logger.error("Error scrolling to %s: %s", selector, e)
 
     def hover_element(self, selector: str, timeout: int = 5000):
         # Hover over element
         try:
-            self.page.hover(selector, timeout=timeout)
+            self.locator(selector).first.hover(timeout=timeout)
         except Exception as e:
-            self.logger.error(f"Error hovering over {selector}: {e}")
+            self.logger.error("Error hovering over %s: %s", selector, e)
+
+    @performance_monitor
+    def extract_records(self, selector: str, fields: Dict[str, Tuple[Optional[str], str]],
+                        frame: Optional[Frame] = None) -> List[Dict[str, Any]]:
+        # Đọc text/attribute/visible/enabled của mọi element khớp selector trong MỘT round trip.
+        # Ví dụ: extract_records(".inventory_item", {"name": (".inventory_item_name", "text"),
+        #                                            "in_cart": ("button", "attr:data-test")})
+        records = self.locator(selector, frame).evaluate_all(EXTRACT_RECORDS_SCRIPT, record_fields(fields))
+        self.logger.debug("Extracted %s records from %s", len(records), selector)
+        return records
+
+    def query_handle(self, selector: str, frame: Optional[Frame] = None) -> Optional[ElementHandle]:
+        # Chỉ dùng khi thật sự cần ElementHandle (ưu tiên Locator): handle được theo dõi và tự dispose
+        # khi action kết thúc hoặc ở teardown của test
+        return handle_tracker.track((frame or self.page.main_frame).query_selector(selector))
+
+    def query_handles(self, selector: str, frame: Optional[Frame] = None) -> List[ElementHandle]:
+        # Giống query_handle cho mọi element khớp selector
+        return handle_tracker.track_all((frame or self.page.main_frame).query_selector_all(selector))
+
+    def track_handle(self, handle):
+        # Đăng ký handle lấy từ API khác (evaluate_handle, wait_for_selector...) để được dispose tự động
+        return handle_tracker.track(handle)
 
     def get_element_count(self, selector: str) -> int:
-        # Đếm số lượng elements matching selector
+        # Đếm số lượng elements matching selector (một round trip, không tạo ElementHandle)
         try:
-            return len(self.page.query_selector_all(selector))
+            return self.locator(selector).count()
         except Exception as e:
-            self.logger.error(f"Error counting elements {selector}: {e}")
+            self.logger.error("Error counting elements %s: %s", selector, e)
             return 0 
\ No newline at end of file
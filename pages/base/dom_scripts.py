@@ -0,0 +1,135 @@
+"""
+DOM Scripts
+===========
+
+Các script JavaScript dùng chung cho BasePage và AsyncBasePage.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+RECORD_PROPERTIES = ("text", "inner_text", "value", "visible", "enabled", "count")
+
+# Script đọc nhiều thuộc tính của nhiều element trong một lần evaluate.
+# fields: {tên: [sub-selector hoặc null (chính element), property]}
+# property: text, inner_text, value, visible, enabled, count hoặc attr:<tên attribute>
+EXTRACT_RECORDS_SCRIPT = """(elements, fields) => {
+    const isVisible = (el) => {
+        if (!el) return false;
+        const rect = el.getBoundingClientRect();
+        const style = window.getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const read = (root, [selector, property]) => {
+        if (property === 'count') return selector ? root.querySelectorAll(selector).length : 1;
+        const el = selector ? root.querySelector(selector) : root;
+        if (property === 'visible') return isVisible(el);
+        if (!el) return null;
+        if (property === 'text') return (el.textContent || '').trim();
+        if (property === 'inner_text') return (el.innerText || '').trim();
+        if (property === 'value') return el.value === undefined ? null : el.value;
+        if (property === 'enabled') return !el.matches(':disabled') && el.getAttribute('aria-disabled') !== 'true';
+        if (property.startsWith('attr:')) return el.getAttribute(property.slice(5));
+        throw new Error('Unknown property ' + property);
+    };
+    return elements.map((root) => {
+        const record = {};
+        for (const [name, spec] of Object.entries(fields)) record[name] = read(root, spec);
+        return record;
+    });
+}"""
+
+
+def record_fields(fields: Dict[str, Tuple[Optional[str], str]]) -> Dict[str, List[Optional[str]]]:
+    """Kiểm tra và chuyển field spec {tên: (sub-selector, property)} sang dạng gửi cho script"""
+    spec = {}
+    for name, (sub_selector, prop) in fields.items():
+        if prop not in RECORD_PROPERTIES and not prop.startswith("attr:"):
+            raise ValueError(f"Unknown record property '{prop}' for field '{name}'")
+        spec[name] = [sub_selector, prop]
+    return spec
+
+
+# Script điền nhiều field và submit trong một lần evaluate.
+# Giá trị được set qua native setter của prototype (React/Vue theo dõi setter của instance),
+# sau đó bắn input/change để framework của app cập nhật state như khi người dùng gõ.
+# args: {fields: [[CSS selector, value]], submit: CSS selector hoặc null}
+FILL_FORM_SCRIPT = """({fields, submit}) => {
+    const nativeSetter = (el, property) => {
+        const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+            : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+        return Object.getOwnPropertyDescriptor(proto, property).set;
+    };
+    const targets = fields.map(([selector, value]) => [selector, value, document.querySelector(selector)]);
+    const missing = targets.filter(([, , el]) => !el || el.disabled || el.readOnly).map(([selector]) => selector);
+    const submitEl = submit ? document.querySelector(submit) : null;
+    if (submit && (!submitEl || submitEl.disabled)) missing.push(submit);
+    if (missing.length) return {filled: 0, submitted: false, missing};
+
+    for (const [, value, el] of targets) {
+        el.focus();
+        if (typeof value === 'boolean') {
+            nativeSetter(el, 'checked').call(el, value);
+        } else {
+            nativeSetter(el, 'value').call(el, String(value));
+        }
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        el.blur();
+    }
+    // click() bắn click event thật: handler của app (SPA login, form submit) chạy ngay trong lần evaluate này
+    if (submitEl) submitEl.click();
+    return {filled: targets.length, submitted: !!submitEl, missing: []};
+}"""
+
+
+# Script bật/tắt nút giỏ hàng của nhiều sản phẩm trong một lần evaluate rồi đọc badge.
+# args: {items, name, button, badge: CSS selector; action: "add" | "remove";
+#        names: tên hiển thị hoặc slug data-test (null = mọi sản phẩm); timeout: ms}
+# App (React) render lại sau click nên script đợi tới khi mọi nút đã đổi trạng thái và badge
+# bằng số sản phẩm trong giỏ, hoặc hết timeout.
+BATCH_CART_SCRIPT = """async ({items, name, button, badge, action, names, timeout}) => {
+    const prefix = action === 'add' ? 'add-to-cart-' : 'remove-';
+    const wanted = names ? new Set(names) : null;
+    const dataTest = (el) => (el && el.getAttribute('data-test')) || '';
+    const products = () => Array.from(document.querySelectorAll(items)).map((item) => {
+        const buttonEl = item.querySelector(button);
+        const nameEl = item.querySelector(name);
+        const test = dataTest(buttonEl);
+        return {
+            button: buttonEl,
+            name: nameEl ? (nameEl.textContent || '').trim() : '',
+            slug: test.replace(/^(add-to-cart-|remove-)/, ''),
+            inCart: test.startsWith('remove-'),
+        };
+    });
+    const badgeCount = () => {
+        const el = document.querySelector(badge);
+        return el ? parseInt(el.textContent, 10) || 0 : 0;
+    };
+
+    const found = new Set();
+    const clicked = [];
+    for (const product of products()) {
+        const key = !wanted ? product.slug : wanted.has(product.slug) ? product.slug
+            : wanted.has(product.name) ? product.name : null;
+        if (key === null || !product.button) continue;
+        found.add(key);
+        if (product.button.getAttribute('data-test').startsWith(prefix)) {
+            product.button.click();
+            clicked.push(product.slug);
+        }
+    }
+    const missing = wanted ? Array.from(wanted).filter((key) => !found.has(key)) : [];
+
+    const pending = new Set(clicked);
+    const settled = () => {
+        const current = products();
+        const done = current.filter((p) => pending.has(p.slug) && p.inCart === (action === 'add')).length;
+        return done === pending.size && badgeCount() === current.filter((p) => p.inCart).length;
+    };
+    const deadline = performance.now() + timeout;
+    while (clicked.length && !settled() && performance.now() < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, 16));
+    }
+    return {clicked, missing, count: badgeCount(), settled: !clicked.length || settled()};
+}"""
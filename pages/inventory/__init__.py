@@ -6,5 +6,6 @@ Chứa các Page Objects liên quan đến inventory, products, cart, etc.
 """
 
 from .inventory_page import InventoryPage
+from .async_inventory_page import AsyncInventoryPage
 
-__all__ = ['InventoryPage'] 
\ No newline at end of file
+__all__ = ['InventoryPage', 'AsyncInventoryPage'] 
\ No newline at end of file
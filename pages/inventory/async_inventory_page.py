@@ -0,0 +1,58 @@
+from ..base.async_base_page import AsyncBasePage
+from ..locators.inventory_locators import INVENTORY_PAGE_SELECTORS
+from utils.readiness import ReadinessCheck
+
+# Page Object async cho trang Inventory (sau khi đăng nhập thành công)
+class AsyncInventoryPage(AsyncBasePage):
+    """Page Object async cho Inventory page (sau khi login thành công)"""
+    URL = "https://www.saucedemo.com/inventory.html"
+    READINESS = (ReadinessCheck(INVENTORY_PAGE_SELECTORS["inventory_items"]),)
+
+    def __init__(self, page, selectors=None):
+        # Khởi tạo AsyncInventoryPage với page async của Playwright và bộ selector
+        super().__init__(page)
+        self.selectors = selectors or INVENTORY_PAGE_SELECTORS
+        self.base_url = self.URL
+
+    async def goto(self):
+        """Điều hướng tới trang inventory"""
+        await super().goto(self.base_url)
+
+    async def is_inventory_page_loaded(self):
+        """Kiểm tra trang inventory đã load thành công chưa"""
+        return await self.is_element_visible(self.selectors["inventory_container"])
+
+    async def get_inventory_item_count(self):
+        """Đếm số sản phẩm trên trang inventory"""
+        return await self.get_element_count(self.selectors["inventory_items"])
+
+    async def add_item_to_cart(self, item_name):
+        """Thêm một sản phẩm vào giỏ hàng theo tên"""
+        add_button = self.page.locator(f"[data-test='add-to-cart-{item_name}']")
+        try:
+            if await add_button.is_visible():
+                await add_button.click()
+                self.logger.info("Added %s to cart", item_name)
+                return True
+            self.logger.warning("Add to cart button not found for %s", item_name)
+            return False
+        except Exception as e:
+            self.logger.error("Error adding %s to cart: %s", item_name, e)
+            return False
+
+    async def get_cart_count(self):
+        """Lấy số lượng sản phẩm trong giỏ hàng"""
+        try:
+            cart_badge = self.page.locator(self.selectors["cart_badge"])
+            if await cart_badge.is_visible():
+                count_text = await cart_badge.text_content()
+                return int(count_text) if count_text else 0
+            return 0
+        except Exception as e:
+            self.logger.error("Error getting cart count: %s", e)
+            return 0
+
+    async def validate_inventory_page(self):
+        """Kiểm tra các thành phần chính trên trang inventory"""
+        assert await self.is_inventory_page_loaded(), "Inventory page not loaded"
+        self.logger.info("Inventory page validation passed")
@@ -1,113 +1,182 @@
 from ..base.base_page import BasePage
-from ..locators.inventory_locators import INVENTORY_PAGE_SELECTORS
+from ..base.dom_scripts import BATCH_CART_SCRIPT
+from ..locators.inventory_locators import INVENTORY_PAGE_SELECTORS, PRODUCT_RECORD_FIELDS
+from ..locators.catalog import LocatorSet, get_catalog
 from utils.allure_helpers import AllureReporter
+from utils.readiness import ReadinessCheck
 
 # Page Object cho trang Inventory (sau khi đăng nhập thành công)
 class InventoryPage(BasePage):
     """Page Object cho Inventory page (sau khi login thành công)"""
+    URL = "https://www.saucedemo.com/inventory.html"
+    # Trang inventory sẵn sàng khi danh sách sản phẩm đã render
+    READINESS = (ReadinessCheck(INVENTORY_PAGE_SELECTORS["inventory_items"]),)
     
     def __init__(self, page, selectors=None):
-        # Khởi tạo InventoryPage với page của Playwright và bộ selector (mặc định dùng INVENTORY_PAGE_SELECTORS)
+        # Khởi tạo InventoryPage với page của Playwright và bộ selector (mặc định dùng INVENTORY_PAGE_SELECTORS của catalog)
         super().__init__(page)
-        self.selectors = selectors or INVENTORY_PAGE_SELECTORS
-        self.base_url = "https://www.saucedemo.com/inventory.html"
+        catalog = get_catalog()
+        self.selectors = selectors or catalog.selectors("INVENTORY_PAGE_SELECTORS")
+        # Locator dựng sẵn: self.ui.cart_badge (bộ selector tuỳ chỉnh thì không qua kiểm tra của catalog)
+        self.ui = LocatorSet(self, selectors) if selectors else catalog.bind(self, "INVENTORY_PAGE_SELECTORS")
+        self.base_url = self.URL
     
     def goto(self):
         """Điều hướng tới trang inventory"""
         AllureReporter.navigate_to(self.base_url)
-        self.page.goto(self.base_url)
-        self.logger.info(f"Navigating to {self.base_url}")
+        super().goto(self.base_url)
     
     def is_inventory_page_loaded(self):
         """Kiểm tra trang inventory đã load thành công chưa"""
         try:
-            return self.page.locator(self.selectors["inventory_container"]).is_visible()
+            return self.ui.inventory_container.is_visible()
         except Exception as e:
-            self.logger.error(f"Error checking inventory page: {e}")
+            self.logger.error("Error checking inventory page: %s", e)
             return False
     
     def get_inventory_items(self):
-        """Lấy danh sách tất cả sản phẩm trên trang inventory"""
+        """Lấy danh sách Locator của tất cả sản phẩm trên trang inventory"""
         AllureReporter.validate_element_step("Inventory items", "get all")
-        items = self.page.locator(self.selectors["inventory_items"]).all()
-        self.logger.info(f"Found {len(items)} inventory items")
+        items = self.ui.inventory_items.all()
+        self.logger.info("Found %s inventory items", len(items))
         return items
+
+    def get_inventory_records(self):
+        """Lấy bảng tất cả sản phẩm (dict) trên trang inventory trong một round trip, xem get_products"""
+        AllureReporter.validate_element_step("Inventory items", "get all records")
+        records = self.get_products()
+        self.logger.info("Found %s inventory items", len(records))
+        return records
+
+    def get_products(self):
+        """Đọc tên, mô tả, giá và trạng thái nút của mọi sản phẩm trong một lần evaluate"""
+        records = self.extract_records(self.selectors["inventory_items"], PRODUCT_RECORD_FIELDS)
+        return [self._to_product(record) for record in records]
+
+    @staticmethod
+    def _to_product(record):
+        # price "$29.99" -> 29.99; nút "remove-..." nghĩa là sản phẩm đã trong giỏ
+        price_text = record["price"] or ""
+        try:
+            price = float(price_text.replace("$", "").strip())
+        except ValueError:
+            price = None
+        data_test = record["button_data_test"] or ""
+        in_cart = data_test.startswith("remove-")
+        return {
+            **record,
+            "price": price,
+            "price_text": price_text,
+            "in_cart": in_cart,
+            "slug": data_test[len("remove-"):] if in_cart else data_test[len("add-to-cart-"):],
+        }
     
     def add_item_to_cart(self, item_name):
         """Thêm một sản phẩm vào giỏ hàng theo tên"""
         AllureReporter.click_element_step(f"Add to cart: {item_name}", f"[data-test='add-to-cart-{item_name}']")
         try:
-            add_button = self.page.locator(f"[data-test='add-to-cart-{item_name}']")
+            add_button = self.locator(f"[data-test='add-to-cart-{item_name}']")
             if add_button.is_visible():
                 add_button.click()
-                self.logger.info(f"Added {item_name} to cart")
+                self.logger.info("Added %s to cart", item_name)
                 return True
             else:
-                self.logger.warning(f"Add to cart button not found for {item_name}")
+                self.logger.warning("Add to cart button not found for %s", item_name)
                 return False
         except Exception as e:
-            self.logger.error(f"Error adding {item_name} to cart: {e}")
+            self.logger.error("Error adding %s to cart: %s", item_name, e)
             return False
     
     def remove_item_from_cart(self, item_name):
         """Xoá một sản phẩm khỏi giỏ hàng theo tên"""
         AllureReporter.click_element_step(f"Remove from cart: {item_name}", f"[data-test='remove-{item_name}']")
         try:
-            remove_button = self.page.locator(f"[data-test='remove-{item_name}']")
+            remove_button = self.locator(f"[data-test='remove-{item_name}']")
             if remove_button.is_visible():
                 remove_button.click()
-                self.logger.info(f"Removed {item_name} from cart")
+                self.logger.info("Removed %s from cart", item_name)
                 return True
             else:
-                self.logger.warning(f"Remove button not found for {item_name}")
+                self.logger.warning("Remove button not found for %s", item_name)
                 return False
         except Exception as e:
-            self.logger.error(f"Error removing {item_name} from cart: {e}")
+            self.logger.error("Error removing %s from cart: %s", item_name, e)
             return False
     
+    @BasePage.performance_monitor
+    def add_items_to_cart(self, names=None, timeout=5000):
+        """Thêm nhiều sản phẩm (tên hiển thị hoặc slug, None = tất cả) trong một lần evaluate; trả về số trên badge"""
+        names = list(names) if names is not None else None
+        AllureReporter.click_element_step(f"Add to cart: {', '.join(names) if names else 'all items'}",
+                                          self.selectors["item_button"])
+        return self._batch_cart("add", names, timeout)
+
+    @BasePage.performance_monitor
+    def clear_cart(self, timeout=5000):
+        """Bỏ mọi sản phẩm đang trong giỏ (các nút Remove trên trang) trong một lần evaluate; trả về số trên badge"""
+        AllureReporter.click_element_step("Clear cart", self.selectors["item_button"])
+        return self._batch_cart("remove", None, timeout)
+
+    def _batch_cart(self, action, names, timeout):
+        # Tìm mọi nút, click tuần tự và đọc badge trong cùng một round trip
+        result = self.page.main_frame.evaluate(BATCH_CART_SCRIPT, {
+            "items": self.selectors["inventory_items"],
+            "name": self.selectors["item_name"],
+            "button": self.selectors["item_button"],
+            "badge": self.selectors["cart_badge"],
+            "action": action,
+            "names": names,
+            "timeout": timeout,
+        })
+        self.logger.info("Cart %s: clicked %s item(s), badge %s", action, len(result["clicked"]), result["count"])
+        if not result["settled"]:
+            self.logger.warning("Cart badge did not settle within %sms after %s", timeout, action)
+        self.custom_assert(not result["missing"], f"Products not found on inventory page: {result['missing']}")
+        return result["count"]
+
     def go_to_cart(self):
         """Đi tới trang giỏ hàng"""
         AllureReporter.navigate_to("Cart page")
         try:
-            cart_link = self.page.locator(self.selectors["cart_button"])
+            cart_link = self.ui.cart_button
             cart_link.click()
             self.logger.info("Navigated to cart page")
         except Exception as e:
-            self.logger.error(f"Error navigating to cart: {e}")
+            self.logger.error("Error navigating to cart: %s", e)
     
     def get_cart_count(self):
         """Lấy số lượng sản phẩm trong giỏ hàng"""
         try:
-            cart_badge = self.page.locator(self.selectors["cart_badge"])
+            cart_badge = self.ui.cart_badge
             if cart_badge.is_visible():
                 count_text = cart_badge.text_content()
                 return int(count_text) if count_text else 0
             return 0
         except Exception as e:
-            self.logger.error(f"Error getting cart count: {e}")
+            self.logger.error("Error getting cart count: %s", e)
             return 0
     
     def sort_items_by(self, sort_option):
         """Sắp xếp sản phẩm theo tuỳ chọn"""
         AllureReporter.validate_element_step("Sort items", sort_option)
         try:
-            sort_dropdown = self.page.locator(self.selectors["sort_dropdown"])
+            sort_dropdown = self.ui.sort_dropdown
             sort_dropdown.select_option(value=sort_option)
-            self.logger.info(f"Sorted items by {sort_option}")
+            self.logger.info("Sorted items by %s", sort_option)
             return True
         except Exception as e:
-            self.logger.error(f"Error sorting items: {e}")
+            self.logger.error("Error sorting items: %s", e)
             return False
     
     def get_item_price(self, item_name):
-        """Lấy giá của một sản phẩm theo tên"""
+        """Lấy giá của một sản phẩm theo tên hiển thị hoặc slug data-test"""
         try:
-            price_element = self.page.locator(f"[data-test='inventory-item-price']").first
-            if price_element.is_visible():
-                return price_element.text_content()
+            for product in self.get_products():
+                if item_name in (product["name"], product["slug"]):
+                    return product["price_text"]
             return "N/A"
         except Exception as e:
-            self.logger.error(f"Error getting item price: {e}")
+            self.logger.error("Error getting item price: %s", e)
             return "N/A"
     
     def validate_inventory_page(self):
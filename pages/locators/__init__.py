@@ -3,8 +3,19 @@ Locators Module - Page locators và selectors
 ===========================================
 
 Chứa tất cả các locators và selectors cho các trang khác nhau.
+get_catalog() nạp mọi bộ selector một lần, kiểm tra cú pháp và tạo Locator dựng sẵn.
 """
 
-from .login_locators import LOGIN_PAGE_SELECTORS
+from .login_locators import LOGIN_PAGE_SELECTORS, CART_PAGE_SELECTORS
+from .inventory_locators import INVENTORY_PAGE_SELECTORS, PRODUCT_RECORD_FIELDS
+from .catalog import LocatorCatalog, LocatorSet, get_catalog
 
-__all__ = ['LOGIN_PAGE_SELECTORS'] 
\ No newline at end of file
+__all__ = [
+    'LOGIN_PAGE_SELECTORS',
+    'INVENTORY_PAGE_SELECTORS',
+    'CART_PAGE_SELECTORS',
+    'PRODUCT_RECORD_FIELDS',
+    'LocatorCatalog',
+    'LocatorSet',
+    'get_catalog',
+]
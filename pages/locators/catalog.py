@@ -0,0 +1,196 @@
+"""
+Locator Catalog
+===============
+
+Nạp mọi bộ selector (*_SELECTORS trong pages/locators/*_locators.py) một lần,
+kiểm tra cú pháp, phát hiện key/selector trùng và key không dùng, và tạo
+Locator dựng sẵn cho page objects.
+"""
+
+import os
+import re
+import pkgutil
+import logging
+import importlib
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Selector engine của Playwright (phần trước dấu "=" trong "engine=body")
+SELECTOR_ENGINES = ("css", "xpath", "text", "id", "data-testid", "data-test-id", "data-test", "role",
+                    "internal:role", "internal:text", "nth", "visible")
+_ENGINE_PREFIX = re.compile(r"^([a-zA-Z][\w:-]*)=")
+_PAIRS = {"]": "[", ")": "(", "}": "{"}
+
+
+@dataclass(frozen=True)
+class CatalogIssue:
+    """Một vấn đề của catalog: error (cú pháp sai, set trùng khác nội dung) hoặc warning"""
+    level: str
+    set_name: str
+    key: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"[{self.level}] {self.set_name}.{self.key}: {self.message}" if self.key else f"[{self.level}] {self.set_name}: {self.message}"
+
+
+def selector_syntax_error(selector: str) -> Optional[str]:
+    """Kiểm tra nhanh cú pháp selector phía Python (ngoặc/nháy cân bằng, engine hợp lệ); None nếu hợp lệ"""
+    if not selector or not selector.strip():
+        return "empty selector"
+    for part in selector.split(">>"):
+        part = part.strip()
+        if not part:
+            return "empty part in '>>' chain"
+        match = _ENGINE_PREFIX.match(part)
+        if match and not part.startswith(("[", "(")) and match.group(1) not in SELECTOR_ENGINES:
+            return f"unknown selector engine '{match.group(1)}'"
+        stack: List[str] = []
+        quote = None
+        for char in part:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in ("'", '"'):
+                quote = char
+            elif char in "[({":
+                stack.append(char)
+            elif char in _PAIRS:
+                if not stack or stack.pop() != _PAIRS[char]:
+                    return f"unbalanced '{char}'"
+        if quote:
+            return "unterminated quote"
+        if stack:
+            return f"unclosed '{stack[-1]}'"
+    return None
+
+
+class LocatorSet:
+    """Locator dựng sẵn cho một page object: ui.login_button thay cho page.locator(selectors["login_button"]).
+
+    Locator được tạo qua page_object.locator() (cache theo frame của BasePage)
+    nên dùng lại được qua các lần điều hướng.
+    """
+
+    def __init__(self, page_object: Any, selectors: Mapping[str, str]):
+        self._page_object = page_object
+        self._selectors = selectors
+
+    def __getattr__(self, key: str):
+        try:
+            selector = self._selectors[key]
+        except KeyError:
+            raise AttributeError(f"No locator '{key}' in selector set") from None
+        return self._page_object.locator(selector)
+
+    def __getitem__(self, key: str):
+        return self._page_object.locator(self._selectors[key])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._selectors
+
+
+class LocatorCatalog:
+    """Catalog mọi bộ selector của package pages.locators"""
+
+    def __init__(self):
+        self._sets: Dict[str, Mapping[str, str]] = {}
+        self._modules: Dict[str, str] = {}
+        self.issues: List[CatalogIssue] = []
+
+    @classmethod
+    def load(cls, package: str = "pages.locators") -> "LocatorCatalog":
+        """Import mọi module *_locators của package và gom các dict *_SELECTORS"""
+        catalog = cls()
+        package_module = importlib.import_module(package)
+        for module_info in sorted(pkgutil.iter_modules(package_module.__path__), key=lambda m: m.name):
+            if not module_info.name.endswith("_locators"):
+                continue
+            module = importlib.import_module(f"{package}.{module_info.name}")
+            for name, value in vars(module).items():
+                if name.endswith("_SELECTORS") and isinstance(value, dict):
+                    catalog.add(name, value, module_info.name)
+        for issue in catalog.issues:
+            log = logger.error if issue.level == "error" else logger.warning
+            log("Locator catalog: %s", issue)
+        return catalog
+
+    def add(self, set_name: str, selectors: Dict[str, str], module: str = ""):
+        """Thêm một bộ selector; kiểm tra cú pháp và selector trùng trong bộ (set trùng tên giữ bản đầu tiên)"""
+        if set_name in self._sets:
+            same = dict(self._sets[set_name]) == selectors
+            self.issues.append(CatalogIssue(
+                "warning" if same else "error", set_name, "",
+                f"defined in both {self._modules[set_name]} and {module}" + ("" if same else " with different selectors"),
+            ))
+            return
+        seen: Dict[str, str] = {}
+        for key, selector in selectors.items():
+            error = selector_syntax_error(selector) if isinstance(selector, str) else "selector is not a string"
+            if error:
+                self.issues.append(CatalogIssue("error", set_name, key, f"{error}: {selector!r}"))
+            if selector in seen:
+                self.issues.append(CatalogIssue("warning", set_name, key, f"same selector as '{seen[selector]}'"))
+            else:
+                seen[selector] = key
+        self._sets[set_name] = MappingProxyType(dict(selectors))
+        self._modules[set_name] = module
+
+    # =====================
+    # Lookup
+    # =====================
+    def set_names(self) -> List[str]:
+        return sorted(self._sets)
+
+    def selectors(self, set_name: str) -> Mapping[str, str]:
+        """Bộ selector chỉ đọc (đã kiểm tra) theo tên"""
+        return self._sets[set_name]
+
+    def bind(self, page_object: Any, set_name: str) -> LocatorSet:
+        """Locator dựng sẵn cho page object từ bộ selector đã kiểm tra; raise ValueError nếu bộ đó có lỗi"""
+        if set_name not in self._sets:
+            raise KeyError(f"No selector set '{set_name}' in locator catalog ({', '.join(self.set_names())})")
+        errors = [issue for issue in self.errors if issue.set_name == set_name]
+        if errors:
+            raise ValueError(f"Selector set '{set_name}' has errors: " + "; ".join(str(issue) for issue in errors))
+        return LocatorSet(page_object, self._sets[set_name])
+
+    @property
+    def errors(self) -> List[CatalogIssue]:
+        return [issue for issue in self.issues if issue.level == "error"]
+
+    # =====================
+    # Key không dùng
+    # =====================
+    def find_unused(self, roots: Iterable[str]) -> List[CatalogIssue]:
+        """Key không được dùng trong mã nguồn dưới roots: không có "key" (trừ chỗ định nghĩa "key": ...) hay ui.key"""
+        source = []
+        for root in roots:
+            paths = [root] if os.path.isfile(root) else (
+                os.path.join(dirpath, name)
+                for dirpath, _, names in os.walk(root) for name in names if name.endswith(".py"))
+            for path in paths:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    source.append(f.read())
+        text = "\n".join(source)
+        unused = []
+        for set_name in self.set_names():
+            for key in self._sets[set_name]:
+                usage = rf"""["']{re.escape(key)}["'](?!\s*:)|\bui\.{re.escape(key)}\b"""
+                if not re.search(usage, text):
+                    unused.append(CatalogIssue("warning", set_name, key, "not referenced"))
+        return unused
+
+
+_catalog: Optional[LocatorCatalog] = None
+
+
+def get_catalog() -> LocatorCatalog:
+    """Catalog dùng chung, nạp một lần cho mỗi process"""
+    global _catalog
+    if _catalog is None:
+        _catalog = LocatorCatalog.load()
+    return _catalog
@@ -12,6 +12,10 @@ INVENTORY_PAGE_SELECTORS = {
     
     # Danh sách sản phẩm
     "inventory_items": ".inventory_item",
+    "item_name": ".inventory_item_name",
+    "item_description": ".inventory_item_desc",
+    "item_price": ".inventory_item_price",
+    "item_button": ".btn_inventory",
     
     # Nút giỏ hàng
     "cart_button": ".shopping_cart_link",
@@ -31,4 +35,14 @@ INVENTORY_PAGE_SELECTORS = {
     "twitter_link": "[data-test='social-twitter']",
     "facebook_link": "[data-test='social-facebook']",
     "linkedin_link": "[data-test='social-linkedin']",
-} 
\ No newline at end of file
+}
+
+# Các field đọc cho mỗi sản phẩm trong một lần BasePage.extract_records: {tên: (sub-selector, property)}
+PRODUCT_RECORD_FIELDS = {
+    "name": (INVENTORY_PAGE_SELECTORS["item_name"], "text"),
+    "description": (INVENTORY_PAGE_SELECTORS["item_description"], "text"),
+    "price": (INVENTORY_PAGE_SELECTORS["item_price"], "text"),
+    "button_text": (INVENTORY_PAGE_SELECTORS["item_button"], "text"),
+    "button_data_test": (INVENTORY_PAGE_SELECTORS["item_button"], "attr:data-test"),
+    "button_enabled": (INVENTORY_PAGE_SELECTORS["item_button"], "enabled"),
+}
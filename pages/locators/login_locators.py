@@ -31,33 +31,7 @@ LOGIN_PAGE_SELECTORS = {
     "register_link": "text=New User",
 }
 
-# Selectors cho Inventory page (SauceDemo)
-INVENTORY_PAGE_SELECTORS = {
-    # Container chính
-    "inventory_container": ".inventory_list",
-    
-    # Danh sách sản phẩm
-    "inventory_items": ".inventory_item",
-    
-    # Nút giỏ hàng
-    "cart_button": ".shopping_cart_link",
-    "cart_badge": ".shopping_cart_badge",
-    
-    # Dropdown sắp xếp
-    "sort_dropdown": "[data-test='product_sort_container']",
-    
-    # Menu
-    "menu_button": "#react-burger-menu-btn",
-    "menu_items": ".bm-menu",
-    
-    # Footer
-    "footer": ".footer",
-    
-    # Profile elements
-    "profile_header": ".inventory_details_name",
-    "user_info": ".user-info",
-}
-
+# Selectors cho Cart page (SauceDemo)
 CART_PAGE_SELECTORS = {
     # Selector cho container của trang giỏ hàng
     "cart_container": ".cart_list",
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Browser Server - Giữ browser chạy sẵn để các lần chạy pytest connect thay vì launch
+
+Ví dụ:
+    python scripts/browser_server.py start --browsers chromium,firefox
+    python scripts/browser_server.py status
+    python scripts/browser_server.py stop
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.browser_pool import build_launch_args, parse_engines
+from utils.browser_server import load_state, server_status, start_server, stop_server
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Warm Playwright browser servers shared across pytest runs")
+    parser.add_argument("command", choices=["start", "stop", "status"], help="Action to perform")
+    parser.add_argument("--browsers", default=None, help="chromium, firefox, webkit, a comma-separated list or 'all' (start: chromium, stop: every running server)")
+    parser.add_argument("--headed", action="store_true", help="Launch headed browsers (pytest must run with the same mode)")
+    parser.add_argument("--mass-test", action="store_true", help="Use the --mass-test launch args")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "start":
+        for engine in parse_engines(args.browsers):
+            entry = start_server(engine, build_launch_args(engine, not args.headed, args.mass_test))
+            print(f"✅ {engine}: {entry['ws_endpoint']} (pid {entry['pid']})")
+    elif args.command == "stop":
+        engines = list(load_state()) if args.browsers is None else parse_engines(args.browsers)
+        for engine in engines:
+            stopped = stop_server(engine)
+            print(f"{'🛑' if stopped else '⚪'} {engine}: {'stopped' if stopped else 'not running'}")
+    else:
+        status = server_status()
+        if not status:
+            print("⚪ No browser servers running")
+        for engine, entry in status.items():
+            print(f"{'🟢' if entry['alive'] else '🔴'} {engine}: {entry['ws_endpoint']} (pid {entry['pid']})")
+
+
+if __name__ == "__main__":
+    main()
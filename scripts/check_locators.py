@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Check Locators - Kiểm tra mọi selector của locator catalog trên trang thật (hoặc HAR đã ghi) trong một lần mở browser
+
+Ví dụ:
+    python scripts/check_locators.py
+    python scripts/check_locators.py --network replay --unused
+    python scripts/check_locators.py --page CART_PAGE_SELECTORS=https://staging.example.com/cart.html --strict
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from pages import InventoryPage, LoginPage
+from pages.locators import get_catalog
+from utils.browser_pool import build_launch_args
+from utils.har_network import NETWORK_MODES, har_network
+from utils.helpers import get_test_user
+
+# Bộ selector -> (URL, cần đăng nhập)
+DEFAULT_PAGES = {
+    "LOGIN_PAGE_SELECTORS": (LoginPage.URL, False),
+    "INVENTORY_PAGE_SELECTORS": (InventoryPage.URL, True),
+    "CART_PAGE_SELECTORS": ("https://www.saucedemo.com/cart.html", True),
+}
+SOURCE_ROOTS = ("pages", "tests", "utils", "scripts", "conftest.py")
+
+
+def parse_pages(values):
+    """--page SET=URL (trang tuỳ chỉnh được coi là cần đăng nhập nếu bộ mặc định cần)"""
+    pages = dict(DEFAULT_PAGES)
+    for value in values or []:
+        set_name, _, url = value.partition("=")
+        if not url:
+            raise SystemExit(f"Invalid --page '{value}', expected SET_NAME=URL")
+        pages[set_name] = (url, DEFAULT_PAGES.get(set_name, (None, False))[1])
+    return pages
+
+
+def check_sets(catalog, pages, browser_name, headed, login):
+    """Mở một browser/context, đi qua từng trang và đếm số element khớp mỗi selector"""
+    results = []
+    with sync_playwright() as p:
+        browser = getattr(p, browser_name).launch(**build_launch_args(browser_name, not headed, False))
+        context = browser.new_context()
+        page = context.new_page()
+        logged_in = False
+        try:
+            for set_name in catalog.set_names():
+                if set_name not in pages:
+                    results.append((set_name, None, None, "skipped", "no page URL (use --page SET=URL)"))
+                    continue
+                url, needs_login = pages[set_name]
+                if needs_login and login and not logged_in:
+                    user = get_test_user()
+                    login_page = LoginPage(page)
+                    login_page.goto()
+                    login_page.login(user["username"], user["password"])
+                    logged_in = True
+                har_network.attach(page, url)
+                page.goto(url, wait_until="load")
+                for key, selector in catalog.selectors(set_name).items():
+                    try:
+                        count = page.locator(selector).count()
+                        results.append((set_name, key, selector, "found" if count else "missing", f"{count} match(es)"))
+                    except PlaywrightError as e:
+                        results.append((set_name, key, selector, "invalid", str(e).splitlines()[0]))
+        finally:
+            context.close()
+            browser.close()
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Validate every selector of the locator catalog in a single browser pass")
+    parser.add_argument("--page", action="append", help="SET_NAME=URL to check a selector set against (repeatable)")
+    parser.add_argument("--network", default="live", choices=NETWORK_MODES, help="live, record or replay HAR files in hars/ (same as pytest --network)")
+    parser.add_argument("--browser", default="chromium", choices=["chromium", "firefox", "webkit"], help="Browser engine")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--no-login", action="store_true", help="Do not log in before checking pages that need authentication")
+    parser.add_argument("--unused", action="store_true", help="Also list keys that are never referenced in the source tree")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero when a selector matches nothing")
+    parser.add_argument("--offline", action="store_true", help="Only run the static checks (syntax, duplicates, unused keys)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    catalog = get_catalog()
+    failed = bool(catalog.errors)
+    print(f"📚 {len(catalog.set_names())} selector sets: {', '.join(catalog.set_names())}")
+    for issue in catalog.issues:
+        print(f"{'❌' if issue.level == 'error' else '⚠️ '} {issue}")
+    if args.unused:
+        for issue in catalog.find_unused(SOURCE_ROOTS):
+            print(f"⚪ {issue}")
+
+    if not args.offline:
+        har_network.configure(args.network)
+        results = check_sets(catalog, parse_pages(args.page), args.browser, args.headed, not args.no_login)
+        icons = {"found": "✅", "missing": "⚠️ ", "invalid": "❌", "skipped": "⏭️ "}
+        for set_name, key, selector, status, detail in results:
+            label = f"{set_name}.{key} ({selector})" if key else set_name
+            print(f"{icons[status]} {label}: {detail}")
+        failed = failed or any(status == "invalid" for *_, status, _ in results)
+        failed = failed or (args.strict and any(status == "missing" for *_, status, _ in results))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
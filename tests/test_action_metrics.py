@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from utils.action_metrics import ActionMetrics, LatencyHistogram, action_target, merge_action_reports
+from utils.perf_reports import write_worker_report
+
+
+def test_record_uses_upper_bound_buckets():
+    histogram = LatencyHistogram()
+    for duration_ms in (0.5, 1, 1.01, 4, 60000, 90000):
+        histogram.record(duration_ms)
+
+    assert histogram.to_dict()["buckets"] == {"1": 2, "2": 1, "5": 1, "60000": 1, "inf": 1}
+    assert histogram.count == 6
+
+
+def test_percentile_interpolates_inside_bucket():
+    histogram = LatencyHistogram()
+    for _ in range(100):
+        histogram.record(4)  # bucket (3, 5]
+
+    assert histogram.percentile(50) == 4.0
+    assert histogram.percentile(100) == 5.0
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_percentile_picks_bucket_by_rank():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(8)  # bucket (7, 10]
+    for _ in range(10):
+        histogram.record(400)  # bucket (300, 500]
+
+    assert 7 < histogram.percentile(50) <= 10
+    assert 300 < histogram.percentile(95) <= 500
+
+
+def test_merge_and_dict_round_trip_keep_counts():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(10)
+    first.record(120, error=True)
+    second.record(10)
+
+    first.merge(LatencyHistogram.from_dict(json.loads(json.dumps(second.to_dict()))))
+    data = first.to_dict()
+
+    assert data["count"] == 3 and data["errors"] == 1
+    assert data["buckets"] == {"10": 2, "150": 1}
+    assert data["total_ms"] == 140.0
+    assert LatencyHistogram.from_dict(data).counts == first.counts
+
+
+def test_action_target():
+    assert action_target(("#login",), {}) == "#login"
+    assert action_target((), {"url": "https://example.com"}) == "https://example.com"
+    assert action_target((5000,), {}) is None
+
+
+def test_action_metrics_per_method_selector_and_test():
+    metrics = ActionMetrics()
+    metrics.begin_test("test_login")
+    metrics.record("click_button", "#login", 0.02)
+    metrics.record("click_button", "#login", 0.03, error=True)
+    metrics.record("get_title", None, 0.001)
+    summary = metrics.end_test()
+    metrics.record("click_button", "#logout", 0.01)
+
+    stats = metrics.get_stats()
+    assert summary["actions"] == 3 and summary["total_ms"] == 51.0
+    assert stats["methods"]["click_button"]["count"] == 3
+    assert set(stats["selectors"]) == {"click_button #login", "click_button #logout"}
+    assert stats["selectors"]["click_button #login"]["errors"] == 1
+    assert list(stats["tests"]) == ["test_login"]
+
+
+
+
+def test_nested_actions_count_once_toward_test_total():
+    metrics = ActionMetrics()
+    metrics.begin_test("test_nested")
+
+    outer_token, outer_first = metrics.enter()
+    inner_token, inner_first = metrics.enter()
+    metrics.record("wait_for_selector", "#title", 0.04, outermost=inner_first)
+    metrics.exit(inner_token)
+    metrics.record("get_text", "#title", 0.05, outermost=outer_first)
+    metrics.exit(outer_token)
+    summary = metrics.end_test()
+
+    assert outer_first and not inner_first
+    assert summary["actions"] == 1 and summary["total_ms"] == 50.0
+    assert summary["methods"]["wait_for_selector"]["count"] == 1
+    token, outermost = metrics.enter()
+    metrics.exit(token)
+    assert outermost
+
+
+def test_performance_monitor_marks_only_the_outer_action(monkeypatch):
+    from pages.base.base_page import BasePage
+
+    recorded = []
+    monkeypatch.setattr("pages.base.base_page.action_metrics.record",
+                        lambda method, target, duration, error=False, outermost=True: recorded.append((method, outermost)))
+
+    class FakePage:
+        @BasePage.performance_monitor
+        def wait_for_selector(self, selector):
+            return True
+
+        @BasePage.performance_monitor
+        def get_text(self, selector):
+            self.wait_for_selector(selector)
+            return "text"
+
+    FakePage().get_text("#title")
+    FakePage().wait_for_selector("#title")
+
+    assert recorded == [("wait_for_selector", False), ("get_text", True), ("wait_for_selector", True)]
+
+
+def test_merge_action_reports_across_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for worker, duration in (("gw0", 0.01), ("gw1", 0.2)):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        metrics = ActionMetrics()
+        metrics.begin_test(f"test_{worker}")
+        metrics.record("fill_field", "#user", duration)
+        metrics.end_test()
+        write_worker_report("action_metrics", metrics.get_stats())
+
+    report = merge_action_reports()
+
+    assert report["workers"] == 2 and report["tests"] == 2
+    assert report["methods"]["fill_field"]["count"] == 2
+    assert list(report["slowest_tests"]) == ["test_gw1", "test_gw0"]
+    assert report["methods"]["fill_field"]["p99_ms"] == pytest.approx(200, abs=50)
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.action_metrics import LatencyHistogram
+from utils.adaptive_timeouts import AdaptiveTimeouts, load_history, merge_timeout_reports, timeout_key
+from utils.perf_reports import write_worker_report
+
+
+class LoginPage:
+    pass
+
+
+PAGE = LoginPage()
+SELECTOR = "#login-button"
+
+
+def _history(tmp_path, durations_ms, key=None):
+    histogram = LatencyHistogram()
+    for duration_ms in durations_ms:
+        histogram.record(duration_ms)
+    path = tmp_path / "history.json"
+    path.write_text(json.dumps({key or timeout_key(PAGE, SELECTOR): histogram.to_dict()}), encoding="utf-8")
+    return str(path)
+
+
+def _timeouts(history_file, enabled=True, **kwargs):
+    timeouts = AdaptiveTimeouts(history_file=history_file, **kwargs)
+    timeouts.configure(enabled=enabled)
+    return timeouts
+
+
+def test_learned_timeout_is_high_percentile_times_multiplier(tmp_path):
+    # 100 mẫu 800ms (bucket (700, 1000]): p99 ~ 997ms -> x2
+    timeouts = _timeouts(_history(tmp_path, [800] * 100))
+
+    learned = timeouts.timeout(PAGE, SELECTOR, 30000)
+
+    assert 1900 <= learned <= 2000
+    assert timeouts.get_stats()["applied"] == 1
+
+
+def test_learned_timeout_respects_floor_and_requested_ceiling(tmp_path):
+    fast = _timeouts(_history(tmp_path, [20] * 50), floor_ms=1000)
+    assert fast.timeout(PAGE, SELECTOR, 30000) == 1000
+    assert fast.timeout(PAGE, SELECTOR, 500) == 500
+
+    slow = _timeouts(_history(tmp_path, [9000] * 50))
+    assert slow.timeout(PAGE, SELECTOR, 5000) == 5000
+
+
+def test_requested_timeout_without_enough_samples_or_when_disabled(tmp_path):
+    few = _timeouts(_history(tmp_path, [20] * 5), min_samples=20)
+    assert few.timeout(PAGE, SELECTOR, 5000) == 5000
+    assert few.timeout(PAGE, "#unknown", 5000) == 5000
+
+    disabled = _timeouts(_history(tmp_path, [20] * 50), enabled=False)
+    assert disabled.timeout(PAGE, SELECTOR, 5000) == 5000
+
+
+def test_measure_records_success_and_widens_after_adaptive_timeout(tmp_path):
+    timeouts = _timeouts(str(tmp_path / "missing.json"))
+
+    with timeouts.measure(PAGE, SELECTOR, used=5000, requested=5000):
+        pass
+    with pytest.raises(PlaywrightTimeoutError):
+        with timeouts.measure(PAGE, SELECTOR, used=1000, requested=5000):
+            raise PlaywrightTimeoutError("Timeout 1000ms exceeded.")
+
+    stats = timeouts.get_stats()
+    samples = stats["samples"][timeout_key(PAGE, SELECTOR)]
+    assert samples["count"] == 2
+    assert samples["buckets"].get("5000") == 1
+    assert stats["fast_failures"] == 1 and stats["time_saved_ms"] == 4000
+
+
+def test_timeout_at_requested_value_adds_no_sample(tmp_path):
+    timeouts = _timeouts(str(tmp_path / "missing.json"))
+
+    with pytest.raises(PlaywrightTimeoutError):
+        with timeouts.measure(PAGE, SELECTOR, used=5000, requested=5000):
+            raise PlaywrightTimeoutError("Timeout 5000ms exceeded.")
+
+    assert timeouts.get_stats()["samples"] == {}
+
+
+def test_merge_adds_worker_samples_to_history_and_decays(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    history_file = _history(tmp_path, [100] * 30)
+    for worker in ("gw0", "gw1"):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        timeouts = _timeouts(history_file)
+        for _ in range(40):
+            timeouts.record(PAGE, SELECTOR, 0.2)
+        write_worker_report("adaptive_timeouts", timeouts.get_stats())
+
+    report = merge_timeout_reports(history_file, max_samples=50)
+
+    merged = load_history(history_file)[timeout_key(PAGE, SELECTOR)]
+    assert report["workers"] == 2 and report["selectors"] == 1
+    assert merged.count == 50
+    assert merged.to_dict()["buckets"] == {"100": 14, "200": 36}
@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+
+from utils.artifact_retention import ArtifactRetention, find_new_artifacts, parse_size, safe_artifact_name
+
+
+def _write(path, size=10):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+def test_safe_artifact_name():
+    assert safe_artifact_name("tests/test_login.py::test_login[chromium-standard_user]") == \
+        "tests_test_login.py_test_login_chromium-standard_user"
+    assert safe_artifact_name("::[]::") == ""
+    assert len(safe_artifact_name("a" * 300)) == 150
+
+
+def test_should_keep_by_mode(tmp_path):
+    assert ArtifactRetention(str(tmp_path), "on-failure").should_keep(failed=True)
+    assert not ArtifactRetention(str(tmp_path), "on-failure").should_keep(failed=False)
+    assert ArtifactRetention(str(tmp_path), "always").should_keep(failed=False)
+    assert not ArtifactRetention(str(tmp_path), "off").should_keep(failed=True)
+    with pytest.raises(ValueError):
+        ArtifactRetention(str(tmp_path), "sometimes")
+
+
+def test_keep_renames_artifact_after_test(tmp_path):
+    retention = ArtifactRetention(str(tmp_path))
+    video = _write(tmp_path / "3f2a9c.webm", size=100)
+
+    kept = retention.keep(video, name="test_login[firefox]")
+
+    assert kept == str(tmp_path / "test_login_firefox.webm")
+    assert os.path.exists(kept) and not os.path.exists(video)
+    assert retention.get_stats()["kept"] == 1
+    assert retention.get_stats()["bytes_kept"] == 100
+
+
+
+def test_same_named_tests_in_different_modules_keep_separate_videos(tmp_path):
+    retention = ArtifactRetention(str(tmp_path))
+
+    first = retention.keep(_write(tmp_path / "a1.webm", size=10), name="tests/test_login_ui.py::test_login")
+    second = retention.keep(_write(tmp_path / "b2.webm", size=20), name="tests/test_login_ui_allure.py::test_login")
+
+    assert first != second
+    assert os.path.getsize(first) == 10 and os.path.getsize(second) == 20
+
+def test_discard_calls_deleter_and_removes_file(tmp_path):
+    retention = ArtifactRetention(str(tmp_path))
+    video = _write(tmp_path / "passed.webm", size=50)
+    deleted = []
+
+    retention.discard(video, deleter=lambda: deleted.append(video))
+
+    assert deleted == [video]
+    assert not os.path.exists(video)
+    assert retention.get_stats()["discarded"] == 1
+    assert retention.get_stats()["bytes_discarded"] == 50
+
+
+def test_discard_failure_is_not_counted(tmp_path):
+    retention = ArtifactRetention(str(tmp_path))
+
+    def _fail():
+        raise RuntimeError("page closed")
+    retention.discard(_write(tmp_path / "video.webm"), deleter=_fail)
+
+    assert retention.get_stats()["discarded"] == 0
+
+
+def test_size_cap_evicts_oldest_but_keeps_protected(tmp_path):
+    retention = ArtifactRetention(str(tmp_path), max_total_mb=1.5 / 1024)  # 1536 bytes
+    old = time.time() - 3600
+    for index in range(3):
+        path = _write(tmp_path / f"old{index}.webm", size=1024)
+        os.utime(path, (old + index, old + index))
+
+    kept = retention.keep(_write(tmp_path / "new.webm", size=512))
+
+    assert sorted(os.listdir(tmp_path)) == ["new.webm", "old2.webm"]
+    assert os.path.exists(kept)
+    assert retention.get_stats()["evicted"] == 2
+
+
+def test_find_new_artifacts_reports_files_written_during_run(tmp_path):
+    stale = _write(tmp_path / "previous_run.webm")
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+    started_at = time.time() - 1
+    orphan = _write(tmp_path / "reset_page.webm")
+
+    assert find_new_artifacts(str(tmp_path), started_at) == [orphan]
+    assert find_new_artifacts(str(tmp_path / "missing"), started_at) == []
+
+
+def test_parse_size():
+    assert parse_size("1280x720") == {"width": 1280, "height": 720}
+    assert parse_size(None) is None
+    with pytest.raises(ValueError):
+        parse_size("1280")
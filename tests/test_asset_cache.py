@@ -0,0 +1,75 @@
+from utils.asset_cache import AssetCache
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="script"):
+        self.url = url
+        self.method = "GET"
+        self.resource_type = resource_type
+        self.headers = {}
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b"console.log(1)", headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {"content-type": "text/javascript", "etag": '"v1"'}
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, url, response=None, error=None):
+        self.request = FakeRequest(url)
+        self._response = response or FakeResponse()
+        self._error = error
+        self.fetches = 0
+        self.fulfilled = None
+        self.fell_back = False
+
+    def fetch(self, headers=None):
+        self.fetches += 1
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+    def fulfill(self, status, headers, body):
+        self.fulfilled = (status, body)
+
+    def fallback(self):
+        self.fell_back = True
+
+
+def test_miss_then_hit_from_disk(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    first = FakeRoute("https://example.com/app.js")
+    cache._handle(first)
+    second = FakeRoute("https://example.com/app.js")
+    cache._handle(second)
+
+    assert first.fulfilled == (200, b"console.log(1)")
+    assert second.fulfilled == (200, b"console.log(1)") and second.fetches == 0
+    assert cache.get_stats()["misses"] == 1
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_fetch_error_falls_back_instead_of_hanging(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    route = FakeRoute("https://example.com/app.js", error=TimeoutError("net::ERR_TIMED_OUT"))
+
+    cache._handle(route)
+
+    assert route.fell_back and route.fulfilled is None
+    assert cache.get_stats()["fetch_errors"] == 1
+
+
+def test_revalidation_error_falls_back(tmp_path):
+    cache = AssetCache(str(tmp_path), ttl_seconds=0)
+    cache._handle(FakeRoute("https://example.com/app.js"))
+    route = FakeRoute("https://example.com/app.js", error=ConnectionError("reset"))
+
+    cache._handle(route)
+
+    assert route.fell_back and route.fulfilled is None
+    assert cache.get_stats()["fetch_errors"] == 1
@@ -0,0 +1,38 @@
+import asyncio
+
+from utils.async_runner import AsyncBrowserRunner
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def new_page(self):
+        return "page"
+
+    async def close(self):
+        self.closed = True
+
+
+def test_failed_context_creation_releases_in_flight_slot():
+    runner = AsyncBrowserRunner(lambda engine: {}, concurrency=1)
+    contexts = []
+
+    async def new_context(engine="chromium", **context_args):
+        if not contexts:
+            contexts.append(None)
+            raise RuntimeError("browser has been closed")
+        contexts.append(FakeContext())
+        return contexts[-1]
+    runner.new_context = new_context
+
+    async def scenario(page):
+        return page
+
+    results = asyncio.run(runner.run_scenarios([scenario, scenario, scenario]))
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1:] == ["page", "page"]
+    assert runner.get_stats()["max_in_flight"] == 1
+    assert runner.get_stats()["failed_scenarios"] == 1
+    assert all(context.closed for context in contexts[1:])
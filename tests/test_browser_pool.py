@@ -0,0 +1,59 @@
+import pytest
+from playwright.sync_api import sync_playwright
+
+from utils.browser_pool import BrowserPool, parse_engines, supports_background_launch
+
+
+class FakeBrowser:
+    def __init__(self, engine):
+        self.engine = engine
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowserType:
+    def __init__(self, engine):
+        self.engine = engine
+        self.launches = 0
+
+    def launch(self, **kwargs):
+        self.launches += 1
+        return FakeBrowser(self.engine)
+
+
+class FakePlaywright:
+    """Playwright không có _loop/_dispatcher_fiber (như một version đã đổi internals)"""
+
+    def __init__(self):
+        self.chromium = FakeBrowserType("chromium")
+        self.firefox = FakeBrowserType("firefox")
+
+
+def test_installed_playwright_supports_background_launch():
+    """Fail khi Playwright đổi internals mà BrowserPool launch nền dựa vào"""
+    with sync_playwright() as playwright:
+        assert supports_background_launch(playwright)
+
+
+def test_pool_falls_back_to_direct_launch_and_reports_it(caplog):
+    pool = BrowserPool(["chromium", "firefox"], lambda engine: {}, instances={"chromium": 2})
+    pool._playwright = FakePlaywright()
+    pool.start()
+
+    assert pool.get_stats()["background_fallbacks"] > 0
+    assert "background browser launches are disabled" in caplog.text
+    assert pool.acquire("firefox").engine == "firefox"
+    assert pool.acquire("chromium").engine == "chromium"
+
+
+def test_parse_engines():
+    assert parse_engines(None) == ["chromium"]
+    assert parse_engines("all") == ["chromium", "firefox", "webkit"]
+    assert parse_engines("firefox, webkit,firefox") == ["firefox", "webkit"]
+    with pytest.raises(ValueError):
+        parse_engines("opera")
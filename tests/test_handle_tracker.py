@@ -0,0 +1,107 @@
+import asyncio
+
+from utils.handle_tracker import HandleTracker
+
+
+class FakeHandle:
+    def __init__(self, name):
+        self.name = name
+        self.disposed = False
+
+    def as_element(self):
+        return self
+
+    def dispose(self):
+        self.disposed = True
+
+
+class FakeAsyncHandle(FakeHandle):
+    async def dispose(self):
+        self.disposed = True
+
+
+def _action(tracker, handles, result=None):
+    """Giống BasePage.performance_monitor: mở scope, tạo handle, đóng scope với kết quả của action"""
+    scope = tracker.open_scope()
+    tracker.track_all(handles)
+    tracker.close_scope(scope, result)
+    return result
+
+
+def test_action_scope_disposes_handles_it_created():
+    tracker = HandleTracker()
+    handles = [FakeHandle("a"), FakeHandle("b")]
+
+    _action(tracker, handles)
+
+    assert all(handle.disposed for handle in handles)
+    assert tracker.live == 0
+    assert tracker.get_stats()["disposed_at_action_end"] == 2
+
+
+def test_returned_handle_moves_to_parent_action():
+    tracker = HandleTracker()
+    outer = tracker.open_scope()
+    returned, temporary = FakeHandle("returned"), FakeHandle("temporary")
+
+    _action(tracker, [returned, temporary], result=returned)
+    assert temporary.disposed and not returned.disposed
+
+    tracker.close_scope(outer)
+    assert returned.disposed
+    assert tracker.live == 0
+
+
+def test_returned_handles_outside_actions_live_until_test_teardown():
+    tracker = HandleTracker()
+    tracker.begin_test("test_a")
+    kept = [FakeHandle("first"), FakeHandle("second")]
+
+    _action(tracker, kept, result=kept)
+    assert not any(handle.disposed for handle in kept)
+    assert tracker.live == 2
+
+    usage = tracker.end_test()
+    assert all(handle.disposed for handle in kept)
+    assert usage == {"acquired": 2, "peak_live": 2, "live_at_teardown": 2}
+    stats = tracker.get_stats()
+    assert stats["leaking_tests"] == 1 and stats["tests"]["test_a"]["live_at_teardown"] == 2
+    assert stats["live"] == 0
+
+
+def test_clean_test_is_not_reported_as_leaking():
+    tracker = HandleTracker()
+    tracker.begin_test("test_clean")
+    _action(tracker, [FakeHandle("a")])
+    tracker.end_test()
+
+    stats = tracker.get_stats()
+    assert stats["leaking_tests"] == 0
+    assert stats["tests"]["test_clean"] == {"acquired": 1, "peak_live": 1, "live_at_teardown": 0}
+
+
+def test_dispose_errors_do_not_break_teardown():
+    class ClosedHandle(FakeHandle):
+        def dispose(self):
+            raise RuntimeError("Target page, context or browser has been closed")
+
+    tracker = HandleTracker()
+    tracker.begin_test("test_closed")
+    tracker.track(ClosedHandle("closed"))
+    tracker.end_test()
+
+    assert tracker.live == 0
+
+
+def test_async_handles_are_disposed_on_the_event_loop():
+    tracker = HandleTracker()
+    tracker.begin_test("test_async")
+    handle = tracker.track(FakeAsyncHandle("async"))
+
+    assert tracker.has_async_handles()
+    asyncio.run(tracker.dispose_test_handles_async())
+    usage = tracker.end_test()
+
+    assert handle.disposed
+    assert usage["live_at_teardown"] == 1
+    assert tracker.live == 0
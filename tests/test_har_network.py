@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from utils.har_network import HarNetwork, har_path_for, merge_recordings
+
+ENTRY_URL = "https://www.saucedemo.com/inventory.html"
+
+
+class FakePage:
+    def __init__(self):
+        self.hars = []
+
+    def route(self, pattern, handler):
+        pass
+
+    def route_from_har(self, har, **options):
+        self.hars.append(har)
+
+
+def _write_part(path, *urls):
+    entries = [{"request": {"method": "GET", "url": url}, "response": {"status": 200, "content": {"text": url}}}
+               for url in urls]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"log": {"version": "1.2", "creator": {"name": "Playwright"}, "entries": entries}}, f)
+
+
+def test_record_mode_gives_every_page_its_own_file(tmp_path):
+    network = HarNetwork("record", har_dir=str(tmp_path))
+    first, second = FakePage(), FakePage()
+
+    network.attach(first, ENTRY_URL)
+    network.attach(first, ENTRY_URL)
+    network.attach(second, ENTRY_URL)
+
+    assert len(first.hars) == 1 and len(second.hars) == 1
+    assert first.hars[0] != second.hars[0]
+    assert first.hars[0] != har_path_for(ENTRY_URL, str(tmp_path))
+    assert os.path.dirname(first.hars[0]) == os.path.dirname(second.hars[0])
+
+
+def test_merge_recordings_keeps_requests_from_every_test(tmp_path):
+    network = HarNetwork("record", har_dir=str(tmp_path))
+    parts = [network.route_options(ENTRY_URL)["har"] for _ in range(2)]
+    _write_part(parts[0], "https://www.saucedemo.com/a.js", "https://www.saucedemo.com/shared.css")
+    _write_part(parts[1], "https://www.saucedemo.com/shared.css", "https://www.saucedemo.com/b.js")
+
+    merged = merge_recordings(str(tmp_path))
+
+    har_path = har_path_for(ENTRY_URL, str(tmp_path))
+    assert merged == {har_path: 3}
+    with open(har_path, "r", encoding="utf-8") as f:
+        log = json.load(f)["log"]
+    assert [entry["request"]["url"].rsplit("/", 1)[1] for entry in log["entries"]] == ["a.js", "shared.css", "b.js"]
+    assert log["creator"] == {"name": "Playwright"}
+    assert not os.path.exists(os.path.dirname(parts[0]))
+
+
+def test_replay_requires_a_recorded_har(tmp_path):
+    network = HarNetwork("replay", har_dir=str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        network.route_options(ENTRY_URL)
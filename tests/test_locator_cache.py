@@ -0,0 +1,54 @@
+import gc
+import weakref
+
+from pages.base.base_page import BasePage
+
+
+class FakeFrame:
+    def locator(self, selector):
+        return ("locator", selector, id(self))
+
+
+class FakePage:
+    def __init__(self):
+        self.main_frame = FakeFrame()
+        self.listeners = []
+
+    def on(self, event, callback):
+        self.listeners.append((event, callback))
+
+    def navigate(self, frame):
+        for event, callback in self.listeners:
+            if event == "framenavigated":
+                callback(frame)
+
+
+def test_one_framenavigated_listener_per_page():
+    page = FakePage()
+    page_objects = [BasePage(page) for _ in range(5)]
+
+    assert len(page.listeners) == 1
+    assert len(page_objects) == 5
+
+
+def test_navigation_invalidates_cached_locators_of_every_page_object():
+    page = FakePage()
+    first, second = BasePage(page), BasePage(page)
+    first.locator("#login")
+    second.locator("#login")
+    assert first.locator("#login") is first.locator("#login")
+
+    page.navigate(page.main_frame)
+
+    assert first._locator_cache == {} and second._locator_cache == {}
+    assert first._locator_stats["invalidations"] == 1
+
+
+def test_dropped_page_objects_are_not_kept_alive_by_the_page():
+    page = FakePage()
+    dropped = weakref.ref(BasePage(page))
+    gc.collect()
+
+    assert dropped() is None
+    page.navigate(page.main_frame)
+    assert len(page.listeners) == 1
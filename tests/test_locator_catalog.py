@@ -0,0 +1,38 @@
+import pytest
+
+from pages.locators.catalog import LocatorCatalog, get_catalog
+
+
+class FakePageObject:
+    def locator(self, selector):
+        return f"locator({selector})"
+
+
+def test_bind_uses_the_validated_read_only_set():
+    catalog = LocatorCatalog()
+    catalog.add("LOGIN_PAGE_SELECTORS", {"login_button": "#login-button"}, "login_locators")
+
+    ui = catalog.bind(FakePageObject(), "LOGIN_PAGE_SELECTORS")
+
+    assert ui.login_button == "locator(#login-button)"
+    with pytest.raises(TypeError):
+        catalog.selectors("LOGIN_PAGE_SELECTORS")["login_button"] = "#other"
+
+
+def test_bind_raises_when_the_set_has_errors():
+    catalog = LocatorCatalog()
+    catalog.add("BROKEN_SELECTORS", {"button": "button[data-test='x'"}, "broken_locators")
+
+    with pytest.raises(ValueError, match="BROKEN_SELECTORS"):
+        catalog.bind(FakePageObject(), "BROKEN_SELECTORS")
+
+
+def test_bind_raises_for_an_unknown_set():
+    with pytest.raises(KeyError):
+        LocatorCatalog().bind(FakePageObject(), "MISSING_SELECTORS")
+
+
+def test_shipped_selector_sets_bind_without_errors():
+    catalog = get_catalog()
+    for set_name in ("LOGIN_PAGE_SELECTORS", "INVENTORY_PAGE_SELECTORS"):
+        assert "locator(" in str(catalog.bind(FakePageObject(), set_name)[next(iter(catalog.selectors(set_name)))])
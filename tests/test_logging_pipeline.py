@@ -0,0 +1,47 @@
+import logging
+
+from utils.logging_pipeline import LoggingPipeline
+
+
+def test_root_keeps_file_level_and_only_framework_debug_is_buffered(tmp_path):
+    root = logging.getLogger()
+    previous_root_level = root.level
+    pipeline = LoggingPipeline()
+    pipeline.start(level=logging.INFO, buffer_level=logging.DEBUG, buffer_size=10, console=False,
+                   log_dir=str(tmp_path), framework_loggers=("test_pipeline_framework",))
+    try:
+        assert root.level == logging.INFO
+        assert not logging.getLogger("httpx").isEnabledFor(logging.DEBUG)
+        logging.getLogger("httpx").debug("library debug")
+        logging.getLogger("test_pipeline_framework.page").debug("framework debug")
+        logging.getLogger("httpx").info("library info")
+
+        buffered = pipeline.test_log()
+        assert "framework debug" in buffered
+        assert "library info" in buffered
+        assert "library debug" not in buffered
+    finally:
+        pipeline.stop()
+        root.setLevel(previous_root_level)
+
+    assert logging.getLogger("test_pipeline_framework").level == logging.NOTSET
+    with open(LoggingPipeline.worker_log_path(str(tmp_path)), encoding="utf-8") as f:
+        written = f.read()
+    assert "library info" in written and "framework debug" not in written
+
+
+def test_merge_worker_logs_orders_records_by_time(tmp_path):
+    (tmp_path / "test.gw0.log").write_text(
+        "2026-01-01 10:00:01,000 - a - INFO - second\n"
+        "2026-01-01 10:00:03,000 - a - ERROR - fourth\nTraceback line\n", encoding="utf-8")
+    (tmp_path / "test.gw1.log").write_text(
+        "2026-01-01 10:00:00,000 - b - INFO - first\n"
+        "2026-01-01 10:00:02,000 - b - INFO - third\n", encoding="utf-8")
+    output = tmp_path / "test.log"
+
+    count = LoggingPipeline.merge_worker_logs(str(output), str(tmp_path))
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert count == 4
+    assert [line.rsplit(" - ", 1)[-1] for line in lines if " - " in line] == ["first", "second", "third", "fourth"]
+    assert lines[-1] == "Traceback line"
@@ -3,8 +3,12 @@
 import pytest
 from playwright.sync_api import Page
 from pages.auth.login_page import LoginPage
+from pages.inventory.inventory_page import InventoryPage
 from utils.helpers import get_test_user
 
+# Các test này kiểm thử chính luồng login nên không dùng context đã đăng nhập sẵn
+pytestmark = pytest.mark.no_auth
+
 def test_login_success(page: Page):
     """Test login thành công"""
     login_page = LoginPage(page)
@@ -31,7 +35,7 @@ def test_login_parametrized(page: Page, username, password, expected_success, ex
     login_page.login(username, password)
     
     if expected_success:
-        page.wait_for_timeout(2000)
+        login_page.wait_for_navigation(InventoryPage, timeout=10000)
         assert login_page.is_logged_in()
     else:
         error_message = login_page.get_error_message()
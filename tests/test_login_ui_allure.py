@@ -4,9 +4,13 @@ import pytest
 import allure
 from playwright.sync_api import Page
 from pages.auth.login_page import LoginPage
+from pages.inventory.inventory_page import InventoryPage
 from utils.helpers import get_random_user, get_test_user, get_test_users
 from utils.allure_helpers import AllureReporter
 
+# Các test này kiểm thử chính luồng login nên không dùng context đã đăng nhập sẵn
+pytestmark = pytest.mark.no_auth
+
 # Test class kiểm thử chức năng đăng nhập với Allure step-by-step reporting
 @allure.feature("Authentication")
 @allure.story("User Login")
@@ -68,7 +72,7 @@ class TestLoginWithAllure:
         
         # Bước 8: Đợi trang load
         AllureReporter.wait_for_element_step("Inventory page", 10000)
-        page.wait_for_load_state("networkidle", timeout=10000)
+        login_page.wait_for_navigation(InventoryPage, timeout=10000)
         
         # Bước 9: Chụp màn hình sau khi login
         AllureReporter.take_screenshot_step(page, "After Login")
@@ -111,7 +115,7 @@ class TestLoginWithAllure:
         
         # Bước 6: Đợi thông báo lỗi
         AllureReporter.wait_for_element_step("Error message", 5000)
-        page.wait_for_selector(login_page.selectors["error_message"], timeout=5000)
+        assert login_page.wait_for_selector(login_page.selectors["error_message"], timeout=5000)
         
         # Bước 7: Chụp màn hình lỗi
         AllureReporter.take_screenshot_step(page, "Login Error")
@@ -160,7 +164,7 @@ class TestLoginWithAllure:
         
         # Bước 6: Đợi thông báo lỗi
         AllureReporter.wait_for_element_step("Locked user error message", 5000)
-        page.wait_for_selector(login_page.selectors["error_message"], timeout=5000)
+        assert login_page.wait_for_selector(login_page.selectors["error_message"], timeout=5000)
         
         # Bước 7: Chụp màn hình lỗi locked user
         AllureReporter.take_screenshot_step(page, "Locked User Error")
@@ -224,14 +228,14 @@ def test_login_parametrized_with_allure(page, username, password, expected_succe
     if expected_success:
         # Nếu mong đợi thành công
         AllureReporter.wait_for_element_step("Inventory page", 10000)
-        page.wait_for_load_state("networkidle", timeout=10000)
+        login_page.wait_for_navigation(InventoryPage, timeout=10000)
         AllureReporter.take_screenshot_step(page, "After Successful Login")
         AllureReporter.assert_step("Login successful", True, login_page.is_logged_in())
         assert login_page.is_logged_in()
     else:
         # Nếu mong đợi thất bại
         AllureReporter.wait_for_element_step("Error message", 5000)
-        page.wait_for_selector(login_page.selectors["error_message"], timeout=5000)
+        assert login_page.wait_for_selector(login_page.selectors["error_message"], timeout=5000)
         AllureReporter.take_screenshot_step(page, "Login Error")
         
         error_message = login_page.get_error_message()
@@ -0,0 +1,37 @@
+# tests/test_login_ui_async.py
+
+import pytest
+from pages.auth.async_login_page import AsyncLoginPage
+from pages.inventory.async_inventory_page import AsyncInventoryPage
+from utils.helpers import get_test_user, get_test_users
+
+# Async UI tests: chạy trên event loop của async_runner, nhiều page đồng thời trong một worker
+pytestmark = [pytest.mark.ui, pytest.mark.no_auth]
+
+async def test_async_login_success(async_page):
+    """Test login thành công với page async"""
+    login_page = AsyncLoginPage(async_page)
+    await login_page.goto()
+    await login_page.validate_login_fields()
+    assert await login_page.is_login_button_enabled()
+    user = get_test_user()
+    await login_page.login(user["username"], user["password"])
+    await login_page.custom_assert(await login_page.is_logged_in(), "Login failed! Check credentials or page state.")
+
+def test_async_login_all_users_concurrently(async_scenarios):
+    """Đăng nhập tất cả test users cùng lúc, mỗi user một context riêng trên cùng event loop"""
+    users = [user for user in get_test_users() if user["username"] != "locked_out_user"]
+
+    def make_scenario(user):
+        async def scenario(page):
+            login_page = AsyncLoginPage(page)
+            await login_page.goto()
+            await login_page.login(user["username"], user["password"])
+            assert await login_page.is_logged_in(), f"Login failed for {user['username']}"
+            inventory_page = AsyncInventoryPage(page)
+            await inventory_page.validate_inventory_page()
+            return await inventory_page.get_inventory_item_count()
+        return scenario
+
+    item_counts = async_scenarios([make_scenario(user) for user in users])
+    assert all(count > 0 for count in item_counts)
@@ -0,0 +1,57 @@
+import utils.memory_watchdog as memory_watchdog_module
+from utils.browser_pool import BrowserPool
+from utils.memory_watchdog import MB, MemoryWatchdog
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContextPool:
+    def __init__(self):
+        self.discarded = []
+
+    def discard_browser(self, browser):
+        self.discarded.append(browser)
+
+
+def _pool(endpoints=None):
+    pool = BrowserPool(["chromium"], lambda engine: {}, prelaunch=False, endpoints=endpoints)
+    pool._slots["chromium"].browsers.append(FakeBrowser())
+    return pool
+
+
+def test_watchdog_recycles_browser_over_budget(monkeypatch):
+    samples = iter([900 * MB, 800 * MB, 300 * MB])
+    monkeypatch.setattr(memory_watchdog_module, "process_tree_rss", lambda: next(samples))
+    pool, context_pool = _pool(), FakeContextPool()
+    browser = pool.browsers()[0]
+    monkeypatch.setattr(pool, "_schedule_prelaunch", lambda slot: None)
+    watchdog = MemoryWatchdog(pool, context_pool, budget_bytes=500 * MB)
+
+    watchdog.check(force=True)
+
+    assert browser.closed and pool.browsers() == []
+    stats = watchdog.get_stats()
+    assert stats["context_rotations"] == 1 and stats["browser_recycles"] == 1
+    assert [event["action"] for event in stats["events"]] == ["rotate_contexts", "recycle_browser"]
+
+
+def test_watchdog_is_disabled_with_a_browser_server(monkeypatch, caplog):
+    monkeypatch.setattr(memory_watchdog_module, "process_tree_rss", lambda: 900 * MB)
+    pool = _pool(endpoints={"chromium": "ws://127.0.0.1:9000/abc"})
+    watchdog = MemoryWatchdog(pool, FakeContextPool(), budget_bytes=500 * MB)
+
+    watchdog.check(force=True)
+
+    assert not watchdog.enabled
+    assert not pool.browsers()[0].closed
+    assert watchdog.get_stats()["samples"] == 0
+    assert "browser server" in caplog.text
@@ -0,0 +1,79 @@
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from pages import InventoryPage, LoginPage
+from pages.base.base_page import BasePage
+from utils.readiness import expected_url, url_matches
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    def wait_for(self, state, timeout):
+        self.page.events.append(("ready", self.page.url, self.selector))
+
+
+class FakePage:
+    """Page giả: URL đổi theo danh sách `urls` mỗi lần wait_for_url kiểm tra"""
+
+    def __init__(self, url, urls=()):
+        self.url = url
+        self._urls = list(urls)
+        self.events = []
+
+    def on(self, event, callback):
+        pass
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def wait_for_url(self, predicate, wait_until, timeout):
+        for url in [self.url] + self._urls:
+            self.url = url
+            if predicate(url):
+                self.events.append(("url", url))
+                return
+        raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+
+    def wait_for_load_state(self, state, timeout):
+        self.events.append(("load_state", state))
+
+
+def test_waits_for_url_change_before_readiness():
+    page = FakePage(LoginPage.URL, urls=[LoginPage.URL, InventoryPage.URL + "?from=login"])
+
+    BasePage(page).wait_for_navigation(InventoryPage, timeout=1000)
+
+    assert page.events[0] == ("url", InventoryPage.URL + "?from=login")
+    assert page.events[1][0] == "ready" and page.events[1][1].startswith(InventoryPage.URL)
+
+
+def test_navigation_that_never_happens_raises():
+    page = FakePage(LoginPage.URL, urls=[LoginPage.URL])
+
+    with pytest.raises(PlaywrightTimeoutError):
+        BasePage(page).wait_for_navigation(InventoryPage, timeout=1000)
+    assert page.events == []
+
+
+def test_url_without_readiness_falls_back_to_networkidle():
+    page = FakePage(LoginPage.URL, urls=["https://example.com/unknown.html"])
+
+    BasePage(page).wait_for_navigation("https://example.com/unknown.html", timeout=1000)
+
+    assert page.events[-1] == ("load_state", "networkidle")
+
+
+def test_expected_url_and_url_matches():
+    assert expected_url(InventoryPage) == InventoryPage.URL
+    assert expected_url("**/cart.html") == "**/cart.html"
+    with pytest.raises(ValueError):
+        expected_url(BasePage)
+    assert url_matches("**/inventory.html", "https://www.saucedemo.com/inventory.html#top")
+    assert not url_matches(InventoryPage.URL, LoginPage.URL)
@@ -0,0 +1,168 @@
+import asyncio
+import random
+import time
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from utils.common_functions import CommonFunctions
+from utils.retry_policy import RetryPolicy, backoff_class, classify_error
+
+
+@pytest.mark.parametrize("error, expected", [
+    (PlaywrightTimeoutError("Timeout 30000ms exceeded.\nCall log:\n  - navigating to \"https://example.com/\""),
+     "timeout"),
+    (PlaywrightTimeoutError("Timeout 5000ms exceeded.\nCall log:\n  - element is not stable\n  - retrying click action"),
+     "timeout"),
+    (PlaywrightTimeoutError("Timeout 5000ms exceeded.\nCall log:\n  - <div class=\"overlay\"> intercepts pointer events"),
+     "timeout"),
+    (asyncio.TimeoutError(), "timeout"),
+    (PlaywrightError("Target page, context or browser has been closed"), "closed"),
+    (PlaywrightError("Execution context was destroyed, most likely because of a navigation"), "navigation"),
+    (PlaywrightError("Element is not attached to the DOM"), "detached"),
+    (PlaywrightError("Element is outside of the viewport\nCall log:\n  - navigating to \"https://example.com/\""),
+     "intercepted"),
+    (PlaywrightError("locator.click: Timeout 1000ms exceeded."), "timeout"),
+    (ValueError("unexpected value\nnavigating to somewhere"), "other"),
+    (PlaywrightError(""), "other"),
+])
+def test_classify_error(error, expected):
+    assert classify_error(error) == expected
+
+
+def _policy(**kwargs):
+    options = {"base_delay": 0.1, "backoff_factor": 2.0, "max_delay": 1.0, "jitter": 0.0, "rng": random.Random(1)}
+    options.update(kwargs)
+    return RetryPolicy(**options)
+
+
+def test_backoff_grows_by_factor_and_is_capped():
+    policy = _policy()
+    assert policy.backoff(0, "other") == pytest.approx(0.1)
+    assert policy.backoff(2, "other") == pytest.approx(0.4)
+    assert policy.backoff(10, "other") == pytest.approx(1.0)
+
+
+def test_backoff_is_weighted_by_error_class():
+    policy = _policy()
+    assert policy.backoff(1, "playwright_timeout") == 0.0
+    assert policy.backoff(1, "timeout") == pytest.approx(0.2)
+    assert policy.backoff(1, "detached") == pytest.approx(0.1)
+    assert policy.backoff(1, "navigation") == pytest.approx(0.2)
+
+
+@pytest.mark.parametrize("error, expected", [
+    (PlaywrightTimeoutError("Timeout 5000ms exceeded."), "playwright_timeout"),
+    (PlaywrightError("locator.click: Timeout 1000ms exceeded."), "playwright_timeout"),
+    (TimeoutError("timed out"), "timeout"),
+    (asyncio.TimeoutError(), "timeout"),
+    (PlaywrightError("Element is not attached to the DOM"), "detached"),
+])
+def test_only_playwright_timeouts_skip_backoff(error, expected):
+    assert backoff_class(error, classify_error(error)) == expected
+
+
+def test_backoff_jitter_stays_in_range():
+    policy = _policy(jitter=0.5)
+    delays = [policy.backoff(0, "other") for _ in range(100)]
+    assert all(0.05 <= delay <= 0.1 for delay in delays)
+
+
+def test_backoff_is_limited_by_remaining_sleep_budget():
+    policy = _policy(max_sleep_per_test=0.15)
+    policy.begin_test("test_a")
+    policy._record_retry(0.1)
+    assert policy.backoff(3, "other") == pytest.approx(0.05)
+
+
+def test_closed_errors_are_not_retried():
+    policy = _policy()
+    calls = []
+
+    def _closed():
+        calls.append(1)
+        raise PlaywrightError("Browser has been closed")
+    with pytest.raises(PlaywrightError):
+        policy.call(_closed, attempts=5)
+
+    assert len(calls) == 1
+    assert policy.get_stats()["errors"]["closed"] == 1
+
+
+def test_retry_count_budget_is_per_test(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    policy = _policy(max_retries_per_test=2)
+    calls = []
+
+    def _flaky():
+        calls.append(1)
+        raise PlaywrightError("Element is not attached to the DOM")
+
+    policy.begin_test("test_a")
+    with pytest.raises(PlaywrightError):
+        policy.call(_flaky, attempts=10)
+    assert len(calls) == 3
+    assert policy.get_stats()["budget_exhausted"] == 1
+    assert policy.end_test()["retries"] == 2
+
+    # Test mới có ngân sách mới
+    policy.begin_test("test_b")
+    calls.clear()
+    with pytest.raises(PlaywrightError):
+        policy.call(_flaky, attempts=10)
+    assert len(calls) == 3
+    policy.end_test()
+    assert set(policy.get_stats()["tests"]) == {"test_a", "test_b"}
+
+
+def test_sleep_budget_stops_retries(monkeypatch):
+    slept = []
+    monkeypatch.setattr(time, "sleep", slept.append)
+    policy = _policy(base_delay=0.3, max_sleep_per_test=0.5)
+    outcomes = iter([PlaywrightError("boom"), PlaywrightError("boom"), PlaywrightError("boom"), "ok"])
+
+    def _action():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    policy.begin_test("test_sleepy")
+    with pytest.raises(PlaywrightError):
+        policy.call(_action, attempts=10)
+
+    assert slept == pytest.approx([0.3, 0.2])
+    assert policy.get_stats()["budget_exhausted"] == 1
+
+
+def test_call_returns_after_retry(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    policy = _policy()
+    outcomes = iter([PlaywrightError("Element is detached from the DOM"), "done"])
+    retried = []
+
+    def _action():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    policy.begin_test("test_a")
+    assert policy.call(_action, attempts=3, on_retry=retried.append) == "done"
+    assert retried == ["detached"]
+
+
+def test_retry_action_backs_off_from_one_second_on_generic_timeouts(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    policy = RetryPolicy(jitter=0.0, max_delay=10.0)
+    attempts = []
+
+    def _api_call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError("read timed out")
+        return "ok"
+
+    assert CommonFunctions.retry_action(_api_call, policy=policy) == "ok"
+    assert sleeps == [pytest.approx(1.0), pytest.approx(2.0)]
@@ -0,0 +1,40 @@
+import threading
+
+import utils.screenshot_service as screenshot_module
+from utils.screenshot_service import ScreenshotService
+
+
+def _record_attachments(monkeypatch):
+    attached = []
+    monkeypatch.setattr(screenshot_module.allure, "attach",
+                        lambda body, name, attachment_type: attached.append((name, threading.current_thread())))
+    return attached
+
+
+def test_save_attaches_immediately_by_default(tmp_path, monkeypatch):
+    attached = _record_attachments(monkeypatch)
+    service = ScreenshotService(directory=str(tmp_path))
+
+    service.save(b"image", "shot", attach_name="Shot")
+    service.shutdown()
+
+    assert [name for name, _ in attached] == ["Shot"]
+
+
+def test_deferred_attachments_are_made_on_the_calling_thread(tmp_path, monkeypatch):
+    attached = _record_attachments(monkeypatch)
+    service = ScreenshotService(directory=str(tmp_path))
+
+    def _loop_thread():
+        service.save(b"image", "shot", attach_name="Shot", defer_attach=True)
+        service.defer_attachment("Assertion failed", "Error Details", "text")
+    worker = threading.Thread(target=_loop_thread)
+    worker.start()
+    worker.join()
+    assert attached == []
+
+    assert service.attach_deferred() == 2
+    assert attached == [("Shot", threading.current_thread()), ("Error Details", threading.current_thread())]
+    assert service.attach_deferred() == 0
+    service.shutdown()
+    assert (tmp_path / "shot.png").read_bytes() == b"image"
@@ -23,4 +23,15 @@ def test_user_login_api():
     # Kiểm tra username và password được gửi đúng
     sent_data = response_data["json"]
     assert sent_data["username"] == user["username"]
-    assert sent_data["password"] == user["password"] 
\ No newline at end of file
+    assert sent_data["password"] == user["password"]
+
+
+@pytest.mark.api
+def test_user_info_bulk_api(pooled_api_client):
+    """Test lấy thông tin nhiều user đồng thời qua connection pool dùng chung"""
+    user_ids = list(range(1, 21))
+    responses = pooled_api_client.bulk_get_user_info(user_ids, concurrency=10)
+    
+    # Kết quả giữ đúng thứ tự user_ids
+    assert [response.status_code for response in responses] == [200] * len(user_ids)
+    assert [response.json()["args"]["user_id"] for response in responses] == [str(i) for i in user_ids]
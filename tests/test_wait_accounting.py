@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+import utils.wait_accounting as wait_accounting_module
+from utils.perf_reports import write_worker_report
+from utils.wait_accounting import WaitAccounting, merge_wait_reports
+
+
+class FakeClock:
+    """Thay time.perf_counter của module để thời lượng span là số cố định"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(wait_accounting_module, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def installed():
+    """WaitAccounting mới đã bọc time.sleep; gỡ hook sau test"""
+    accounting = WaitAccounting()
+    accounting.install()
+    try:
+        yield accounting
+    finally:
+        accounting.uninstall()
+
+
+def test_nested_span_only_counts_its_own_time(clock):
+    accounting = WaitAccounting()
+    accounting.begin_test("test_nested")
+
+    with accounting.span("action", with_site=False):
+        clock.advance(0.2)
+        with accounting.span("implicit_wait"):
+            clock.advance(1.0)
+        clock.advance(0.3)
+    clock.advance(0.5)
+    summary = accounting.end_test()
+
+    assert summary["action"] == 0.5
+    assert summary["implicit_wait"] == 1.0
+    assert summary["wall"] == 2.0
+    assert summary["idle"] == 1.0
+    assert summary["other"] == 0.5
+    assert "fixed_sleeps" not in summary
+
+
+def test_spans_are_grouped_by_call_site(clock):
+    accounting = WaitAccounting()
+    accounting.begin_test("test_sites")
+
+    for _ in range(2):
+        with accounting.span("explicit_wait"):
+            clock.advance(0.25)
+    summary = accounting.end_test()
+
+    (key,) = summary["fixed_sleeps"]
+    assert key.startswith("explicit_wait tests/test_wait_accounting.py:")
+    assert summary["fixed_sleeps"][key] == 0.5
+    assert accounting.get_stats()["sites"][key] == {"calls": 2, "time": 0.5}
+
+
+def test_spans_outside_a_test_are_ignored(clock):
+    accounting = WaitAccounting()
+
+    with accounting.span("implicit_wait"):
+        clock.advance(1.0)
+
+    assert accounting.end_test() == {}
+    assert accounting.get_stats()["tests"] == {}
+
+
+def test_time_sleep_on_test_thread_is_an_explicit_wait(installed):
+    installed.begin_test("test_sleep")
+    time.sleep(0.02)
+    summary = installed.end_test()
+
+    assert summary["explicit_wait"] >= 0.02
+    (key,) = summary["fixed_sleeps"]
+    assert key.startswith("explicit_wait tests/test_wait_accounting.py:")
+
+
+def test_time_sleep_inside_action_is_still_counted(installed):
+    installed.begin_test("test_sleep_in_action")
+    with installed.span("action", with_site=False):
+        time.sleep(0.02)
+    summary = installed.end_test()
+
+    assert summary["explicit_wait"] >= 0.02
+    assert summary["action"] < 0.02
+
+
+def test_time_sleep_inside_retry_sleep_is_not_counted_twice(installed):
+    installed.begin_test("test_retry")
+    with installed.span("retry_sleep", with_site=False):
+        time.sleep(0.02)
+    summary = installed.end_test()
+
+    assert summary["retry_sleep"] >= 0.02
+    assert summary["explicit_wait"] == 0.0
+    assert "fixed_sleeps" not in summary
+
+
+def test_time_sleep_on_other_threads_is_ignored(installed):
+    installed.begin_test("test_background")
+    worker = threading.Thread(target=time.sleep, args=(0.02,))
+    worker.start()
+    worker.join()
+    summary = installed.end_test()
+
+    assert summary["explicit_wait"] == 0.0
+
+
+def test_uninstall_restores_time_sleep():
+    original = time.sleep
+    accounting = WaitAccounting()
+    accounting.install()
+    assert time.sleep is not original
+
+    accounting.uninstall()
+    assert time.sleep is original
+
+
+def test_merge_wait_reports_across_workers(tmp_path, monkeypatch, clock):
+    monkeypatch.chdir(tmp_path)
+    for worker, idle in (("gw0", 0.5), ("gw1", 2.0)):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        accounting = WaitAccounting()
+        accounting.begin_test(f"test_{worker}")
+        with accounting.span("explicit_wait"):
+            clock.advance(idle)
+        clock.advance(0.5)
+        accounting.end_test()
+        write_worker_report("wait_accounting", accounting.get_stats())
+
+    report = merge_wait_reports()
+
+    assert report["workers"] == 2 and report["tests"] == 2
+    assert report["totals"]["explicit_wait"] == 2.5
+    assert report["totals"]["wall"] == 3.5
+    assert report["idle_share"] == round(2.5 / 3.5, 3)
+    assert list(report["most_idle_tests"]) == ["test_gw1", "test_gw0"]
+    ((site, data),) = report["fixed_sleeps"].items()
+    assert site.startswith("tests/test_wait_accounting.py:")
+    assert data == {"calls": 2, "time": 2.5}
+    assert (tmp_path / "logs" / "perf" / "wait_accounting.json").exists()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Action Metrics - Histogram latency của các action page object theo method và selector
+"""
+
+import bisect
+import logging
+import threading
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.perf_reports import load_worker_reports, write_run_report
+
+ACTION_METRICS_REPORT = "action_metrics"
+# Cận trên các bucket (ms), mỗi bucket rộng khoảng 1.5 lần bucket trước
+BUCKET_BOUNDS_MS = [1, 2, 3, 5, 7, 10, 15, 20, 30, 50, 70, 100, 150, 200, 300, 500, 700,
+                    1000, 1500, 2000, 3000, 5000, 7000, 10000, 15000, 20000, 30000, 60000]
+_OVERFLOW_BUCKET = "inf"
+# Số test chậm nhất giữ lại trong báo cáo run
+TOP_TESTS = 20
+
+
+# Độ sâu action đang chạy (mỗi asyncio task/thread riêng): action lồng trong action khác không cộng vào total_ms của test
+_action_depth: ContextVar[int] = ContextVar("action_depth", default=0)
+
+
+def _bucket_label(index: int) -> str:
+    return str(BUCKET_BOUNDS_MS[index]) if index < len(BUCKET_BOUNDS_MS) else _OVERFLOW_BUCKET
+
+
+class LatencyHistogram:
+    """Histogram latency với bucket cố định, cộng gộp được giữa test, worker và run"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+    def record(self, duration_ms: float, error: bool = False):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if error:
+            self.errors += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.errors += other.errors
+        self.total_ms += other.total_ms
+
+    def percentile(self, q: float) -> float:
+        """Percentile q (0-100), nội suy tuyến tính trong bucket chứa nó"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0
+                upper = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else lower * 2
+                return round(lower + (upper - lower) * (rank - seen) / bucket_count, 1)
+            seen += bucket_count
+        return float(BUCKET_BOUNDS_MS[-1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 1),
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {_bucket_label(i): n for i, n in enumerate(self.counts) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        labels = [_bucket_label(i) for i in range(len(histogram.counts))]
+        for label, n in data.get("buckets", {}).items():
+            if label in labels:
+                histogram.counts[labels.index(label)] += n
+        histogram.count = data.get("count", 0)
+        histogram.errors = data.get("errors", 0)
+        histogram.total_ms = data.get("total_ms", 0.0)
+        return histogram
+
+
+def action_target(args: tuple, kwargs: Dict[str, Any]) -> Optional[str]:
+    """Selector/URL của action: tham số selector/url hoặc tham số chuỗi đầu tiên"""
+    for name in ("selector", "url"):
+        if isinstance(kwargs.get(name), str):
+            return kwargs[name]
+    return args[0] if args and isinstance(args[0], str) else None
+
+
+def _histograms_to_dict(histograms: Dict[str, LatencyHistogram]) -> Dict[str, Dict[str, Any]]:
+    # Sắp xếp theo tổng thời gian giảm dần: action chiếm nhiều wall time nhất đứng đầu
+    ordered = sorted(histograms.items(), key=lambda item: item[1].total_ms, reverse=True)
+    return {key: histogram.to_dict() for key, histogram in ordered}
+
+
+class ActionMetrics:
+    """Thu thập latency của các method được BasePage.performance_monitor bọc.
+
+    Mỗi action được ghi vào histogram theo method (vd. "click_button") và theo
+    method + selector (vd. "click_button [data-test='login-button']"). Histogram
+    của test hiện tại được tóm tắt khi test kết thúc; histogram của worker được
+    ghi ra logs/perf/action_metrics.<worker>.json và gộp lại ở cuối run.
+
+    Histogram ghi mọi action, kể cả action lồng (wait_for_selector trong get_text);
+    total_ms/actions của test chỉ tính action ngoài cùng để không đếm trùng wall time.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._methods: Dict[str, LatencyHistogram] = {}
+        self._selectors: Dict[str, LatencyHistogram] = {}
+        self._test_id: Optional[str] = None
+        self._test_methods: Dict[str, LatencyHistogram] = {}
+        self._test_total = {"total_ms": 0.0, "actions": 0}
+        self._tests: Dict[str, Dict[str, Any]] = {}
+
+    def enter(self) -> Tuple[Token, bool]:
+        """Bắt đầu một action; trả về (token cho exit(), action có phải ngoài cùng không)"""
+        depth = _action_depth.get()
+        return _action_depth.set(depth + 1), depth == 0
+
+    def exit(self, token: Token):
+        _action_depth.reset(token)
+
+    def record(self, method: str, target: Optional[str], duration: float, error: bool = False,
+               outermost: bool = True):
+        """Ghi một action (duration tính bằng giây); chỉ action ngoài cùng được cộng vào tổng của test"""
+        duration_ms = duration * 1000
+        with self._lock:
+            if outermost:
+                self._test_total["total_ms"] += duration_ms
+                self._test_total["actions"] += 1
+            for histograms, key in ((self._methods, method), (self._test_methods, method),
+                                    (self._selectors, f"{method} {target}" if target else None)):
+                if key is None:
+                    continue
+                histogram = histograms.get(key)
+                if histogram is None:
+                    histogram = histograms[key] = LatencyHistogram()
+                histogram.record(duration_ms, error)
+
+    def begin_test(self, test_id: str):
+        with self._lock:
+            self._test_id = test_id
+            self._test_methods = {}
+            self._test_total = {"total_ms": 0.0, "actions": 0}
+
+    def end_test(self) -> Dict[str, Any]:
+        """Tóm tắt action của test vừa chạy: tổng của action ngoài cùng và histogram theo method"""
+        with self._lock:
+            summary = {
+                "total_ms": round(self._test_total["total_ms"], 1),
+                "actions": self._test_total["actions"],
+                "methods": _histograms_to_dict(self._test_methods),
+            }
+            if self._test_id and summary["actions"]:
+                self._tests[self._test_id] = summary
+            self._test_id = None
+            self._test_methods = {}
+            self._test_total = {"total_ms": 0.0, "actions": 0}
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Báo cáo của worker: histogram theo method, selector và tóm tắt từng test"""
+        with self._lock:
+            return {
+                "methods": _histograms_to_dict(self._methods),
+                "selectors": _histograms_to_dict(self._selectors),
+                "tests": {test_id: dict(summary) for test_id, summary in self._tests.items()},
+            }
+
+
+def merge_action_reports() -> Dict[str, Any]:
+    """Gộp histogram của mọi worker thành logs/perf/action_metrics.json (percentile tính lại từ bucket)"""
+    reports = load_worker_reports(ACTION_METRICS_REPORT)
+    if not reports:
+        return {}
+    merged: Dict[str, Dict[str, LatencyHistogram]] = {"methods": {}, "selectors": {}}
+    tests: List[Any] = []
+    for report in reports:
+        for section in ("methods", "selectors"):
+            for key, data in report.get(section, {}).items():
+                histogram = merged[section].setdefault(key, LatencyHistogram())
+                histogram.merge(LatencyHistogram.from_dict(data))
+        tests.extend(report.get("tests", {}).items())
+    tests.sort(key=lambda item: item[1].get("total_ms", 0), reverse=True)
+    run_report = {
+        "workers": len(reports),
+        "tests": len(tests),
+        "methods": _histograms_to_dict(merged["methods"]),
+        "selectors": _histograms_to_dict(merged["selectors"]),
+        "slowest_tests": {test_id: {"total_ms": summary["total_ms"], "actions": summary["actions"]}
+                          for test_id, summary in tests[:TOP_TESTS]},
+    }
+    write_run_report(ACTION_METRICS_REPORT, run_report)
+    return run_report
+
+
+# Global instance, dùng bởi BasePage/AsyncBasePage.performance_monitor
+action_metrics = ActionMetrics()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Adaptive Timeouts - Timeout theo (page object, selector) học từ lịch sử các lần chạy trước
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.action_metrics import LatencyHistogram
+from utils.perf_reports import load_worker_reports, write_run_report
+
+TIMEOUT_HISTORY_FILE = ".timeout_history.json"
+ADAPTIVE_TIMEOUTS_REPORT = "adaptive_timeouts"
+
+logger = logging.getLogger(__name__)
+
+
+def timeout_key(page_object: Any, selector: str) -> str:
+    """Khoá lịch sử: tên class page object + selector"""
+    return f"{type(page_object).__name__} {selector}"
+
+
+def _decay(histogram: LatencyHistogram, max_samples: int) -> LatencyHistogram:
+    # Giữ lịch sử gần đây: quá max_samples thì thu nhỏ mọi bucket theo cùng tỉ lệ
+    if histogram.count <= max_samples:
+        return histogram
+    scale = max_samples / histogram.count
+    histogram.counts = [round(n * scale) for n in histogram.counts]
+    histogram.total_ms *= scale
+    histogram.errors = round(histogram.errors * scale)
+    histogram.count = sum(histogram.counts)
+    return histogram
+
+
+class AdaptiveTimeouts:
+    """Timeout học được cho từng (page object, selector).
+
+    Mỗi lần element resolve thành công (wait_for/fill/click), thời gian được ghi
+    vào histogram của run; cuối run controller gộp histogram của các worker vào
+    file lịch sử (.timeout_history.json). Khi bật, timeout của một selector là
+    percentile cao của lịch sử nhân hệ số, kẹp trong [floor, timeout được yêu
+    cầu]; selector chưa đủ mẫu dùng nguyên timeout yêu cầu. Hết timeout học được
+    thì ghi một mẫu bằng timeout yêu cầu để lần chạy sau tự nới ra.
+    """
+
+    def __init__(self, history_file: str = TIMEOUT_HISTORY_FILE, percentile: float = 99.0, multiplier: float = 2.0,
+                 floor_ms: int = 1000, min_samples: int = 20, max_samples: int = 1000):
+        self.history_file = history_file
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.floor_ms = floor_ms
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.enabled = False
+        self._lock = threading.Lock()
+        # Timeout học được (ms) theo key, tính một lần khi load lịch sử
+        self._learned: Dict[str, float] = {}
+        self._samples: Dict[str, LatencyHistogram] = {}
+        self._stats: Dict[str, Any] = {"lookups": 0, "applied": 0, "fast_failures": 0, "time_saved_ms": 0.0}
+
+    def configure(self, enabled: bool = False, floor_ms: Optional[int] = None):
+        """Bật áp dụng timeout học được (gọi từ pytest_configure); mẫu luôn được ghi"""
+        self.enabled = enabled
+        if floor_ms is not None:
+            self.floor_ms = floor_ms
+        self.load()
+
+    def load(self):
+        """Đọc file lịch sử và tính trước timeout cho các key đủ mẫu"""
+        history = load_history(self.history_file)
+        learned = {}
+        for key, histogram in history.items():
+            if histogram.count >= self.min_samples:
+                learned[key] = histogram.percentile(self.percentile) * self.multiplier
+        self._learned = learned
+
+    # =====================
+    # Timeout
+    # =====================
+    def timeout(self, page_object: Any, selector: str, requested: float) -> float:
+        """Timeout (ms) cho selector: giá trị học được kẹp trong [floor, requested], hoặc requested"""
+        if not self.enabled:
+            return requested
+        learned = self._learned.get(timeout_key(page_object, selector))
+        with self._lock:
+            self._stats["lookups"] += 1
+            if learned is None or learned >= requested:
+                return requested
+            self._stats["applied"] += 1
+        return max(min(self.floor_ms, requested), int(learned))
+
+    # =====================
+    # Ghi mẫu
+    # =====================
+    def record(self, page_object: Any, selector: str, duration: float):
+        """Ghi thời gian (giây) một lần selector resolve thành công"""
+        self._add(timeout_key(page_object, selector), duration * 1000)
+
+    def record_timeout(self, page_object: Any, selector: str, used: float, requested: float):
+        """Hết timeout: nếu là timeout học được thì ghi mẫu bằng requested để lịch sử tự nới ra"""
+        if used >= requested:
+            return
+        logger.warning("%s timed out after adaptive %sms (requested %sms)",
+                       timeout_key(page_object, selector), used, requested)
+        with self._lock:
+            self._stats["fast_failures"] += 1
+            self._stats["time_saved_ms"] += requested - used
+        self._add(timeout_key(page_object, selector), requested)
+
+    @contextmanager
+    def measure(self, page_object: Any, selector: str, used: float, requested: float) -> Iterator[None]:
+        """Bọc thao tác đợi selector: thành công thì ghi mẫu, hết timeout thì record_timeout"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        except PlaywrightTimeoutError:
+            self.record_timeout(page_object, selector, used, requested)
+            raise
+        self.record(page_object, selector, time.perf_counter() - start_time)
+
+    def _add(self, key: str, duration_ms: float):
+        with self._lock:
+            histogram = self._samples.get(key)
+            if histogram is None:
+                histogram = self._samples[key] = LatencyHistogram()
+            histogram.record(duration_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Báo cáo của worker: thống kê áp dụng và histogram mẫu mới của run này"""
+        with self._lock:
+            return {
+                **self._stats,
+                "learned_selectors": len(self._learned),
+                "samples": {key: histogram.to_dict() for key, histogram in self._samples.items()},
+            }
+
+
+def load_history(history_file: str = TIMEOUT_HISTORY_FILE) -> Dict[str, LatencyHistogram]:
+    """Đọc file lịch sử {key: histogram}"""
+    if not os.path.exists(history_file):
+        return {}
+    try:
+        with open(history_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning("Could not read timeout history %s: %s", history_file, e)
+        return {}
+    return {key: LatencyHistogram.from_dict(value) for key, value in data.items()}
+
+
+def merge_timeout_reports(history_file: str = TIMEOUT_HISTORY_FILE, max_samples: int = 1000) -> Dict[str, Any]:
+    """Gộp mẫu của mọi worker vào file lịch sử và ghi logs/perf/adaptive_timeouts.json (gọi trên controller)"""
+    reports = load_worker_reports(ADAPTIVE_TIMEOUTS_REPORT)
+    if not reports:
+        return {}
+    history = load_history(history_file)
+    run_report: Dict[str, Any] = {"workers": len(reports), "lookups": 0, "applied": 0, "fast_failures": 0,
+                                  "time_saved_ms": 0.0}
+    for report in reports:
+        for name in ("lookups", "applied", "fast_failures", "time_saved_ms"):
+            run_report[name] += report.get(name, 0)
+        for key, data in report.get("samples", {}).items():
+            history.setdefault(key, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+    with open(history_file, "w", encoding="utf-8") as f:
+        json.dump({key: _decay(histogram, max_samples).to_dict() for key, histogram in sorted(history.items())},
+                  f, indent=2, ensure_ascii=False)
+    run_report["selectors"] = len(history)
+    write_run_report(ADAPTIVE_TIMEOUTS_REPORT, run_report)
+    return run_report
+
+
+# Global instance, dùng bởi BasePage/AsyncBasePage
+adaptive_timeouts = AdaptiveTimeouts()
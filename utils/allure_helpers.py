@@ -2,9 +2,9 @@
 
 import allure
 import json
-import os
 from datetime import datetime
 from typing import Dict, Any, Optional
+from utils.screenshot_service import screenshot_service
 
 # Lớp hỗ trợ tạo Allure report với các step chi tiết, giúp ghi lại từng hành động, dữ liệu, trạng thái trong quá trình test
 class AllureReporter:
@@ -64,19 +64,8 @@ class AllureReporter:
     def take_screenshot_step(page, description: str = "Screenshot"):
         """Step: Chụp màn hình và attach vào Allure report"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_path = f"screenshots/allure_{timestamp}.png"
-        # Đảm bảo thư mục tồn tại
-        os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-        # Chụp screenshot
-        page.screenshot(path=screenshot_path, full_page=True)
-        # Attach vào Allure
-        with open(screenshot_path, "rb") as f:
-            allure.attach(
-                f.read(),
-                f"{description} - {timestamp}",
-                allure.attachment_type.PNG
-            )
-        return screenshot_path
+        # Chụp một lần ra bytes, attach vào Allure và ghi file ở thread nền
+        return screenshot_service.capture(page, f"allure_{timestamp}", attach_name=f"{description} - {timestamp}")
     
     @staticmethod
     def api_request_step(method: str, endpoint: str, data: Optional[Dict] = None):
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Artifact Retention - Chỉ giữ lại artifacts (video, trace, ...) của test cần debug
+"""
+
+import os
+import re
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+RETENTION_MODES = ("off", "on-failure", "always")
+
+
+def parse_size(value: Optional[str]) -> Optional[Dict[str, int]]:
+    """Parse kích thước dạng 'WIDTHxHEIGHT' (ví dụ 1280x720)"""
+    if not value:
+        return None
+    match = re.fullmatch(r"\s*(\d+)\s*[xX]\s*(\d+)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid size '{value}', expected WIDTHxHEIGHT (e.g. 1280x720)")
+    return {"width": int(match.group(1)), "height": int(match.group(2))}
+
+
+def safe_artifact_name(name: str) -> str:
+    """Chuyển tên test (có thể chứa [params], ::) thành tên file an toàn"""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")[:150]
+
+
+def find_new_artifacts(directory: str, since: float) -> List[str]:
+    """File trong thư mục được ghi từ thời điểm since (ví dụ video còn sót sau một run toàn pass)"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(entry.path for entry in os.scandir(directory)
+                  if entry.is_file() and entry.stat().st_mtime >= since)
+
+
+class ArtifactRetention:
+    """Quyết định giữ hay bỏ artifact theo kết quả test và giới hạn dung lượng thư mục.
+
+    Mode: off (không ghi), on-failure (chỉ giữ của test fail), always (giữ tất cả).
+    Khi tổng dung lượng thư mục vượt max_total_mb, file cũ nhất bị xoá trước.
+    """
+
+    def __init__(self, directory: str, mode: str = "on-failure", max_total_mb: float = 0):
+        if mode not in RETENTION_MODES:
+            raise ValueError(f"Unknown retention mode '{mode}', expected one of {', '.join(RETENTION_MODES)}")
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.mode = mode
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self._stats = {"kept": 0, "discarded": 0, "evicted": 0, "bytes_kept": 0, "bytes_discarded": 0, "bytes_evicted": 0}
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def should_keep(self, failed: bool) -> bool:
+        """Artifact của test này có cần giữ lại không"""
+        return self.mode == "always" or (self.mode == "on-failure" and failed)
+
+    def keep(self, path: str, name: Optional[str] = None) -> str:
+        """Giữ artifact (đổi tên theo test nếu có name) rồi áp dụng giới hạn dung lượng"""
+        if name:
+            ext = os.path.splitext(path)[1]
+            target = os.path.join(os.path.dirname(path), f"{safe_artifact_name(name)}{ext}")
+            try:
+                os.replace(path, target)
+                path = target
+            except OSError as e:
+                self.logger.warning(f"Could not rename artifact {path}: {e}")
+        self._stats["kept"] += 1
+        self._stats["bytes_kept"] += self._size(path)
+        self.enforce_size_cap(protect=path)
+        return path
+
+    def discard(self, path: Optional[str], deleter: Optional[Callable[[], Any]] = None):
+        """Xoá artifact của test không cần giữ"""
+        size = self._size(path)
+        try:
+            if deleter is not None:
+                # Ví dụ Video.delete(): đợi ghi xong rồi mới xoá
+                deleter()
+            if path and os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            self.logger.warning(f"Could not discard artifact {path}: {e}")
+            return
+        self._stats["discarded"] += 1
+        self._stats["bytes_discarded"] += size
+
+    def enforce_size_cap(self, protect: Optional[str] = None):
+        """Xoá file cũ nhất cho tới khi thư mục nằm dưới giới hạn dung lượng"""
+        if not self.max_total_bytes or not os.path.isdir(self.directory):
+            return
+        # File vừa được ghi có thể là artifact đang record của worker khác
+        recent = time.time() - 30
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in sorted(files):
+            if total <= self.max_total_bytes:
+                break
+            if protect and os.path.abspath(path) == os.path.abspath(protect):
+                continue
+            if mtime > recent:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self._stats["evicted"] += 1
+            self._stats["bytes_evicted"] += size
+            self.logger.info(f"Evicted {path} ({size / 1024:.0f} KB) to keep {self.directory} under cap")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê số lượng/dung lượng artifact đã giữ, bỏ và evict"""
+        return dict(self._stats)
+
+    @staticmethod
+    def _size(path: Optional[str]) -> int:
+        try:
+            return os.path.getsize(path) if path else 0
+        except OSError:
+            return 0
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Asset Cache - Cache JS/CSS/font/ảnh trên đĩa, dùng chung giữa các context và xdist worker
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from utils.perf_reports import load_worker_reports, merge_numeric, write_run_report
+
+ASSET_CACHE_DIR = ".asset_cache"
+ASSET_CACHE_REPORT = "asset_cache"
+CACHEABLE_RESOURCE_TYPES = ("script", "stylesheet", "image", "font", "media")
+# Header không còn đúng với body lưu trong cache (đã giải nén) hoặc không nên phát lại
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "date", "set-cookie"}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class AssetCache:
+    """Cache asset tĩnh bằng route interception trên mỗi BrowserContext.
+
+    Body được lưu theo nội dung (objects/<sha256>), index theo URL
+    (index/<sha256(url)>.json) kèm ETag/Last-Modified. Entry còn trong TTL
+    được trả thẳng từ đĩa; entry hết hạn được revalidate bằng conditional
+    request và chỉ tải lại body khi server trả về nội dung mới.
+    """
+
+    def __init__(self, cache_dir: str = ASSET_CACHE_DIR, ttl_seconds: int = 3600):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        self._index_dir = os.path.join(cache_dir, "index")
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._index_dir, exist_ok=True)
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "fetch_errors": 0,
+                       "bytes_saved": 0, "bytes_stored": 0}
+
+    def attach(self, context):
+        """Cài route cache cho context (gọi lại sau mỗi lần route bị xoá)"""
+        context.route("**/*", self._handle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê hit/miss và số bytes không phải tải lại"""
+        return dict(self._stats)
+
+    # =====================
+    # Route handler
+    # =====================
+    def _handle(self, route):
+        request = route.request
+        if (request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES
+                or "range" in request.headers):
+            route.fallback()
+            return
+
+        entry = self._load_entry(request.url)
+        body = self._load_body(entry) if entry else None
+        if entry and body is not None:
+            if time.time() - entry["stored_at"] < self.ttl_seconds:
+                self._serve(route, entry, body)
+                return
+            if self._revalidate(route, entry, body):
+                return
+
+        self._stats["misses"] += 1
+        fetched = self._fetch(route)
+        if fetched is None:
+            return
+        response, body = fetched
+        if response.status == 200 and "no-store" not in response.headers.get("cache-control", ""):
+            self._store(request.url, response.status, response.headers, body)
+        route.fulfill(status=response.status, headers=self._cacheable_headers(response.headers), body=body)
+
+    def _fetch(self, route, headers: Optional[Dict[str, str]] = None):
+        """route.fetch() + body; lỗi mạng/timeout thì để request đi tiếp (fallback) và trả về None"""
+        try:
+            response = route.fetch(headers=headers) if headers else route.fetch()
+            return response, response.body()
+        except Exception as e:
+            self._stats["fetch_errors"] += 1
+            self.logger.debug(f"Asset fetch failed for {route.request.url}, falling back: {e}")
+            route.fallback()
+            return None
+
+    def _serve(self, route, entry: Dict[str, Any], body: bytes):
+        route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+        self._stats["hits"] += 1
+        self._stats["bytes_saved"] += len(body)
+
+    def _revalidate(self, route, entry: Dict[str, Any], body: bytes) -> bool:
+        """Gửi conditional request; trả về True nếu đã phục vụ từ cache (304)"""
+        headers = {}
+        if entry.get("etag"):
+            headers["if-none-match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["if-modified-since"] = entry["last_modified"]
+        if not headers:
+            return False
+        fetched = self._fetch(route, headers={**route.request.headers, **headers})
+        if fetched is None:
+            return True
+        response, new_body = fetched
+        if response.status == 304:
+            entry["stored_at"] = time.time()
+            self._write_json(self._index_path(entry["url"]), entry)
+            self._stats["revalidated"] += 1
+            self._serve(route, entry, body)
+            return True
+        # Nội dung đã đổi: lưu bản mới và trả luôn response vừa tải
+        if response.status == 200:
+            self._store(entry["url"], response.status, response.headers, new_body)
+        self._stats["misses"] += 1
+        route.fulfill(status=response.status, headers=self._cacheable_headers(response.headers), body=new_body)
+        return True
+
+    # =====================
+    # Storage
+    # =====================
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self._index_dir, f"{_sha256(url.encode('utf-8'))}.json")
+
+    def _load_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._index_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _load_body(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self._objects_dir, entry["body_sha256"]), "rb") as f:
+                return f.read()
+        except (OSError, KeyError):
+            return None
+
+    def _store(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        digest = _sha256(body)
+        object_path = os.path.join(self._objects_dir, digest)
+        if not os.path.exists(object_path):
+            self._write_bytes(object_path, body)
+            self._stats["bytes_stored"] += len(body)
+        self._write_json(self._index_path(url), {
+            "url": url,
+            "status": status,
+            "headers": self._cacheable_headers(headers),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "body_sha256": digest,
+            "stored_at": time.time(),
+        })
+        self._stats["stored"] += 1
+
+    @staticmethod
+    def _cacheable_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        # Body từ route.fetch() đã được giải nén nên bỏ content-encoding/content-length gốc
+        return {name: value for name, value in headers.items() if name.lower() not in _DROPPED_HEADERS}
+
+    def _write_bytes(self, path: str, data: bytes):
+        # Ghi nguyên tử: worker khác chỉ thấy file hoàn chỉnh
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_json(self, path: str, data: Dict[str, Any]):
+        self._write_bytes(path, json.dumps(data).encode("utf-8"))
+
+
+def merge_asset_cache_reports() -> Dict[str, Any]:
+    """Gộp thống kê cache của mọi worker thành logs/perf/asset_cache.json kèm hit rate (gọi trên controller)"""
+    reports = load_worker_reports(ASSET_CACHE_REPORT)
+    if not reports:
+        return {}
+    merged = merge_numeric(reports)
+    merged["workers"] = len(reports)
+    lookups = merged.get("hits", 0) + merged.get("revalidated", 0) + merged.get("misses", 0)
+    merged["hit_rate"] = round((merged.get("hits", 0) + merged.get("revalidated", 0)) / lookups, 3) if lookups else 0.0
+    write_run_report(ASSET_CACHE_REPORT, merged)
+    return merged
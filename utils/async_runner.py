@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Async Runner - Event loop riêng cho mỗi worker để chạy nhiều page đồng thời
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from utils.browser_pool import get_worker_id
+
+
+class AsyncLoopThread:
+    """Chạy một asyncio event loop trên thread nền.
+
+    Playwright sync API giữ running loop của nó trên thread chính, nên code
+    async (Playwright async API, httpx.AsyncClient, ...) được đưa sang thread
+    này và test gọi vào qua run().
+    """
+
+    def __init__(self, name: str = "async-loop"):
+        self.logger = logging.getLogger(__name__)
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            raise RuntimeError(f"{self._name} has not been started")
+        return self._loop
+
+    def start(self) -> "AsyncLoopThread":
+        """Khởi động loop thread (idempotent)"""
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run():
+            asyncio.set_event_loop(self._loop)
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name=f"{self._name}-{get_worker_id()}", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Chạy coroutine trên loop thread và đợi kết quả"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run() cannot be called from the loop thread itself, await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self):
+        """Huỷ các task còn lại và dừng loop thread"""
+        if self._thread is None:
+            return
+
+        async def _cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            self.run(_cancel_pending(), timeout=10)
+        except Exception as e:
+            self.logger.warning(f"Error cancelling pending tasks on {self._name}: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=10)
+        self.loop.close()
+        self._thread = None
+        self._loop = None
+
+
+class AsyncBrowserRunner(AsyncLoopThread):
+    """Playwright async API trên loop thread của worker.
+
+    Một browser mỗi engine được dùng chung; mỗi scenario có context riêng nên
+    nhiều UI test độc lập chạy đồng thời trên cùng một process.
+    """
+
+    def __init__(self, launch_args: Callable[[str], Dict[str, Any]], concurrency: int = 8):
+        super().__init__(name="async-playwright")
+        self._launch_args = launch_args
+        self.concurrency = max(1, concurrency)
+        self._playwright: Optional[Playwright] = None
+        self._browsers: Dict[str, Browser] = {}
+        self._browser_locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"scenarios": 0, "failed_scenarios": 0, "batches": 0, "batch_time": 0.0, "max_in_flight": 0}
+
+    # =====================
+    # Coroutines (chạy trên loop thread)
+    # =====================
+    async def get_browser(self, engine: str = "chromium") -> Browser:
+        """Lấy (hoặc launch lần đầu) browser async cho engine"""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        lock = self._browser_locks.setdefault(engine, asyncio.Lock())
+        async with lock:
+            browser = self._browsers.get(engine)
+            if browser is None or not browser.is_connected():
+                start_time = time.time()
+                browser = await getattr(self._playwright, engine).launch(**self._launch_args(engine))
+                self._browsers[engine] = browser
+                self.logger.info(f"Launched async {engine} in {time.time() - start_time:.3f}s (worker {get_worker_id()})")
+        return browser
+
+    async def new_context(self, engine: str = "chromium", **context_args) -> BrowserContext:
+        """Tạo context mới trên browser async của engine"""
+        browser = await self.get_browser(engine)
+        return await browser.new_context(**context_args)
+
+    async def run_scenarios(self, scenarios: List[Callable[[Page], Awaitable[Any]]], engine: str = "chromium",
+                            context_args: Optional[Dict[str, Any]] = None,
+                            concurrency: Optional[int] = None) -> List[Any]:
+        """Chạy đồng thời các scenario, mỗi scenario một context + page riêng.
+
+        Trả về list kết quả theo thứ tự scenario; exception của scenario được
+        trả về trong list thay vì huỷ các scenario khác.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        in_flight = 0
+
+        async def _run_one(scenario):
+            nonlocal in_flight
+            async with semaphore:
+                in_flight += 1
+                self._stats["max_in_flight"] = max(self._stats["max_in_flight"], in_flight)
+                context = None
+                try:
+                    context = await self.new_context(engine, **(context_args or {}))
+                    page = await context.new_page()
+                    return await scenario(page)
+                finally:
+                    in_flight -= 1
+                    if context is not None:
+                        await context.close()
+
+        start_time = time.time()
+        results = await asyncio.gather(*[_run_one(scenario) for scenario in scenarios], return_exceptions=True)
+        self._stats["batches"] += 1
+        self._stats["batch_time"] += time.time() - start_time
+        self._stats["scenarios"] += len(scenarios)
+        self._stats["failed_scenarios"] += sum(1 for result in results if isinstance(result, BaseException))
+        return results
+
+    async def _close_browsers(self):
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing async browser: {e}")
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # =====================
+    # Sync helpers (gọi từ thread của test)
+    # =====================
+    def run_many(self, scenarios: List[Callable[[Page], Awaitable[Any]]], engine: str = "chromium",
+                 context_args: Optional[Dict[str, Any]] = None, concurrency: Optional[int] = None) -> List[Any]:
+        """Phiên bản sync của run_scenarios, raise lỗi đầu tiên nếu có scenario fail"""
+        results = self.run(self.run_scenarios(scenarios, engine, context_args, concurrency))
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            self.logger.error(f"{len(errors)}/{len(results)} async scenarios failed")
+            raise errors[0]
+        return results
+
+    def close(self):
+        """Đóng browsers, Playwright và loop thread"""
+        if self._loop is not None:
+            try:
+                self.run(self._close_browsers(), timeout=30)
+            except Exception as e:
+                self.logger.warning(f"Error stopping async Playwright: {e}")
+        self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê số scenario và mức song song đạt được"""
+        return dict(self._stats)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Auth State Cache - Đăng nhập một lần cho mỗi user và tái sử dụng storage_state
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Any, Dict, Optional
+
+from playwright.sync_api import Browser, BrowserContext
+
+from utils.browser_pool import get_worker_id
+from utils.helpers import get_test_users
+
+AUTH_STATE_DIR = ".auth"
+# Cookie phiên đăng nhập của SauceDemo
+SESSION_COOKIE = "session-username"
+
+
+def is_authenticated_as(context: BrowserContext, username: str) -> bool:
+    """Kiểm tra context đã có phiên đăng nhập của username chưa"""
+    try:
+        return any(
+            cookie["name"] == SESSION_COOKIE and cookie["value"] == username
+            for cookie in context.cookies()
+        )
+    except Exception:
+        return False
+
+
+class AuthStateCache:
+    """Cache storage_state đã đăng nhập cho từng user trong get_test_users.
+
+    State được ghi ra .auth/<username>.json với TTL để các worker và các
+    lần chạy sau dùng lại; mỗi worker chỉ đăng nhập qua UI khi file hết hạn.
+    """
+
+    def __init__(self, state_dir: str = AUTH_STATE_DIR, ttl_seconds: int = 600, min_cookie_lifetime: int = 60):
+        self.logger = logging.getLogger(__name__)
+        self.state_dir = state_dir
+        self.ttl_seconds = ttl_seconds
+        self.min_cookie_lifetime = min_cookie_lifetime
+        self._users = {user["username"]: user for user in get_test_users()}
+        self._failed_users = set()
+        self._stats = {"hits": 0, "logins": 0, "login_failures": 0, "login_time": 0.0}
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    def path_for(self, username: str) -> str:
+        """Đường dẫn file storage_state của user"""
+        return os.path.join(self.state_dir, f"{username}.json")
+
+    def get_state_path(self, browser: Browser, username: str) -> Optional[str]:
+        """Trả về file storage_state còn hạn của user, đăng nhập lại nếu cần.
+
+        Trả về None khi user không đăng nhập được (ví dụ locked_out_user).
+        """
+        if username not in self._users:
+            raise ValueError(f"Unknown test user '{username}', expected one of {', '.join(self._users)}")
+        if username in self._failed_users:
+            return None
+
+        path = self.path_for(username)
+        if self._is_fresh(path):
+            self._stats["hits"] += 1
+            return path
+
+        state = self._login(browser, self._users[username])
+        if state is None:
+            self._failed_users.add(username)
+            return None
+        self._write_state(path, state)
+        return path
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê cache hit và số lần đăng nhập thật"""
+        return dict(self._stats)
+
+    # =====================
+    # Helpers
+    # =====================
+    def _is_fresh(self, path: str) -> bool:
+        """File còn trong TTL và cookie phiên chưa sắp hết hạn"""
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return False
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        deadline = time.time() + self.min_cookie_lifetime
+        for cookie in state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            if expires != -1 and expires < deadline:
+                return False
+        return True
+
+    def _login(self, browser: Browser, user: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Đăng nhập qua UI trong một context tạm và lấy storage_state"""
+        # Import muộn để tránh vòng import pages <-> utils
+        from pages.auth.login_page import LoginPage
+
+        start_time = time.time()
+        context = browser.new_context()
+        try:
+            login_page = LoginPage(context.new_page())
+            login_page.goto()
+            login_page.login(user["username"], user["password"])
+            if not login_page.is_logged_in():
+                self.logger.warning(f"Could not log in as {user['username']}, context will start logged out")
+                self._stats["login_failures"] += 1
+                return None
+            state = context.storage_state()
+        finally:
+            context.close()
+
+        elapsed = time.time() - start_time
+        self._stats["logins"] += 1
+        self._stats["login_time"] += elapsed
+        self.logger.info(f"Cached auth state for {user['username']} in {elapsed:.3f}s (worker {get_worker_id()})")
+        return state
+
+    def _write_state(self, path: str, state: Dict[str, Any]):
+        """Ghi file nguyên tử để worker khác không đọc phải file dở dang"""
+        tmp_path = f"{path}.{get_worker_id()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
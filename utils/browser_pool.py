@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Quản lý browser theo engine cho mỗi xdist worker
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import greenlet
+from playwright.sync_api import Browser, Playwright, sync_playwright
+
+SUPPORTED_ENGINES = ("chromium", "firefox", "webkit")
+# Attribute nội bộ của Playwright sync API mà launch nền cần (kiểm tra bởi tests/test_browser_pool.py,
+# version Playwright được giới hạn trong requirements.txt)
+BACKGROUND_LAUNCH_ATTRS = ("_loop", "_dispatcher_fiber")
+
+
+def parse_engines(value: Optional[str]) -> List[str]:
+    """Parse giá trị --test-browser: 'chromium', 'firefox,webkit' hoặc 'all'"""
+    if not value:
+        return ["chromium"]
+    if value.strip().lower() == "all":
+        return list(SUPPORTED_ENGINES)
+
+    engines = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in SUPPORTED_ENGINES:
+            raise ValueError(f"Unsupported browser engine '{name}', expected one of {', '.join(SUPPORTED_ENGINES)}")
+        if name not in engines:
+            engines.append(name)
+    return engines or ["chromium"]
+
+
+def get_worker_id() -> str:
+    """Lấy id của xdist worker hiện tại ('master' khi chạy không song song)"""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def get_worker_count() -> int:
+    """Lấy tổng số xdist workers (1 khi chạy không song song)"""
+    try:
+        return max(1, int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1")))
+    except ValueError:
+        return 1
+
+
+def supports_background_launch(playwright: Any) -> bool:
+    """Playwright hiện tại còn các attribute nội bộ mà launch nền cần hay không"""
+    return all(getattr(playwright, name, None) is not None for name in BACKGROUND_LAUNCH_ATTRS)
+
+
+def build_launch_args(browser: str, headless: bool, mass_test: bool = False) -> Dict[str, Any]:
+    """Tạo tham số launch cho một browser engine"""
+    if browser == "chromium":
+        args = [
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-web-security",
+            "--disable-features=VizDisplayCompositor"
+        ]
+
+        # Add mass testing optimizations
+        if mass_test:
+            args.extend([
+                "--disable-images",  # Disable images for faster loading
+                "--disable-javascript",  # Disable JS if not needed
+                "--disable-plugins",
+                "--disable-extensions",
+                "--disable-background-timer-throttling",
+                "--disable-backgrounding-occluded-windows",
+                "--disable-renderer-backgrounding",
+                "--disable-field-trial-config",
+                "--disable-ipc-flooding-protection"
+            ])
+
+        return {
+            "headless": headless,
+            "args": args
+        }
+    elif browser == "firefox":
+        args = [
+            "--no-sandbox",
+            "--disable-dev-shm-usage"
+        ]
+
+        if mass_test:
+            args.extend([
+                "--disable-images",
+                "--disable-javascript"
+            ])
+
+        return {
+            "headless": headless,
+            "args": args
+        }
+    elif browser == "webkit":
+        args = [
+            "--no-sandbox",
+            "--disable-dev-shm-usage"
+        ]
+
+        if mass_test:
+            args.extend([
+                "--disable-images",
+                "--disable-javascript"
+            ])
+
+        return {
+            "headless": headless,
+            "args": args
+        }
+    else:
+        return {"headless": headless}
+
+
+@dataclass
+class _PendingLaunch:
+    """Một lần launch browser đang chạy nền"""
+    engine: str
+    started_at: float
+    fiber: Optional[greenlet.greenlet] = None
+    browser: Optional[Browser] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _EngineSlot:
+    """Các browser của một engine trong pool"""
+    engine: str
+    instances: int
+    browsers: List[Browser] = field(default_factory=list)
+    pending: List[_PendingLaunch] = field(default_factory=list)
+    next_index: int = 0
+
+
+class BrowserPool:
+    """Pool browser theo engine, sống suốt một xdist worker.
+
+    Playwright sync API gắn với một thread, nên browser kế tiếp được launch
+    trong một greenlet riêng trên cùng thread: request launch được gửi ngay,
+    và response được xử lý trong lúc test đang gọi các API Playwright khác.
+
+    Launch nền dựa vào attribute nội bộ của Playwright (_loop, _dispatcher_fiber);
+    nếu version Playwright không còn chúng, pool cảnh báo một lần, ghi
+    background_fallbacks vào stats và launch trực tiếp khi cần.
+
+    Engine có trong endpoints (browser server đang chạy sẵn) được connect qua
+    WebSocket thay vì launch; connect lỗi thì quay về launch local.
+    """
+
+    def __init__(self, engines: List[str], launch_args: Callable[[str], Dict[str, Any]],
+                 instances: Optional[Dict[str, int]] = None, prelaunch: bool = True,
+                 endpoints: Optional[Dict[str, str]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.engines = list(engines)
+        self._launch_args = launch_args
+        self._prelaunch = prelaunch
+        self._endpoints = dict(endpoints or {})
+        self._playwright: Optional[Playwright] = None
+        self._slots = {
+            engine: _EngineSlot(engine=engine, instances=max(1, (instances or {}).get(engine, 1)))
+            for engine in self.engines
+        }
+        self._stats = {"launches": 0, "background_launches": 0, "launch_time": 0.0, "acquires": 0,
+                       "connects": 0, "connect_failures": 0, "background_fallbacks": 0}
+
+    @classmethod
+    def from_optimizer(cls, engines: List[str], launch_args: Callable[[str], Dict[str, Any]],
+                       optimizer: Any = None, prelaunch: bool = True,
+                       endpoints: Optional[Dict[str, str]] = None) -> "BrowserPool":
+        """Tạo pool với số instance mỗi engine lấy từ PerformanceOptimizer.optimize_browser_pool.
+
+        Số instance mỗi worker = instances của engine // số worker. Với
+        browser_pool_size mặc định (3) kết quả luôn là 1 browser mỗi engine mỗi
+        worker; muốn N browser mỗi engine thì đặt browser_pool_size = 3 * N.
+        """
+        instances: Dict[str, int] = {}
+        if optimizer is not None:
+            worker_count = get_worker_count()
+            browser_config = optimizer.optimize_browser_pool(worker_count)
+            for engine in engines:
+                total = browser_config.get(engine, {}).get("instances", worker_count)
+                instances[engine] = max(1, total // worker_count)
+        return cls(engines, launch_args, instances=instances, prelaunch=prelaunch, endpoints=endpoints)
+
+    # =====================
+    # Lifecycle
+    # =====================
+    def start(self) -> "BrowserPool":
+        """Khởi động Playwright và launch sẵn browser cho các engine"""
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        for index, engine in enumerate(self.engines):
+            slot = self._slots[engine]
+            # Engine đầu tiên cần ngay cho test đầu tiên, các engine còn lại launch nền
+            if index == 0 or not self._prelaunch:
+                slot.browsers.append(self._launch(engine))
+            self._schedule_prelaunch(slot)
+        return self
+
+    def close(self):
+        """Đóng toàn bộ browser và dừng Playwright"""
+        for slot in self._slots.values():
+            self._collect_pending(slot, wait=True)
+            for browser in slot.browsers:
+                try:
+                    browser.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing {slot.engine} browser: {e}")
+            slot.browsers.clear()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+        self.logger.info(f"Browser pool closed: {self.get_stats()}")
+
+    @property
+    def playwright(self) -> Playwright:
+        if self._playwright is None:
+            raise RuntimeError("BrowserPool has not been started")
+        return self._playwright
+
+    # =====================
+    # Cấp phát browser
+    # =====================
+    def acquire(self, engine: str) -> Browser:
+        """Lấy một browser đang sống cho engine (round-robin giữa các instance)"""
+        if engine not in self._slots:
+            raise ValueError(f"Engine '{engine}' is not part of this pool ({', '.join(self.engines)})")
+        slot = self._slots[engine]
+        self._collect_pending(slot)
+        slot.browsers = [b for b in slot.browsers if b.is_connected()]
+
+        if not slot.browsers:
+            # Chưa có browser nào sẵn sàng: đợi launch nền nếu có, nếu không thì launch trực tiếp
+            self._collect_pending(slot, wait=bool(slot.pending))
+            if not slot.browsers:
+                slot.browsers.append(self._launch(engine))
+
+        self._schedule_prelaunch(slot)
+        browser = slot.browsers[slot.next_index % len(slot.browsers)]
+        slot.next_index += 1
+        self._stats["acquires"] += 1
+        return browser
+
+    def retire(self, browser: Browser, replace: bool = True):
+        """Đóng một browser; pool sẽ launch nền browser thay thế"""
+        for slot in self._slots.values():
+            if browser in slot.browsers:
+                slot.browsers.remove(browser)
+                if replace:
+                    self._schedule_prelaunch(slot)
+                break
+        try:
+            browser.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing retired browser: {e}")
+
+    @property
+    def remote_engines(self) -> List[str]:
+        """Engine đang dùng browser server (browser process không phải con của worker)"""
+        return [engine for engine in self.engines if self._endpoints.get(engine)]
+
+    def browsers(self, engine: Optional[str] = None) -> List[Browser]:
+        """Danh sách browser đang sống (theo engine nếu có chỉ định)"""
+        slots = [self._slots[engine]] if engine else list(self._slots.values())
+        return [browser for slot in slots for browser in slot.browsers]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê launch/acquire của pool"""
+        return {
+            **self._stats,
+            "worker": get_worker_id(),
+            "engines": {
+                engine: {"instances": slot.instances, "live": len(slot.browsers), "pending": len(slot.pending)}
+                for engine, slot in self._slots.items()
+            },
+        }
+
+    # =====================
+    # Launch helpers
+    # =====================
+    def _open_browser(self, engine: str) -> Browser:
+        """Connect tới browser server nếu có, nếu không thì launch local"""
+        browser_type = getattr(self.playwright, engine)
+        ws_endpoint = self._endpoints.get(engine)
+        if ws_endpoint:
+            try:
+                browser = browser_type.connect(ws_endpoint, timeout=5000)
+                self._stats["connects"] += 1
+                self.logger.info(f"Connected to {engine} browser server {ws_endpoint}")
+                return browser
+            except Exception as e:
+                # Server đã tắt: không thử lại cho các browser sau
+                self.logger.warning(f"Could not connect to {engine} browser server, launching locally: {e}")
+                self._stats["connect_failures"] += 1
+                self._endpoints.pop(engine, None)
+        return browser_type.launch(**self._launch_args(engine))
+
+    def _launch(self, engine: str) -> Browser:
+        start_time = time.time()
+        browser = self._open_browser(engine)
+        elapsed = time.time() - start_time
+        self._stats["launches"] += 1
+        self._stats["launch_time"] += elapsed
+        self.logger.info(f"{engine} ready in {elapsed:.3f}s (worker {get_worker_id()})")
+        return browser
+
+    def _schedule_prelaunch(self, slot: _EngineSlot):
+        """Launch nền cho tới khi engine đủ số instance"""
+        if not self._prelaunch:
+            return
+        while len(slot.browsers) + len(slot.pending) < slot.instances:
+            pending = self._launch_in_background(slot.engine)
+            if pending is None:
+                break
+            slot.pending.append(pending)
+
+    def _launch_in_background(self, engine: str) -> Optional[_PendingLaunch]:
+        if not supports_background_launch(self.playwright):
+            if not self._stats["background_fallbacks"]:
+                self.logger.warning(
+                    "Playwright sync API no longer exposes %s, background browser launches are disabled "
+                    "(browsers are launched on demand)", ", ".join(BACKGROUND_LAUNCH_ATTRS))
+            self._stats["background_fallbacks"] += 1
+            return None
+        loop = self.playwright._loop
+
+        caller = greenlet.getcurrent()
+        pending = _PendingLaunch(engine=engine, started_at=time.time())
+
+        def _run():
+            # Trả quyền điều khiển cho caller ngay khi request launch đã được gửi đi
+            loop.call_soon(caller.switch)
+            try:
+                pending.browser = self._open_browser(engine)
+            except BaseException as e:
+                pending.error = e
+
+        pending.fiber = greenlet.greenlet(_run, parent=caller)
+        pending.fiber.switch()
+        self._stats["background_launches"] += 1
+        return pending
+
+    def _collect_pending(self, slot: _EngineSlot, wait: bool = False):
+        """Chuyển các launch nền đã xong vào pool (hoặc đợi chúng nếu wait=True)"""
+        for pending in list(slot.pending):
+            if wait:
+                while not pending.fiber.dead:
+                    self.playwright._dispatcher_fiber.switch()
+            if not pending.fiber.dead:
+                continue
+            slot.pending.remove(pending)
+            elapsed = time.time() - pending.started_at
+            if pending.error is not None:
+                self.logger.warning(f"Background launch of {slot.engine} failed: {pending.error}")
+                continue
+            self._stats["launches"] += 1
+            self._stats["launch_time"] += elapsed
+            slot.browsers.append(pending.browser)
+            self.logger.info(f"Background {slot.engine} ready after {elapsed:.3f}s (worker {get_worker_id()})")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Browser Server - Giữ browser chạy sẵn (Playwright browser server) giữa các lần chạy pytest
+"""
+
+import os
+import json
+import time
+import signal
+import logging
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+from playwright._impl._driver import compute_driver_executable
+
+BROWSER_SERVER_DIR = ".browser_server"
+STATE_FILE = os.path.join(BROWSER_SERVER_DIR, "state.json")
+
+# Chạy bằng node đi kèm Playwright: launchServer rồi in ws endpoint, giữ process sống tới khi bị kill
+_LAUNCH_SERVER_SCRIPT = """
+const playwright = require(process.argv[1]);
+const engine = process.argv[2];
+const options = JSON.parse(process.argv[3]);
+(async () => {
+    const server = await playwright[engine].launchServer(options);
+    console.log('wsEndpoint=' + server.wsEndpoint());
+    const shutdown = async () => { await server.close(); process.exit(0); };
+    process.on('SIGTERM', shutdown);
+    process.on('SIGINT', shutdown);
+})().catch((error) => { console.error(error); process.exit(1); });
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def load_state() -> Dict[str, Any]:
+    """Đọc state của daemon ({engine: {ws_endpoint, pid, launch_args, started_at}})"""
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(state: Dict[str, Any]):
+    os.makedirs(BROWSER_SERVER_DIR, exist_ok=True)
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def _normalize_args(launch_args: Dict[str, Any]) -> Dict[str, Any]:
+    # So sánh qua JSON để tuple/list không làm lệch kết quả
+    return json.loads(json.dumps(launch_args, sort_keys=True))
+
+
+def load_server_endpoints(engines: List[str], launch_args: Callable[[str], Dict[str, Any]]) -> Dict[str, str]:
+    """ws endpoint của các engine có server đang sống và launch cùng tham số với run hiện tại"""
+    endpoints = {}
+    for engine, entry in load_state().items():
+        if engine not in engines or not _pid_alive(entry.get("pid", -1)):
+            continue
+        if entry.get("launch_args") != _normalize_args(launch_args(engine)):
+            logger.info(f"Browser server for {engine} was started with different launch args, launching locally")
+            continue
+        endpoints[engine] = entry["ws_endpoint"]
+    return endpoints
+
+
+def start_server(engine: str, launch_args: Dict[str, Any], timeout: float = 60) -> Dict[str, Any]:
+    """Khởi động một browser server cho engine (không làm gì nếu server đang sống)"""
+    state = load_state()
+    entry = state.get(engine)
+    normalized_args = _normalize_args(launch_args)
+    if entry and _pid_alive(entry["pid"]):
+        if entry.get("launch_args") == normalized_args:
+            return entry
+        stop_server(engine)
+
+    node_path, cli_path = compute_driver_executable()
+    package_index = os.path.join(os.path.dirname(cli_path), "index.js")
+    os.makedirs(BROWSER_SERVER_DIR, exist_ok=True)
+    log_path = os.path.join(BROWSER_SERVER_DIR, f"{engine}.log")
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        # Session riêng để server không bị dừng theo terminal/pytest đã khởi động nó
+        process = subprocess.Popen(
+            [node_path, "-e", _LAUNCH_SERVER_SCRIPT, package_index, engine, json.dumps(launch_args)],
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    deadline = time.time() + timeout
+    ws_endpoint = None
+    while time.time() < deadline and ws_endpoint is None:
+        if process.poll() is not None:
+            break
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("wsEndpoint="):
+                    ws_endpoint = line.strip().split("=", 1)[1]
+        if ws_endpoint is None:
+            time.sleep(0.1)
+
+    if ws_endpoint is None:
+        if process.poll() is None:
+            process.terminate()
+        with open(log_path, "r", encoding="utf-8") as f:
+            output = f.read().strip()
+        raise RuntimeError(f"Browser server for {engine} did not start: {output[-2000:]}")
+
+    entry = {
+        "ws_endpoint": ws_endpoint,
+        "pid": process.pid,
+        "launch_args": normalized_args,
+        "started_at": time.time(),
+    }
+    state = load_state()
+    state[engine] = entry
+    _write_state(state)
+    logger.info(f"Browser server for {engine} listening on {ws_endpoint} (pid {process.pid})")
+    return entry
+
+
+def stop_server(engine: str) -> bool:
+    """Dừng browser server của engine, trả về True nếu có server bị dừng"""
+    state = load_state()
+    entry = state.pop(engine, None)
+    _write_state(state)
+    if not entry or not _pid_alive(entry["pid"]):
+        return False
+    os.kill(entry["pid"], signal.SIGTERM)
+    deadline = time.time() + 10
+    while time.time() < deadline and _pid_alive(entry["pid"]):
+        time.sleep(0.1)
+    if _pid_alive(entry["pid"]):
+        os.kill(entry["pid"], signal.SIGKILL)
+    return True
+
+
+def server_status() -> Dict[str, Dict[str, Any]]:
+    """Trạng thái các server trong state file"""
+    return {
+        engine: {**entry, "alive": _pid_alive(entry.get("pid", -1))}
+        for engine, entry in load_state().items()
+    }
@@ -10,6 +10,8 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable
 from functools import lru_cache, wraps
+from utils.screenshot_service import screenshot_service
+from utils.retry_policy import RetryPolicy, retry_policy
 
 # Lớp chứa các hàm tiện ích dùng chung cho test automation
 class CommonFunctions:
@@ -139,21 +141,8 @@ class CommonFunctions:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             name = f"screenshot_{timestamp}.png"
         
-        path = os.path.join("screenshots", name)
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        
-        # Optimize screenshot for mass testing
-        if optimize:
-            # Take smaller screenshots for better performance
-            page.screenshot(path=path, full_page=False)
-        else:
-            page.screenshot(path=path, full_page=True)
-        
-        # Lưu metadata nếu có
-        if metadata:
-            metadata_path = path.replace('.png', '_metadata.json')
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+        # Optimize: chỉ chụp viewport; ảnh và metadata được ghi ở thread nền
+        path = screenshot_service.capture(page, name, full_page=not optimize, metadata=metadata)
         
         logging.info(f"Screenshot saved: {path}")
         return path
@@ -176,26 +165,16 @@ class CommonFunctions:
             return False
     
     @staticmethod
-    def retry_action(action_func: Callable, max_retries: int = 3, delay: float = 1.0, backoff_factor: float = 2.0):
-        """Thực hiện một action với enhanced retry mechanism"""
-        last_exception = None
-        
-        for attempt in range(max_retries):
-            try:
-                return action_func()
-            except Exception as e:
-                last_exception = e
-                if attempt < max_retries - 1:
-                    sleep_time = delay * (backoff_factor ** attempt)
-                    logging.warning(f"Action failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {sleep_time:.2f}s")
-                    time.sleep(sleep_time)
-                else:
-                    logging.error(f"Action failed after {max_retries} attempts: {e}")
-        
-        if last_exception:
-            raise last_exception
-        else:
-            raise Exception("Action failed with unknown error")
+    def retry_action(action_func: Callable, max_retries: int = 3, delay: float = 1.0,
+                     backoff_factor: float = 2.0, policy: Optional[RetryPolicy] = None):
+        """Thực hiện một action, retry theo loại lỗi với jittered backoff (từ delay giây) và ngân sách retry của test"""
+        policy = policy or retry_policy
+        try:
+            return policy.call(action_func, attempts=max_retries, description=getattr(action_func, "__name__", "Action"),
+                               base_delay=delay, backoff_factor=backoff_factor)
+        except Exception as e:
+            logging.error(f"Action failed after retry policy gave up: {e}")
+            raise
     
     @staticmethod
     def validate_response(response, expected_status: int = 200, expected_fields: Optional[List[str]] = None, 
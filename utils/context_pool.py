@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Context Pool - Tái sử dụng BrowserContext giữa các test thay vì new_context mỗi test
+"""
+
+import json
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from playwright.sync_api import Browser, BrowserContext
+
+# Script xoá storage của origin hiện tại (localStorage, sessionStorage, IndexedDB) và nạp lại các item seed (nếu có)
+_RESET_STORAGE_SCRIPT = """async (items) => {
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+    try {
+        const databases = indexedDB.databases ? await indexedDB.databases() : [];
+        await Promise.all(databases.map((db) => new Promise((resolve) => {
+            const request = indexedDB.deleteDatabase(db.name);
+            request.onsuccess = request.onerror = request.onblocked = () => resolve();
+        })));
+    } catch (e) {}
+    for (const item of items) {
+        window.localStorage.setItem(item.name, item.value);
+    }
+}"""
+
+
+@dataclass
+class _PooledContext:
+    """Một context trong pool cùng số lần đã sử dụng"""
+    context: BrowserContext
+    key: Tuple[int, str]
+    context_args: Dict[str, Any]
+    uses: int = 0
+    created_at: float = 0.0
+
+
+class ContextPool:
+    """Pool BrowserContext theo (browser, context args).
+
+    Giữa hai test, context được reset (cookies, storage, permissions, routes)
+    và dùng lại tối đa max_uses lần trước khi bị đóng. on_create được gọi
+    một lần cho mỗi context mới (ví dụ để bắt đầu tracing), on_reset sau
+    mỗi lần reset (ví dụ để biết các route đã bị xoá).
+    """
+
+    def __init__(self, max_uses: int = 20, max_idle: int = 2,
+                 on_create: Optional[Callable[[BrowserContext], None]] = None,
+                 on_reset: Optional[Callable[[BrowserContext], None]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+        self.on_create = on_create
+        self.on_reset = on_reset
+        self._idle: Dict[Tuple[int, str], List[_PooledContext]] = {}
+        self._leased: Dict[int, _PooledContext] = {}
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "resets": 0,
+            "closed": 0,
+            "reset_failures": 0,
+            "create_time": 0.0,
+            "reset_time": 0.0,
+            "close_time": 0.0,
+        }
+
+    @staticmethod
+    def _make_key(browser: Browser, context_args: Dict[str, Any]) -> Tuple[int, str]:
+        return id(browser), json.dumps(context_args, sort_keys=True, default=str)
+
+    # =====================
+    # Lease / release
+    # =====================
+    def acquire(self, browser: Browser, context_args: Optional[Dict[str, Any]] = None) -> BrowserContext:
+        """Lấy context đã reset từ pool, hoặc tạo mới nếu pool trống"""
+        context_args = dict(context_args or {})
+        key = self._make_key(browser, context_args)
+        idle = self._idle.get(key, [])
+
+        while idle:
+            entry = idle.pop()
+            if entry.context.browser is not None and entry.context.browser.is_connected():
+                entry.uses += 1
+                self._leased[id(entry.context)] = entry
+                self._stats["reused"] += 1
+                return entry.context
+            self._stats["closed"] += 1
+
+        start_time = time.time()
+        context = browser.new_context(**context_args)
+        if self.on_create is not None:
+            self.on_create(context)
+        self._stats["create_time"] += time.time() - start_time
+        self._stats["created"] += 1
+
+        entry = _PooledContext(context=context, key=key, context_args=context_args, uses=1, created_at=time.time())
+        self._leased[id(context)] = entry
+        return context
+
+    def release(self, context: BrowserContext, discard: bool = False):
+        """Trả context về pool sau khi reset; đóng nếu hết lượt dùng hoặc reset lỗi"""
+        entry = self._leased.pop(id(context), None)
+        if entry is None:
+            self._close(context)
+            return
+
+        if discard or (self.max_uses and entry.uses >= self.max_uses):
+            self._close(context)
+            return
+
+        start_time = time.time()
+        try:
+            self._reset(entry)
+        except Exception as e:
+            self.logger.warning(f"Context reset failed, closing context: {e}")
+            self._stats["reset_failures"] += 1
+            self._close(context)
+            return
+        finally:
+            self._stats["reset_time"] += time.time() - start_time
+        self._stats["resets"] += 1
+
+        idle = self._idle.setdefault(entry.key, [])
+        if len(idle) >= self.max_idle:
+            self._close(context)
+            return
+        idle.append(entry)
+
+    def discard_browser(self, browser: Browser):
+        """Đóng mọi context idle thuộc về một browser (khi browser bị recycle)"""
+        for key in [key for key in self._idle if key[0] == id(browser)]:
+            for entry in self._idle.pop(key):
+                self._close(entry.context)
+
+    def close_all(self):
+        """Đóng toàn bộ context còn trong pool"""
+        for entries in self._idle.values():
+            for entry in entries:
+                self._close(entry.context)
+        self._idle.clear()
+        for entry in list(self._leased.values()):
+            self._close(entry.context)
+        self._leased.clear()
+
+    # =====================
+    # Helpers
+    # =====================
+    def _reset(self, entry: _PooledContext):
+        """Xoá state của test trước: pages, storage, cookies, permissions, routes.
+
+        Nếu context được tạo với storage_state (context đã đăng nhập),
+        cookies và localStorage của state đó được nạp lại sau khi xoá.
+        """
+        context = entry.context
+        for page in list(context.pages):
+            page.close()
+        seed_state = self._load_storage_state(entry.context_args.get("storage_state"))
+        self._reset_origins(context, seed_state.get("origins", []))
+        context.clear_cookies()
+        if seed_state.get("cookies"):
+            context.add_cookies(seed_state["cookies"])
+        context.clear_permissions()
+        context.unroute_all(behavior="ignoreErrors")
+        context.set_offline(False)
+        context.set_extra_http_headers(entry.context_args.get("extra_http_headers") or {})
+        if self.on_reset is not None:
+            self.on_reset(context)
+
+    @staticmethod
+    def _load_storage_state(storage_state: Any) -> Dict[str, Any]:
+        if not storage_state:
+            return {}
+        if isinstance(storage_state, dict):
+            return storage_state
+        with open(storage_state, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _reset_origins(self, context: BrowserContext, seed_origins: List[Dict[str, Any]]):
+        """Xoá localStorage và IndexedDB của mọi origin test trước đã ghi, rồi nạp lại localStorage của seed_origins.
+
+        sessionStorage gắn với page nên đã mất khi các page của test bị đóng.
+        IndexedDB của seed không được nạp lại (auth cache chỉ lưu cookies/localStorage).
+        """
+        def _items(origins):
+            return {origin["origin"]: (sorted((item["name"], item["value"]) for item in origin.get("localStorage", [])),
+                                       sorted(db.get("name", "") for db in origin.get("indexedDB", [])))
+                    for origin in origins}
+
+        seed = _items(seed_origins)
+        current = _items(self._storage_origins(context))
+        origins = [origin for origin in dict.fromkeys(list(current) + list(seed))
+                   if current.get(origin, ([], [])) != seed.get(origin, ([], []))]
+        if not origins:
+            return
+        page = context.new_page()
+        try:
+            # Không tải trang thật, chỉ cần một document thuộc origin để thao tác storage
+            page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=""))
+            for origin in origins:
+                page.goto(origin)
+                items = [{"name": name, "value": value} for name, value in seed.get(origin, ([], []))[0]]
+                page.evaluate(_RESET_STORAGE_SCRIPT, items)
+        finally:
+            page.close()
+            # Context có record_video_dir thì page reset cũng ghi video: xoá để không để lại video mồ côi
+            if page.video is not None:
+                try:
+                    page.video.delete()
+                except Exception as e:
+                    self.logger.debug(f"Could not delete reset page video: {e}")
+
+    @staticmethod
+    def _storage_origins(context: BrowserContext) -> List[Dict[str, Any]]:
+        # storage_state(indexed_db=True) có từ Playwright 1.51; version cũ hơn chỉ trả localStorage
+        try:
+            return context.storage_state(indexed_db=True).get("origins", [])
+        except TypeError:
+            return context.storage_state().get("origins", [])
+
+    def _close(self, context: BrowserContext):
+        start_time = time.time()
+        try:
+            context.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing context: {e}")
+        self._stats["close_time"] += time.time() - start_time
+        self._stats["closed"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê create/reset của pool"""
+        return {
+            **self._stats,
+            "idle": sum(len(entries) for entries in self._idle.values()),
+            "leased": len(self._leased),
+        }
+
+    def summary(self) -> str:
+        """Tóm tắt thời gian create/reset trung bình để log"""
+        avg_create = self._stats["create_time"] / max(self._stats["created"], 1)
+        avg_reset = self._stats["reset_time"] / max(self._stats["resets"], 1)
+        return (f"created={self._stats['created']} reused={self._stats['reused']} "
+                f"avg_create={avg_create * 1000:.1f}ms avg_reset={avg_reset * 1000:.1f}ms")
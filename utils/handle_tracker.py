@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Handle Tracker - Quản lý vòng đời ElementHandle/JSHandle của page objects và báo cáo handle bị rò rỉ theo test
+"""
+
+import inspect
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+HANDLE_REPORT = "handles"
+
+# Stack scope của action đang chạy (tuple bất biến để mỗi asyncio task/thread có stack riêng)
+_action_scopes: ContextVar[Tuple[List[Any], ...]] = ContextVar("action_scopes", default=())
+
+
+def _is_handle(value: Any) -> bool:
+    return hasattr(value, "dispose") and hasattr(value, "as_element")
+
+
+def _returned_handles(result: Any) -> List[Any]:
+    # Handle mà action trả về cho caller (một handle hoặc list/tuple handle) thì không dispose
+    if _is_handle(result):
+        return [result]
+    if isinstance(result, (list, tuple)):
+        return [item for item in result if _is_handle(item)]
+    return []
+
+
+class HandleTracker:
+    """Theo dõi handle mà page object tạo ra và dispose chúng đúng lúc.
+
+    Handle tạo trong một action (method có BasePage.performance_monitor) được
+    dispose khi action kết thúc, trừ handle mà action trả về: những handle đó
+    chuyển lên action cha hoặc lên scope của test. Handle còn sống khi test
+    kết thúc được dispose ở teardown (trước khi page/context bị đóng) và được
+    ghi vào báo cáo rò rỉ theo test.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._test_id: Optional[str] = None
+        self._test_handles: List[Any] = []
+        self._live = 0
+        self._test_usage = self._new_usage()
+        self._stats: Dict[str, Any] = {
+            "acquired": 0,
+            "disposed": 0,
+            "disposed_at_action_end": 0,
+            "disposed_at_teardown": 0,
+            "leaking_tests": 0,
+            "tests": {},
+        }
+
+    @staticmethod
+    def _new_usage() -> Dict[str, int]:
+        return {"acquired": 0, "peak_live": 0, "live_at_teardown": 0}
+
+    @property
+    def live(self) -> int:
+        """Số handle đang sống (chưa dispose) của worker"""
+        return self._live
+
+    # =====================
+    # Đăng ký handle
+    # =====================
+    def track(self, handle: Any) -> Any:
+        """Đăng ký handle vào action đang chạy (hoặc vào test nếu gọi ngoài action); trả về chính handle"""
+        if handle is None:
+            return None
+        scopes = _action_scopes.get()
+        (scopes[-1] if scopes else self._test_handles).append(handle)
+        with self._lock:
+            self._live += 1
+            self._stats["acquired"] += 1
+            self._test_usage["acquired"] += 1
+            self._test_usage["peak_live"] = max(self._test_usage["peak_live"], self._live)
+        return handle
+
+    def track_all(self, handles: List[Any]) -> List[Any]:
+        for handle in handles:
+            self.track(handle)
+        return handles
+
+    # =====================
+    # Scope theo action
+    # =====================
+    def open_scope(self):
+        """Mở scope cho một action; trả về token để close_scope"""
+        return _action_scopes.set(_action_scopes.get() + ([],))
+
+    def close_scope(self, token, result: Any = None):
+        """Đóng scope (sync API): dispose handle của action trừ handle được trả về"""
+        handles = self._pop_scope(token, result)
+        if handles:
+            self._dispose(handles, "disposed_at_action_end")
+
+    async def close_scope_async(self, token, result: Any = None):
+        """Đóng scope (async API)"""
+        handles = self._pop_scope(token, result)
+        if handles:
+            await self._dispose_async(handles, "disposed_at_action_end")
+
+    def _pop_scope(self, token, result: Any) -> List[Any]:
+        handles = _action_scopes.get()[-1]
+        _action_scopes.reset(token)
+        if not handles:
+            return handles
+        kept = {id(handle) for handle in _returned_handles(result)}
+        if kept:
+            parent = _action_scopes.get()
+            (parent[-1] if parent else self._test_handles).extend(h for h in handles if id(h) in kept)
+            handles = [h for h in handles if id(h) not in kept]
+        return handles
+
+    # =====================
+    # Scope theo test
+    # =====================
+    def begin_test(self, test_id: str):
+        with self._lock:
+            self._test_id = test_id
+            self._test_usage = self._new_usage()
+
+    def has_async_handles(self) -> bool:
+        return any(inspect.iscoroutinefunction(handle.dispose) for handle in self._test_handles)
+
+    async def dispose_test_handles_async(self):
+        """Dispose handle async còn sống của test (chạy trên event loop của async_runner trước teardown)"""
+        handles = [h for h in self._test_handles if inspect.iscoroutinefunction(h.dispose)]
+        self._test_handles = [h for h in self._test_handles if not inspect.iscoroutinefunction(h.dispose)]
+        with self._lock:
+            self._test_usage["live_at_teardown"] += len(handles)
+        await self._dispose_async(handles, "disposed_at_teardown")
+
+    def end_test(self) -> Dict[str, int]:
+        """Dispose handle (sync) còn sống của test và ghi nhận rò rỉ; trả về thống kê của test"""
+        handles, self._test_handles = self._test_handles, []
+        sync_handles = [h for h in handles if not inspect.iscoroutinefunction(h.dispose)]
+        with self._lock:
+            # Handle async chưa dispose được ở đây: page đóng ở teardown sẽ giải phóng chúng
+            self._live -= len(handles) - len(sync_handles)
+            self._test_usage["live_at_teardown"] += len(handles)
+        self._dispose(sync_handles, "disposed_at_teardown")
+        with self._lock:
+            usage, test_id = dict(self._test_usage), self._test_id
+            if test_id and usage["acquired"]:
+                self._stats["tests"][test_id] = usage
+                if usage["live_at_teardown"]:
+                    self._stats["leaking_tests"] += 1
+            self._test_id = None
+            self._test_usage = self._new_usage()
+        if usage["live_at_teardown"]:
+            self.logger.warning("%s left %s handle(s) alive until teardown", test_id or "Test", usage["live_at_teardown"])
+        return usage
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Báo cáo của worker: số handle tạo/dispose và thống kê rò rỉ theo test"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["tests"] = {test_id: dict(usage) for test_id, usage in self._stats["tests"].items()}
+            stats["live"] = self._live
+        return stats
+
+    # =====================
+    # Dispose
+    # =====================
+    def _dispose(self, handles: List[Any], reason: str):
+        for handle in handles:
+            try:
+                handle.dispose()
+            except Exception as e:
+                # Page/context đã đóng thì handle cũng đã mất phía browser
+                self.logger.debug("Dispose handle failed: %s", e)
+        self._count_disposed(len(handles), reason)
+
+    async def _dispose_async(self, handles: List[Any], reason: str):
+        for handle in handles:
+            try:
+                await handle.dispose()
+            except Exception as e:
+                self.logger.debug("Dispose handle failed: %s", e)
+        self._count_disposed(len(handles), reason)
+
+    def _count_disposed(self, count: int, reason: str):
+        if not count:
+            return
+        with self._lock:
+            self._live -= count
+            self._stats["disposed"] += count
+            self._stats[reason] += count
+
+
+# Global instance, dùng bởi BasePage/AsyncBasePage và hook teardown trong conftest
+handle_tracker = HandleTracker()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+HAR Network - Ghi lại (record) và phát lại (replay) network của UI tests bằng HAR
+"""
+
+import os
+import json
+import glob
+import shutil
+import logging
+import weakref
+import itertools
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from utils.artifact_retention import safe_artifact_name
+from utils.browser_pool import get_worker_id
+
+NETWORK_MODES = ("live", "record", "replay")
+HAR_DIR = "hars"
+# Record mode: mỗi context ghi một file riêng, gộp thành hars/<entry URL>.har khi kết thúc run
+RECORDING_DIR = ".recording"
+
+
+def har_path_for(url: str, har_dir: str = HAR_DIR) -> str:
+    """File HAR của một entry URL (ví dụ hars/www.saucedemo.com_inventory.html.har)"""
+    parsed = urlparse(url)
+    path = parsed.path.strip("/") or "index"
+    return os.path.join(har_dir, f"{safe_artifact_name(f'{parsed.netloc}_{path}')}.har")
+
+
+class HarNetwork:
+    """Gắn HAR vào page mỗi khi page object điều hướng tới entry URL của nó.
+
+    - live: không làm gì, request đi thẳng ra network.
+    - record: mỗi page ghi vào file riêng hars/.recording/<entry URL>/<worker>_<n>.har
+      (file được ghi khi context đóng); merge_recordings() gộp các file này thành
+      hars/<entry URL>.har khi kết thúc run, nên không test/worker nào ghi đè lên HAR
+      của test khác.
+    - replay: phục vụ response từ HAR, request không có trong HAR bị abort
+      nên test chạy được trên máy offline.
+    """
+
+    def __init__(self, mode: str = "live", har_dir: str = HAR_DIR):
+        self.logger = logging.getLogger(__name__)
+        self._pages = weakref.WeakKeyDictionary()
+        self._recording_ids = itertools.count()
+        self._stats = {"recorded": 0, "replayed": 0, "aborted_requests": 0}
+        self.configure(mode, har_dir)
+
+    def configure(self, mode: str, har_dir: str = HAR_DIR):
+        """Đặt mode và thư mục HAR (gọi từ pytest_configure)"""
+        if mode not in NETWORK_MODES:
+            raise ValueError(f"Unknown network mode '{mode}', expected one of {', '.join(NETWORK_MODES)}")
+        self.mode = mode
+        self.har_dir = har_dir
+        if mode == "record":
+            os.makedirs(self.har_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "live"
+
+    def route_options(self, url: str) -> Optional[Dict[str, Any]]:
+        """Tham số route_from_har cho entry URL, None khi chạy live"""
+        if not self.enabled:
+            return None
+        path = har_path_for(url, self.har_dir)
+        if self.mode == "record":
+            return {"har": self._recording_path(path), "update": True, "update_content": "embed",
+                    "update_mode": "minimal"}
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No HAR recorded for {url} ({path}), run once with --network=record")
+        # Request không khớp HAR này có thể khớp HAR của entry URL khác đã gắn vào page
+        return {"har": path, "not_found": "fallback"}
+
+    def attach(self, page, url: str):
+        """Gắn HAR của entry URL vào page (sync API), mỗi HAR chỉ gắn một lần cho mỗi page"""
+        options = self._new_route_options(page, url)
+        if options is None:
+            return
+        if self.mode == "replay" and not self._pages[page]:
+            page.route("**/*", self._abort_unrecorded)
+        page.route_from_har(**options)
+        self._pages[page].add(har_path_for(url, self.har_dir))
+
+    async def attach_async(self, page, url: str):
+        """Giống attach() cho page của Playwright async API"""
+        options = self._new_route_options(page, url)
+        if options is None:
+            return
+        if self.mode == "replay" and not self._pages[page]:
+            await page.route("**/*", self._abort_unrecorded_async)
+        await page.route_from_har(**options)
+        self._pages[page].add(har_path_for(url, self.har_dir))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê số HAR đã record/replay và số request bị chặn khi replay"""
+        return dict(self._stats)
+
+    # =====================
+    # Helpers
+    # =====================
+    def _new_route_options(self, page, url: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        attached = self._pages.setdefault(page, set())
+        if har_path_for(url, self.har_dir) in attached:
+            return None
+        options = self.route_options(url)
+        self._stats["recorded" if self.mode == "record" else "replayed"] += 1
+        return options
+
+    def _recording_path(self, har_path: str) -> str:
+        directory = os.path.join(self.har_dir, RECORDING_DIR, os.path.splitext(os.path.basename(har_path))[0])
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{get_worker_id()}_{os.getpid()}_{next(self._recording_ids)}.har")
+
+    def _log_unrecorded(self, route):
+        # Route đăng ký đầu tiên nên chỉ chạy khi không HAR nào của page khớp
+        self._stats["aborted_requests"] += 1
+        self.logger.warning(f"Not in HAR, aborted: {route.request.method} {route.request.url}")
+
+    def _abort_unrecorded(self, route):
+        self._log_unrecorded(route)
+        route.abort("internetdisconnected")
+
+    async def _abort_unrecorded_async(self, route):
+        self._log_unrecorded(route)
+        await route.abort("internetdisconnected")
+
+
+def clear_recordings(har_dir: str = HAR_DIR):
+    """Xoá file record dở của lần chạy trước (gọi trên controller khi bắt đầu)"""
+    shutil.rmtree(os.path.join(har_dir, RECORDING_DIR), ignore_errors=True)
+
+
+def merge_recordings(har_dir: str = HAR_DIR) -> Dict[str, int]:
+    """Gộp các file record của mọi worker/test thành hars/<entry URL>.har; trả về số entry mỗi HAR.
+
+    Request trùng (method, URL, body) giữ bản ghi đầu tiên. Gọi trên controller
+    sau khi mọi context đã đóng.
+    """
+    logger = logging.getLogger(__name__)
+    recording_root = os.path.join(har_dir, RECORDING_DIR)
+    merged: Dict[str, int] = {}
+    for directory in sorted(glob.glob(os.path.join(recording_root, "*"))):
+        log: Optional[Dict[str, Any]] = None
+        entries, pages, seen = [], [], set()
+        for path in sorted(glob.glob(os.path.join(directory, "*.har"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    part = json.load(f)["log"]
+            except Exception as e:
+                logger.warning(f"Could not read recorded HAR {path}: {e}")
+                continue
+            log = log or part
+            pages.extend(part.get("pages", []))
+            for entry in part.get("entries", []):
+                request = entry.get("request", {})
+                key = (request.get("method"), request.get("url"), (request.get("postData") or {}).get("text"))
+                if key not in seen:
+                    seen.add(key)
+                    entries.append(entry)
+        if log is None:
+            continue
+        har_path = os.path.join(har_dir, f"{os.path.basename(directory)}.har")
+        with open(har_path, "w", encoding="utf-8") as f:
+            json.dump({"log": {**log, "pages": pages, "entries": entries}}, f, ensure_ascii=False)
+        merged[har_path] = len(entries)
+        logger.info(f"HAR recorded: {har_path} ({len(entries)} requests)")
+    shutil.rmtree(recording_root, ignore_errors=True)
+    return merged
+
+
+# Global instance, mode được set bởi pytest_configure (--network)
+har_network = HarNetwork()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Logging Pipeline - Log qua queue tới file riêng của từng worker, ring buffer theo test, gộp log khi kết thúc
+"""
+
+import os
+import re
+import copy
+import glob
+import heapq
+import queue
+import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.browser_pool import get_worker_id
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+WORKER_LOG_DIR = os.path.join("logs", "workers")
+MERGED_LOG_FILE = "test.log"
+# Logger của framework: chỉ những logger này ghi DEBUG vào ring buffer (thư viện như httpx, asyncio giữ level root)
+FRAMEWORK_LOGGERS = ("utils", "pages", "api_clients", "test_data", "tests", "conftest")
+# Dòng bắt đầu một record mới (các dòng còn lại là traceback/multiline message)
+_RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - ")
+
+
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler không format trên thread gọi log; listener format khi ghi file"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Queue trong cùng process nên không cần pickle: giữ nguyên msg/args để format muộn
+        return copy.copy(record)
+
+
+class TestLogBuffer(logging.Handler):
+    """Ring buffer các LogRecord của test đang chạy; chỉ format khi test fail"""
+
+    def __init__(self, capacity: int = 500, level: int = logging.DEBUG):
+        super().__init__(level)
+        self.records: deque = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+    def clear(self):
+        self.records.clear()
+
+    def render(self) -> str:
+        return "\n".join(self.format(record) for record in list(self.records))
+
+
+class LoggingPipeline:
+    """Pipeline logging của một process pytest (controller hoặc xdist worker).
+
+    Root logger chỉ có hai handler rẻ: QueueHandler (đẩy record sang thread
+    listener ghi logs/workers/test.<worker>.log và console) và ring buffer của
+    test hiện tại. Root giữ level của file log nên log DEBUG của thư viện bị
+    loại trước khi tạo record; chỉ các logger của framework (FRAMEWORK_LOGGERS)
+    được hạ xuống buffer_level để ring buffer có DEBUG của framework. Cuối run,
+    controller gộp file của các worker theo thời gian vào test.log.
+    """
+
+    def __init__(self):
+        self.listener: Optional[QueueListener] = None
+        self.buffer: Optional[TestLogBuffer] = None
+        self._handlers: List[logging.Handler] = []
+        self._logger_levels: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self.listener is not None
+
+    def start(self, level: int = logging.INFO, buffer_level: int = logging.DEBUG, buffer_size: int = 500,
+              console: bool = True, log_dir: str = WORKER_LOG_DIR,
+              framework_loggers: Tuple[str, ...] = FRAMEWORK_LOGGERS) -> str:
+        """Cài pipeline cho process hiện tại; trả về đường dẫn file log của worker"""
+        with self._lock:
+            if self.started:
+                return self.worker_log_path(log_dir)
+            os.makedirs(log_dir, exist_ok=True)
+            path = self.worker_log_path(log_dir)
+            formatter = logging.Formatter(LOG_FORMAT)
+            file_handler = logging.FileHandler(path, mode="w", encoding="utf-8")
+            file_handler.setLevel(level)
+            file_handler.setFormatter(formatter)
+            targets: List[logging.Handler] = [file_handler]
+            if console:
+                stream_handler = logging.StreamHandler()
+                stream_handler.setLevel(level)
+                stream_handler.setFormatter(formatter)
+                targets.append(stream_handler)
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self.listener = QueueListener(log_queue, *targets, respect_handler_level=True)
+            self.listener.start()
+            queue_handler = _LazyQueueHandler(log_queue)
+            queue_handler.setLevel(level)
+            self.buffer = TestLogBuffer(buffer_size, buffer_level)
+
+            root = logging.getLogger()
+            root.setLevel(level)
+            if buffer_size and buffer_level < level:
+                for name in framework_loggers:
+                    logger = logging.getLogger(name)
+                    self._logger_levels[name] = logger.level
+                    logger.setLevel(buffer_level)
+            self._handlers = [queue_handler] + ([self.buffer] if buffer_size else [])
+            for handler in self._handlers:
+                root.addHandler(handler)
+            return path
+
+    def stop(self):
+        """Gỡ handler và ghi nốt các record còn trong queue"""
+        with self._lock:
+            if not self.started:
+                return
+            root = logging.getLogger()
+            for handler in self._handlers:
+                root.removeHandler(handler)
+            for name, logger_level in self._logger_levels.items():
+                logging.getLogger(name).setLevel(logger_level)
+            self._logger_levels = {}
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+            self._handlers = []
+
+    # =====================
+    # Ring buffer theo test
+    # =====================
+    def begin_test(self):
+        if self.buffer is not None:
+            self.buffer.clear()
+
+    def test_log(self) -> str:
+        """Log (đã format) của test hiện tại, dùng khi test fail"""
+        return self.buffer.render() if self.buffer is not None else ""
+
+    # =====================
+    # File theo worker
+    # =====================
+    @staticmethod
+    def worker_log_path(log_dir: str = WORKER_LOG_DIR, worker_id: Optional[str] = None) -> str:
+        return os.path.join(log_dir, f"test.{worker_id or get_worker_id()}.log")
+
+    @staticmethod
+    def clear_worker_logs(log_dir: str = WORKER_LOG_DIR):
+        """Xoá log worker của lần chạy trước (gọi trên controller khi bắt đầu)"""
+        for path in glob.glob(os.path.join(log_dir, "test.*.log")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def merge_worker_logs(output: str = MERGED_LOG_FILE, log_dir: str = WORKER_LOG_DIR) -> int:
+        """Gộp log của mọi worker theo timestamp vào một file; trả về số record"""
+        paths = sorted(glob.glob(os.path.join(log_dir, "test.*.log")))
+        if not paths:
+            return 0
+        files = [open(path, "r", encoding="utf-8", errors="replace") for path in paths]
+        count = 0
+        try:
+            with open(output, "w", encoding="utf-8") as out:
+                for _, _, record in heapq.merge(*(_read_records(f, i) for i, f in enumerate(files))):
+                    out.write(record)
+                    count += 1
+        finally:
+            for f in files:
+                f.close()
+        return count
+
+
+def _read_records(lines, file_index: int) -> Iterator[Tuple[str, int, str]]:
+    """Đọc file log thành (timestamp, file_index, record nhiều dòng), giữ thứ tự trong file"""
+    current: List[str] = []
+    for line in lines:
+        if _RECORD_START.match(line) and current:
+            yield current[0][:23], file_index, "".join(current)
+            current = []
+        current.append(line)
+    if current:
+        yield current[0][:23], file_index, "".join(current)
+
+
+# Global instance, khởi động trong pytest_configure
+logging_pipeline = LoggingPipeline()
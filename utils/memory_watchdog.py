@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Memory Watchdog - Giữ RSS của browser trong mỗi worker dưới ngân sách bằng cách recycle context/browser
+"""
+
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from utils.browser_pool import BrowserPool, get_worker_count, get_worker_id
+from utils.context_pool import ContextPool
+
+MB = 1024 * 1024
+
+
+def process_tree_rss(pid: Optional[int] = None) -> int:
+    """Tổng RSS (bytes) của các process con của worker (Playwright driver + browsers)"""
+    try:
+        children = psutil.Process(pid or os.getpid()).children(recursive=True)
+    except psutil.Error:
+        return 0
+    total = 0
+    for child in children:
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+def memory_budget_from_optimizer(optimizer: Any = None, worker_count: Optional[int] = None) -> int:
+    """Ngân sách RSS mỗi worker: memory_limit * tổng RAM / số worker"""
+    memory_limit = 0.8
+    if optimizer is not None:
+        memory_limit = optimizer.optimization_config.get("memory_limit", memory_limit)
+    workers = worker_count or get_worker_count()
+    return int(psutil.virtual_memory().total * memory_limit / workers)
+
+
+class MemoryWatchdog:
+    """Lấy mẫu RSS của browser process tree giữa các test và recycle khi vượt ngân sách.
+
+    Bước 1: đóng các context idle trong context pool (rẻ, không mất browser).
+    Bước 2: nếu vẫn vượt, retire browser cũ nhất; BrowserPool launch nền browser thay thế.
+    Chỉ chạy giữa các test nên không test nào bị fail vì recycle.
+
+    Khi pool connect tới browser server (scripts/browser_server.py), browser là
+    con của server chứ không phải của worker: RSS đo được chỉ là driver và
+    retire() chỉ ngắt kết nối, nên watchdog tự tắt và cảnh báo.
+    """
+
+    def __init__(self, browser_pool: BrowserPool, context_pool: ContextPool,
+                 budget_bytes: int, interval: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+        self.browser_pool = browser_pool
+        self.context_pool = context_pool
+        self.budget_bytes = budget_bytes
+        self.interval = interval
+        self._last_check = 0.0
+        self._stats = {
+            "samples": 0,
+            "peak_rss_mb": 0.0,
+            "context_rotations": 0,
+            "browser_recycles": 0,
+            "sample_time": 0.0,
+        }
+        self._events: List[Dict[str, Any]] = []
+        self.remote_engines = browser_pool.remote_engines
+        if self.budget_bytes > 0 and self.remote_engines:
+            self.logger.warning(f"Memory watchdog disabled: {', '.join(self.remote_engines)} run on a browser server, "
+                                f"whose browsers are not children of this worker (use --no-browser-server to enable it)")
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0 and not self.remote_engines
+
+    def sample(self) -> int:
+        """Đo RSS hiện tại của process tree"""
+        start_time = time.time()
+        rss = process_tree_rss()
+        self._stats["samples"] += 1
+        self._stats["sample_time"] += time.time() - start_time
+        self._stats["peak_rss_mb"] = max(self._stats["peak_rss_mb"], round(rss / MB, 1))
+        return rss
+
+    def check(self, force: bool = False):
+        """Gọi giữa hai test: recycle context rồi tới browser cho tới khi RSS dưới ngân sách"""
+        if not self.enabled or (not force and time.time() - self._last_check < self.interval):
+            return
+        self._last_check = time.time()
+        rss = self.sample()
+        if rss <= self.budget_bytes:
+            return
+
+        before = rss
+        for browser in self.browser_pool.browsers():
+            self.context_pool.discard_browser(browser)
+        rss = self.sample()
+        self._stats["context_rotations"] += 1
+        self._record("rotate_contexts", before, rss)
+
+        # Browser cũ nhất đứng đầu danh sách
+        for browser in list(self.browser_pool.browsers()):
+            if rss <= self.budget_bytes:
+                break
+            before = rss
+            self.context_pool.discard_browser(browser)
+            self.browser_pool.retire(browser, replace=True)
+            rss = self.sample()
+            self._stats["browser_recycles"] += 1
+            self._record("recycle_browser", before, rss)
+            if rss >= before:
+                # Recycle không giảm được RSS (ngân sách thấp hơn mức nền), dừng để tránh thrash
+                break
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê số lần recycle và RSS đỉnh"""
+        return {
+            **self._stats,
+            "budget_mb": round(self.budget_bytes / MB, 1),
+            "events": list(self._events),
+        }
+
+    def _record(self, action: str, before: int, after: int):
+        event = {
+            "action": action,
+            "before_mb": round(before / MB, 1),
+            "after_mb": round(after / MB, 1),
+            "budget_mb": round(self.budget_bytes / MB, 1),
+            "worker": get_worker_id(),
+            "time": time.time(),
+        }
+        self._events.append(event)
+        self.logger.warning(
+            f"Memory watchdog {action}: {event['before_mb']}MB -> {event['after_mb']}MB "
+            f"(budget {event['budget_mb']}MB, worker {event['worker']})"
+        )
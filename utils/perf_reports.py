@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Perf Reports - Ghi báo cáo performance theo worker và gộp lại khi kết thúc run
+"""
+
+import os
+import glob
+import json
+import logging
+from typing import Any, Dict, List
+
+from utils.browser_pool import get_worker_id
+
+PERF_REPORT_DIR = os.path.join("logs", "perf")
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_report_path(name: str, worker_id: str) -> str:
+    return os.path.join(PERF_REPORT_DIR, f"{name}.{worker_id}.json")
+
+
+def write_worker_report(name: str, data: Dict[str, Any]) -> str:
+    """Ghi báo cáo của worker hiện tại: logs/perf/<name>.<worker>.json"""
+    os.makedirs(PERF_REPORT_DIR, exist_ok=True)
+    path = _worker_report_path(name, get_worker_id())
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    return path
+
+
+def load_worker_reports(name: str) -> List[Dict[str, Any]]:
+    """Đọc tất cả báo cáo worker của một loại báo cáo"""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(PERF_REPORT_DIR, f"{name}.*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                reports.append(json.load(f))
+        except Exception as e:
+            logger.warning(f"Could not read perf report {path}: {e}")
+    return reports
+
+
+def clear_worker_reports():
+    """Xoá báo cáo worker của lần chạy trước (gọi trên controller khi bắt đầu)"""
+    for path in glob.glob(os.path.join(PERF_REPORT_DIR, "*.*.json")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def merge_numeric(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cộng dồn các giá trị số (đệ quy theo dict); giá trị khác giữ bản cuối cùng"""
+    merged: Dict[str, Any] = {}
+    for report in reports:
+        for key, value in report.items():
+            if isinstance(value, bool):
+                merged[key] = value
+            elif isinstance(value, (int, float)):
+                merged[key] = merged.get(key, 0) + value
+            elif isinstance(value, dict):
+                previous = merged.get(key)
+                merged[key] = merge_numeric([previous if isinstance(previous, dict) else {}, value])
+            else:
+                merged[key] = value
+    return merged
+
+
+def write_run_report(name: str, data: Dict[str, Any]) -> str:
+    """Ghi báo cáo cấp run: logs/perf/<name>.json"""
+    os.makedirs(PERF_REPORT_DIR, exist_ok=True)
+    path = os.path.join(PERF_REPORT_DIR, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    logger.info(f"Perf report written: {path}")
+    return path
+
+
+def merge_worker_reports(name: str) -> Dict[str, Any]:
+    """Gộp báo cáo của mọi worker thành logs/perf/<name>.json"""
+    reports = load_worker_reports(name)
+    if not reports:
+        return {}
+    merged = merge_numeric(reports)
+    merged["workers"] = len(reports)
+    write_run_report(name, merged)
+    return merged
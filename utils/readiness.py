@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Readiness Registry - Điều kiện "trang đã sẵn sàng" do page object khai báo, thay cho networkidle
+"""
+
+import time
+import fnmatch
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Literal, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+READINESS_REPORT = "readiness"
+
+
+@dataclass(frozen=True)
+class ReadinessCheck:
+    """Một điều kiện sẵn sàng: element đạt state và/hoặc biểu thức JS trả về truthy"""
+    selector: Optional[str] = None
+    state: Literal["attached", "visible"] = "attached"
+    script: Optional[str] = None
+
+
+def _normalize_url(url: str) -> str:
+    # Bỏ query/fragment: readiness khai báo theo trang, không theo tham số
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path or "/", "", ""))
+
+
+def url_matches(expected: str, url: str) -> bool:
+    """URL có thuộc trang expected không (URL hoặc glob, bỏ qua query/fragment)"""
+    normalized = _normalize_url(url)
+    if any(c in expected for c in "*?["):
+        return fnmatch.fnmatch(normalized, expected)
+    return normalized == _normalize_url(expected)
+
+
+def expected_url(expected: Any) -> str:
+    """URL đích của wait_for_navigation: URL/glob hoặc page object (class hoặc instance) có URL"""
+    url = expected if isinstance(expected, str) else getattr(expected, "URL", None)
+    if not url:
+        raise ValueError(f"Cannot wait for navigation to {expected!r}: expected a URL or a page object with URL")
+    return url
+
+
+class ReadinessRegistry:
+    """Registry URL (hoặc glob URL) -> danh sách ReadinessCheck.
+
+    BasePage.goto/wait_for_navigation điều hướng với wait_until="commit" rồi chỉ
+    đợi các điều kiện đã khai báo; URL chưa khai báo thì giữ cách đợi cũ
+    (networkidle). Với baseline_rate > 0, một phần các lần đợi sẽ đo thêm thời
+    gian từ lúc sẵn sàng tới networkidle để ước lượng thời gian tiết kiệm được.
+    """
+
+    def __init__(self, baseline_rate: float = 0.0):
+        self.logger = logging.getLogger(__name__)
+        self.baseline_rate = baseline_rate
+        self._checks: Dict[str, Tuple[ReadinessCheck, ...]] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "waits": 0,
+            "ready_time": 0.0,
+            "fallbacks": 0,
+            "baseline_samples": 0,
+            "baseline_extra_time": 0.0,
+            "urls": {},
+        }
+
+    def configure(self, baseline_rate: float = 0.0):
+        """Tỉ lệ lần đợi được đo thêm networkidle để so sánh (gọi từ pytest_configure)"""
+        self.baseline_rate = max(0.0, min(1.0, baseline_rate))
+
+    def register(self, url_pattern: str, *checks: ReadinessCheck):
+        """Khai báo điều kiện sẵn sàng cho URL (chấp nhận glob, vd. "**/inventory.html")"""
+        key = url_pattern if any(c in url_pattern for c in "*?[") else _normalize_url(url_pattern)
+        self._checks[key] = tuple(checks)
+
+    def checks_for(self, url: str) -> Tuple[ReadinessCheck, ...]:
+        """Các điều kiện của URL: khớp chính xác trước, sau đó tới glob"""
+        normalized = _normalize_url(url)
+        if normalized in self._checks:
+            return self._checks[normalized]
+        for pattern, checks in self._checks.items():
+            if fnmatch.fnmatch(normalized, pattern):
+                return checks
+        return ()
+
+    # =====================
+    # Đợi (sync / async)
+    # =====================
+    def wait(self, page, url: Optional[str] = None, timeout: float = 10000) -> bool:
+        """Đợi các điều kiện của URL (mặc định page.url); trả về False nếu URL chưa khai báo.
+
+        Hết timeout thì raise TimeoutError của Playwright như page.goto.
+        """
+        url = url or page.url
+        checks = self.checks_for(url)
+        if not checks:
+            return False
+        start_time = time.perf_counter()
+        deadline = start_time + timeout / 1000
+        for check in checks:
+            if check.selector:
+                page.locator(check.selector).first.wait_for(state=check.state, timeout=self._remaining(deadline))
+            if check.script:
+                page.wait_for_function(check.script, timeout=self._remaining(deadline))
+        ready_time = time.perf_counter() - start_time
+        extra_time = None
+        if self._should_sample():
+            extra_start = time.perf_counter()
+            try:
+                page.wait_for_load_state("networkidle", timeout=timeout)
+                extra_time = time.perf_counter() - extra_start
+            except Exception as e:
+                self.logger.debug(f"Networkidle baseline for {url} not reached: {e}")
+        self._record(url, ready_time, extra_time)
+        return True
+
+    async def wait_async(self, page, url: Optional[str] = None, timeout: float = 10000) -> bool:
+        """Bản async của wait() cho AsyncBasePage"""
+        url = url or page.url
+        checks = self.checks_for(url)
+        if not checks:
+            return False
+        start_time = time.perf_counter()
+        deadline = start_time + timeout / 1000
+        for check in checks:
+            if check.selector:
+                await page.locator(check.selector).first.wait_for(state=check.state, timeout=self._remaining(deadline))
+            if check.script:
+                await page.wait_for_function(check.script, timeout=self._remaining(deadline))
+        ready_time = time.perf_counter() - start_time
+        extra_time = None
+        if self._should_sample():
+            extra_start = time.perf_counter()
+            try:
+                await page.wait_for_load_state("networkidle", timeout=timeout)
+                extra_time = time.perf_counter() - extra_start
+            except Exception as e:
+                self.logger.debug(f"Networkidle baseline for {url} not reached: {e}")
+        self._record(url, ready_time, extra_time)
+        return True
+
+    def record_fallback(self):
+        """Ghi nhận một lần phải đợi networkidle vì URL chưa khai báo readiness"""
+        with self._lock:
+            self._stats["fallbacks"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê thời gian đợi readiness và ước lượng thời gian tiết kiệm so với networkidle"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["urls"] = {url: dict(data) for url, data in self._stats["urls"].items()}
+        samples = stats["baseline_samples"]
+        # Ước lượng: thời gian thêm trung bình tới networkidle (từ các mẫu) nhân với số lần đợi
+        stats["estimated_time_saved"] = round(stats["baseline_extra_time"] / samples * stats["waits"], 3) if samples else 0.0
+        return stats
+
+    # =====================
+    # Helpers
+    # =====================
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        return max(1.0, (deadline - time.perf_counter()) * 1000)
+
+    def _should_sample(self) -> bool:
+        # Lấy mẫu đều theo tỉ lệ (không ngẫu nhiên): rate=0.1 -> mỗi lần đợi thứ 10
+        with self._lock:
+            waits = self._stats["waits"] + 1
+        return int(waits * self.baseline_rate) != int((waits - 1) * self.baseline_rate)
+
+    def _record(self, url: str, ready_time: float, extra_time: Optional[float]):
+        key = _normalize_url(url)
+        with self._lock:
+            url_stats = self._stats["urls"].setdefault(
+                key, {"waits": 0, "ready_time": 0.0, "baseline_samples": 0, "baseline_extra_time": 0.0})
+            for stats in (self._stats, url_stats):
+                stats["waits"] += 1
+                stats["ready_time"] += ready_time
+                if extra_time is not None:
+                    stats["baseline_samples"] += 1
+                    stats["baseline_extra_time"] += extra_time
+
+
+# Global instance, page objects đăng ký readiness khi định nghĩa class (BasePage.__init_subclass__)
+readiness_registry = ReadinessRegistry()
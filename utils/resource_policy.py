@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Resource Policy - Chặn request không cần thiết (ảnh, font, CSS, bên thứ ba) theo policy khai báo
+"""
+
+import fnmatch
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+# Ước lượng dung lượng trung bình theo resource type (bytes), dùng khi request bị chặn trước khi tải
+ESTIMATED_BYTES = {
+    "image": 30 * 1024,
+    "media": 500 * 1024,
+    "font": 40 * 1024,
+    "stylesheet": 20 * 1024,
+    "script": 50 * 1024,
+}
+DEFAULT_ESTIMATED_BYTES = 5 * 1024
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Policy chặn request: theo resource type, URL glob hoặc domain bên thứ ba"""
+    name: str
+    block_resource_types: Tuple[str, ...] = ()
+    block_url_patterns: Tuple[str, ...] = ()
+    block_third_party: bool = False
+    # URL khớp allow_url_patterns không bao giờ bị chặn
+    allow_url_patterns: Tuple[str, ...] = ()
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.block_resource_types or self.block_url_patterns or self.block_third_party)
+
+    def block_reason(self, url: str, resource_type: str, first_party_domains: Iterable[str] = ()) -> Optional[str]:
+        """Lý do chặn request (None nếu request được phép)"""
+        if any(fnmatch.fnmatch(url, pattern) for pattern in self.allow_url_patterns):
+            return None
+        if resource_type in self.block_resource_types:
+            return f"type:{resource_type}"
+        for pattern in self.block_url_patterns:
+            if fnmatch.fnmatch(url, pattern):
+                return f"url:{pattern}"
+        if self.block_third_party and url.startswith(("http://", "https://")):
+            host = urlparse(url).hostname or ""
+            if not any(host == domain or host.endswith(f".{domain}") for domain in first_party_domains):
+                return "third-party"
+        return None
+
+
+RESOURCE_POLICIES: Dict[str, ResourcePolicy] = {
+    "none": ResourcePolicy("none"),
+    "no-third-party": ResourcePolicy("no-third-party", block_third_party=True),
+    "lean": ResourcePolicy("lean", block_resource_types=("image", "media", "font")),
+    "mass": ResourcePolicy(
+        "mass",
+        block_resource_types=("image", "media", "font", "stylesheet"),
+        block_third_party=True,
+    ),
+}
+
+
+def policy_from_settings(test_config: Any) -> ResourcePolicy:
+    """Policy tương ứng với TestConfig.disable_images / disable_css / disable_javascript"""
+    types = []
+    if getattr(test_config, "disable_images", False):
+        types.extend(["image", "media"])
+    if getattr(test_config, "disable_css", False):
+        types.extend(["stylesheet", "font"])
+    if getattr(test_config, "disable_javascript", False):
+        types.append("script")
+    return ResourcePolicy("settings", block_resource_types=tuple(types))
+
+
+def get_policy(name: str, test_config: Any = None) -> ResourcePolicy:
+    """Lấy policy theo tên ('settings' = policy từ TestConfig)"""
+    if name == "settings":
+        return policy_from_settings(test_config)
+    if name not in RESOURCE_POLICIES:
+        raise ValueError(f"Unknown resource policy '{name}', expected one of settings, {', '.join(RESOURCE_POLICIES)}")
+    return RESOURCE_POLICIES[name]
+
+
+class _ContextState:
+    """Policy đang áp dụng cho một context và bộ đếm của test hiện tại"""
+
+    def __init__(self, policy: ResourcePolicy):
+        self.policy = policy
+        self.routed = False
+        self.blocked = 0
+        self.est_bytes = 0
+
+
+class ResourceBlocker:
+    """Áp dụng ResourcePolicy bằng một route duy nhất trên mỗi BrowserContext.
+
+    Route chỉ được cài khi policy thực sự chặn gì đó; policy có thể đổi giữa
+    các test dùng chung context (context pool) mà không cần route lại.
+    """
+
+    def __init__(self, first_party_domains: Iterable[str] = ()):
+        self.logger = logging.getLogger(__name__)
+        self.first_party_domains = tuple(first_party_domains)
+        self._contexts = weakref.WeakKeyDictionary()
+        self._stats = {"blocked": 0, "est_bytes_saved": 0, "by_reason": {}, "per_test": {}}
+
+    def configure(self, first_party_urls: Iterable[str]):
+        """Đặt các domain first-party (host của base URL), subdomain cũng được tính"""
+        hosts = [urlparse(url).hostname or url for url in first_party_urls]
+        # www.saucedemo.com -> saucedemo.com để cả các subdomain khác cũng là first-party
+        self.first_party_domains = tuple(dict.fromkeys(
+            host[4:] if host.startswith("www.") else host for host in hosts if host
+        ))
+
+    def apply(self, context, policy: ResourcePolicy):
+        """Đặt policy cho context, cài route nếu cần (một lần cho mỗi context)"""
+        state = self._contexts.get(context)
+        if state is None:
+            state = self._contexts[context] = _ContextState(policy)
+        state.policy = policy
+        if policy.blocks_anything and not state.routed:
+            context.route("**/*", lambda route: self._handle(context, route))
+            state.routed = True
+
+    def detach(self, context):
+        """Gọi sau khi route của context bị xoá (ContextPool reset dùng unroute_all)"""
+        state = self._contexts.get(context)
+        if state is not None:
+            state.routed = False
+
+    def finish_test(self, context, test_id: str) -> Dict[str, int]:
+        """Lấy và reset bộ đếm của test vừa chạy trên context"""
+        state = self._contexts.get(context)
+        if state is None:
+            return {"blocked": 0, "est_bytes_saved": 0}
+        result = {"blocked": state.blocked, "est_bytes_saved": state.est_bytes}
+        state.blocked = 0
+        state.est_bytes = 0
+        if result["blocked"]:
+            self._stats["per_test"][test_id] = result
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê request bị chặn (tổng, theo lý do, theo test)"""
+        return {
+            "blocked": self._stats["blocked"],
+            "est_bytes_saved": self._stats["est_bytes_saved"],
+            "by_reason": dict(self._stats["by_reason"]),
+            "per_test": dict(self._stats["per_test"]),
+        }
+
+    def _handle(self, context, route):
+        state = self._contexts.get(context)
+        request = route.request
+        reason = None
+        if state is not None:
+            reason = state.policy.block_reason(request.url, request.resource_type, self.first_party_domains)
+        if reason is None:
+            route.fallback()
+            return
+        route.abort("blockedbyclient")
+        size = ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+        state.blocked += 1
+        state.est_bytes += size
+        self._stats["blocked"] += 1
+        self._stats["est_bytes_saved"] += size
+        self._stats["by_reason"][reason] = self._stats["by_reason"].get(reason, 0) + 1
+
+
+# Global instance, first-party domains được set bởi pytest_configure (--app-base-url)
+resource_blocker = ResourceBlocker()
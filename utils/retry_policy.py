@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Retry Policy - Retry theo loại lỗi với jittered backoff và ngân sách retry cho mỗi test
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from utils.wait_accounting import wait_accounting
+
+ERROR_CLASSES = ("timeout", "detached", "intercepted", "navigation", "closed", "other")
+
+# Dấu hiệu trong dòng đầu message lỗi của Playwright (kiểm tra theo thứ tự, sau các loại timeout)
+_ERROR_PATTERNS = (
+    ("closed", ("has been closed", "Target closed", "Browser closed", "Connection closed")),
+    ("navigation", ("Execution context was destroyed", "navigating", "Navigation failed", "frame was detached",
+                    "net::ERR_ABORTED")),
+    ("detached", ("not attached to the DOM", "Element is detached", "detached from the DOM", "stale")),
+    ("intercepted", ("intercepts pointer events", "element is outside of the viewport", "not stable")),
+)
+
+# Hệ số backoff theo loại lỗi: action của Playwright đã tự chờ actionability tới hết timeout,
+# nên timeout của Playwright retry ngay; timeout khác (socket, asyncio, API) backoff bình thường;
+# DOM/navigation đang thay đổi thì chờ một nhịp ngắn
+_BACKOFF_WEIGHTS = {"playwright_timeout": 0.0, "timeout": 1.0, "detached": 0.5, "intercepted": 1.0,
+                    "navigation": 1.0, "other": 1.0}
+# Page/context/browser đã đóng thì retry không bao giờ thành công
+NON_RETRYABLE = {"closed"}
+
+
+def classify_error(error: BaseException) -> str:
+    """Phân loại exception thành timeout/detached/intercepted/navigation/closed/other"""
+    if isinstance(error, (PlaywrightTimeoutError, TimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    # Chỉ xét dòng đầu: "Call log" phía sau liệt kê các bước Playwright đã thử khi chờ
+    # (vd. "navigating to ...", "element is not stable") chứ không phải nguyên nhân lỗi
+    lines = str(error).strip().splitlines()
+    message = lines[0] if lines else ""
+    for error_class, patterns in _ERROR_PATTERNS:
+        if any(pattern.lower() in message.lower() for pattern in patterns):
+            return error_class
+    if isinstance(error, PlaywrightError) and "Timeout" in message:
+        return "timeout"
+    return "other"
+
+
+def backoff_class(error: BaseException, error_class: str) -> str:
+    """Khoá hệ số backoff: timeout của Playwright ("playwright_timeout") tách khỏi các timeout khác"""
+    if error_class != "timeout":
+        return error_class
+    if isinstance(error, PlaywrightTimeoutError) or (isinstance(error, PlaywrightError) and "Timeout" in str(error)):
+        return "playwright_timeout"
+    return error_class
+
+
+class RetryPolicy:
+    """Policy retry dùng chung cho BasePage, AsyncBasePage và CommonFunctions.retry_action.
+
+    Mỗi lần thất bại được phân loại; lỗi không retry được (closed) raise ngay.
+    Thời gian chờ = base_delay * backoff_factor^attempt * hệ số loại lỗi, có jitter
+    và giới hạn max_delay. Mỗi test có ngân sách số lần retry và số giây sleep;
+    hết ngân sách thì lỗi được raise luôn thay vì retry tiếp. Thời gian sleep được
+    cộng dồn theo test để báo cáo.
+    """
+
+    def __init__(self, base_delay: float = 0.25, backoff_factor: float = 2.0, max_delay: float = 2.0,
+                 jitter: float = 0.5, max_retries_per_test: int = 10, max_sleep_per_test: float = 10.0,
+                 rng: Optional[random.Random] = None):
+        self.logger = logging.getLogger(__name__)
+        self.base_delay = base_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_retries_per_test = max_retries_per_test
+        self.max_sleep_per_test = max_sleep_per_test
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._test_id: Optional[str] = None
+        self._test_usage = {"retries": 0, "sleep_time": 0.0}
+        self._stats: Dict[str, Any] = {
+            "calls": 0,
+            "failures": 0,
+            "retries": 0,
+            "sleep_time": 0.0,
+            "budget_exhausted": 0,
+            "errors": {error_class: 0 for error_class in ERROR_CLASSES},
+            "tests": {},
+        }
+
+    def configure(self, max_retries_per_test: Optional[int] = None, max_sleep_per_test: Optional[float] = None):
+        """Đặt ngân sách retry cho mỗi test (gọi từ pytest_configure)"""
+        if max_retries_per_test is not None:
+            self.max_retries_per_test = max_retries_per_test
+        if max_sleep_per_test is not None:
+            self.max_sleep_per_test = max_sleep_per_test
+
+    # =====================
+    # Ngân sách theo test
+    # =====================
+    def begin_test(self, test_id: str):
+        """Bắt đầu ngân sách mới cho test"""
+        with self._lock:
+            self._test_id = test_id
+            self._test_usage = {"retries": 0, "sleep_time": 0.0}
+
+    def end_test(self) -> Dict[str, Any]:
+        """Kết thúc test; lưu lại retry/sleep của test nếu có retry"""
+        with self._lock:
+            usage = dict(self._test_usage)
+            if self._test_id and usage["retries"]:
+                self._stats["tests"][self._test_id] = {**usage, "sleep_time": round(usage["sleep_time"], 3)}
+            self._test_id = None
+            self._test_usage = {"retries": 0, "sleep_time": 0.0}
+        return usage
+
+    def budget_remaining(self) -> bool:
+        with self._lock:
+            return (self._test_usage["retries"] < self.max_retries_per_test
+                    and self._test_usage["sleep_time"] < self.max_sleep_per_test)
+
+    # =====================
+    # Quyết định retry
+    # =====================
+    def backoff(self, attempt: int, error_class: str, base_delay: Optional[float] = None,
+                backoff_factor: Optional[float] = None) -> float:
+        """Thời gian chờ trước lần thử attempt+1 (attempt tính từ 0); error_class là khoá của backoff_class()"""
+        base_delay = self.base_delay if base_delay is None else base_delay
+        backoff_factor = self.backoff_factor if backoff_factor is None else backoff_factor
+        delay = base_delay * (backoff_factor ** attempt) * _BACKOFF_WEIGHTS.get(error_class, 1.0)
+        delay = min(delay, self.max_delay)
+        # Jitter: giữ (1 - jitter) phần cố định, phần còn lại ngẫu nhiên để các worker không retry cùng nhịp
+        delay = delay * (1 - self.jitter) + self._rng.uniform(0, delay * self.jitter)
+        with self._lock:
+            return max(0.0, min(delay, self.max_sleep_per_test - self._test_usage["sleep_time"]))
+
+    def _on_failure(self, error: BaseException, attempt: int, attempts: int, description: str, backoff_args):
+        """Ghi nhận lỗi; trả về (error_class, delay), delay là None nếu không retry nữa"""
+        error_class = classify_error(error)
+        with self._lock:
+            self._stats["failures"] += 1
+            self._stats["errors"][error_class] += 1
+        if error_class in NON_RETRYABLE or attempt >= attempts - 1:
+            return error_class, None
+        if not self.budget_remaining():
+            with self._lock:
+                self._stats["budget_exhausted"] += 1
+            self.logger.warning(f"Retry budget exhausted for {self._test_id}, not retrying {description or 'action'}")
+            return error_class, None
+        delay = self.backoff(attempt, backoff_class(error, error_class), *backoff_args)
+        self.logger.warning(f"{description or 'Action'} failed ({error_class}, attempt {attempt + 1}/{attempts}): "
+                            f"{error}. Retrying in {delay:.2f}s")
+        return error_class, delay
+
+    def _record_retry(self, delay: float):
+        with self._lock:
+            self._stats["retries"] += 1
+            self._stats["sleep_time"] += delay
+            self._test_usage["retries"] += 1
+            self._test_usage["sleep_time"] += delay
+
+    # =====================
+    # Thực thi
+    # =====================
+    def call(self, func: Callable[[], Any], attempts: int = 3, description: str = "",
+             on_retry: Optional[Callable[[str], None]] = None,
+             base_delay: Optional[float] = None, backoff_factor: Optional[float] = None) -> Any:
+        """Gọi func, retry theo policy; on_retry(error_class) chạy trước mỗi lần thử lại"""
+        with self._lock:
+            self._stats["calls"] += 1
+        for attempt in range(max(1, attempts)):
+            try:
+                return func()
+            except Exception as e:
+                error_class, delay = self._on_failure(e, attempt, attempts, description, (base_delay, backoff_factor))
+                if delay is None:
+                    raise
+                self._record_retry(delay)
+                if delay:
+                    with wait_accounting.span("retry_sleep"):
+                        time.sleep(delay)
+                if on_retry:
+                    on_retry(error_class)
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]], attempts: int = 3, description: str = "",
+                         on_retry: Optional[Callable[[str], Awaitable[None]]] = None,
+                         base_delay: Optional[float] = None, backoff_factor: Optional[float] = None) -> Any:
+        """Bản async của call(): chờ bằng asyncio.sleep để không chặn các page khác"""
+        with self._lock:
+            self._stats["calls"] += 1
+        for attempt in range(max(1, attempts)):
+            try:
+                return await func()
+            except Exception as e:
+                error_class, delay = self._on_failure(e, attempt, attempts, description, (base_delay, backoff_factor))
+                if delay is None:
+                    raise
+                self._record_retry(delay)
+                if delay:
+                    with wait_accounting.span("retry_sleep"):
+                        await asyncio.sleep(delay)
+                if on_retry:
+                    await on_retry(error_class)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê retry theo loại lỗi, tổng thời gian sleep và các test có retry"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["errors"] = dict(self._stats["errors"])
+            stats["tests"] = dict(self._stats["tests"])
+            stats["sleep_time"] = round(stats["sleep_time"], 3)
+        return stats
+
+
+# Global instance, ngân sách được set bởi pytest_configure
+retry_policy = RetryPolicy()
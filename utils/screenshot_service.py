@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Screenshot Service - Chụp screenshot một lần ra bytes, ghi file ở thread nền, bỏ qua ảnh trùng
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import allure
+
+SCREENSHOT_FORMATS = ("png", "jpeg")
+
+
+class ScreenshotService:
+    """Dịch vụ screenshot dùng chung cho page objects, helpers và fixtures.
+
+    Playwright encode ảnh (PNG hoặc JPEG theo quality) trong browser và trả về
+    bytes; thread pool lo ghi file và metadata. Allure được attach ngay
+    từ bytes trên thread của test (allure-pytest lưu step hiện tại theo thread),
+    nên không file nào phải đọc lại. Ảnh giống hệt ảnh trước đó của cùng page
+    thì không ghi lại mà dùng lại file cũ.
+
+    Code chạy trên loop thread của async runner không được attach trực tiếp
+    (allure-commons gắn thread phụ vào test đầu tiên nó thấy): attachment được
+    xếp hàng bằng defer_attach=True / defer_attachment() và test thread gọi
+    attach_deferred() sau khi runner.run() trả về.
+    """
+
+    def __init__(self, directory: str = "screenshots", image_format: str = "png",
+                 quality: int = 80, max_workers: int = 2):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self._last_capture: Dict[int, Any] = {}
+        self._deferred: List[Tuple[Any, str, Any]] = []
+        self._stats = {"captures": 0, "deduplicated": 0, "bytes_written": 0, "capture_time": 0.0, "write_time": 0.0}
+        self.configure(image_format, quality)
+
+    def configure(self, image_format: str = "png", quality: int = 80):
+        """Đặt format mặc định (png/jpeg) và JPEG quality (gọi từ pytest_configure)"""
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unknown screenshot format '{image_format}', expected one of {', '.join(SCREENSHOT_FORMATS)}")
+        self.image_format = image_format
+        self.quality = max(0, min(100, quality))
+
+    def screenshot_options(self, full_page: bool = True, clip: Optional[Dict[str, float]] = None,
+                           image_format: Optional[str] = None, quality: Optional[int] = None) -> Dict[str, Any]:
+        """Tham số cho page.screenshot() (dùng chung cho sync và async API)"""
+        image_format = image_format or self.image_format
+        options: Dict[str, Any] = {"type": image_format}
+        if clip:
+            options["clip"] = clip
+        else:
+            options["full_page"] = full_page
+        if image_format == "jpeg":
+            options["quality"] = self.quality if quality is None else quality
+        return options
+
+    def capture(self, page, name: str = "", full_page: bool = True, clip: Optional[Dict[str, float]] = None,
+                image_format: Optional[str] = None, quality: Optional[int] = None,
+                attach_name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Chụp page (sync API) và giao việc ghi file cho thread nền; trả về đường dẫn file"""
+        options = self.screenshot_options(full_page, clip, image_format, quality)
+        start_time = time.time()
+        image = page.screenshot(**options)
+        self._stats["capture_time"] += time.time() - start_time
+        return self.save(image, name, options["type"], attach_name=attach_name, metadata=metadata, source=page)
+
+    def save(self, image: bytes, name: str = "", image_format: Optional[str] = None,
+             attach_name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None,
+             source: Any = None, defer_attach: bool = False) -> str:
+        """Attach bytes vào Allure và ghi file ở thread nền (bỏ qua nếu trùng ảnh trước của source).
+
+        defer_attach=True: chỉ xếp hàng attachment, test thread attach bằng attach_deferred()
+        """
+        image_format = image_format or self.image_format
+        path = os.path.join(self.directory, self._file_name(name, image_format))
+        self._stats["captures"] += 1
+
+        if attach_name:
+            attachment_type = allure.attachment_type.JPG if image_format == "jpeg" else allure.attachment_type.PNG
+            if defer_attach:
+                self.defer_attachment(image, attach_name, attachment_type)
+            else:
+                allure.attach(image, attach_name, attachment_type)
+
+        digest = hashlib.sha1(image).hexdigest()
+        key = id(source) if source is not None else None
+        previous = self._last_capture.get(key)
+        if previous and previous[0] == digest:
+            self._stats["deduplicated"] += 1
+            path = previous[1]
+        else:
+            self._last_capture[key] = (digest, path)
+            self._submit(self._write_file, path, image)
+        if metadata:
+            metadata_path = f"{os.path.splitext(os.path.join(self.directory, self._file_name(name, image_format)))[0]}_metadata.json"
+            self._submit(self._write_metadata, metadata_path, {**metadata, "image": path})
+        return path
+
+    def defer_attachment(self, body: Any, name: str, attachment_type: Any):
+        """Xếp hàng một Allure attachment tạo ngoài test thread (vd. trên loop thread async)"""
+        with self._lock:
+            self._deferred.append((body, name, attachment_type))
+
+    def attach_deferred(self) -> int:
+        """Attach các attachment đã xếp hàng vào test hiện tại; gọi trên test thread"""
+        with self._lock:
+            deferred, self._deferred = self._deferred, []
+        for body, name, attachment_type in deferred:
+            allure.attach(body, name, attachment_type)
+        return len(deferred)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Đợi mọi file đang ghi nền hoàn tất"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result(timeout)
+            except Exception as e:
+                self.logger.warning(f"Screenshot write failed: {e}")
+
+    def shutdown(self):
+        """Ghi nốt các file còn lại và dừng thread pool"""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._last_capture.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Thống kê số ảnh chụp, số ảnh trùng không ghi và dung lượng đã ghi"""
+        return dict(self._stats)
+
+    # =====================
+    # Helpers
+    # =====================
+    @staticmethod
+    def _file_name(name: str, image_format: str) -> str:
+        extension = "jpg" if image_format == "jpeg" else "png"
+        if not name:
+            name = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        base, ext = os.path.splitext(name)
+        return f"{base}.{extension}" if ext.lower() in (".png", ".jpg", ".jpeg") else f"{name}.{extension}"
+
+    def _submit(self, func, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="screenshot")
+            # Giữ lại future chưa xong để flush() đợi, future đã xong thì chỉ cần log lỗi
+            for future in self._pending:
+                if future.done() and future.exception() is not None:
+                    self.logger.warning(f"Screenshot write failed: {future.exception()}")
+            self._pending = [future for future in self._pending if not future.done()]
+            self._pending.append(self._executor.submit(func, *args))
+
+    def _write_file(self, path: str, image: bytes):
+        start_time = time.time()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(image)
+        with self._lock:
+            self._stats["bytes_written"] += len(image)
+            self._stats["write_time"] += time.time() - start_time
+
+    @staticmethod
+    def _write_metadata(path: str, metadata: Dict[str, Any]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False, default=str)
+
+
+# Global instance, format/quality được set bởi pytest_configure
+screenshot_service = ScreenshotService()
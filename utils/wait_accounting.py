@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Wait Accounting - Chia wall time của mỗi test thành action, explicit wait, implicit wait, retry sleep
+và chỉ ra các chỗ sleep cố định tốn thời gian nhất
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+import contextlib
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.perf_reports import load_worker_reports, write_run_report
+
+WAIT_ACCOUNTING_REPORT = "wait_accounting"
+# action: thao tác page object; explicit_wait: page.wait_for_timeout / time.sleep;
+# implicit_wait: BasePage đợi selector/navigation/readiness; retry_sleep: backoff của retry_policy
+CATEGORIES = ("action", "explicit_wait", "implicit_wait", "retry_sleep")
+IDLE_CATEGORIES = ("explicit_wait", "implicit_wait", "retry_sleep")
+# Số test / call site tốn thời gian chờ nhất giữ lại trong báo cáo run
+TOP_ENTRIES = 20
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frame bỏ qua khi tìm call site: chính module này, Playwright, BasePage và retry policy
+_SKIPPED_PATHS = (
+    os.path.abspath(__file__),
+    os.path.join(_ROOT_DIR, "pages", "base") + os.sep,
+    os.path.join(_ROOT_DIR, "utils", "retry_policy.py"),
+    os.path.join(_ROOT_DIR, "utils", "common_functions.py"),
+    os.path.join("site-packages", "playwright") + os.sep,
+    os.path.abspath(contextlib.__file__),
+)
+
+_original_sleep = time.sleep
+
+
+class _Span:
+    __slots__ = ("category", "site", "start", "child")
+
+    def __init__(self, category: str, site: Optional[str]):
+        self.category = category
+        self.site = site
+        self.start = time.perf_counter()
+        self.child = 0.0
+
+
+# Stack span đang mở (tuple bất biến: mỗi asyncio task/thread có stack riêng)
+_spans: ContextVar[Tuple[_Span, ...]] = ContextVar("wait_spans", default=())
+
+
+def call_site(depth: int = 2) -> str:
+    """file:line của code gọi wait (bỏ qua frame của framework và Playwright)"""
+    frame = sys._getframe(depth)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not any(skipped in filename for skipped in _SKIPPED_PATHS):
+            return f"{os.path.relpath(filename, _ROOT_DIR)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _new_totals() -> Dict[str, float]:
+    return {category: 0.0 for category in CATEGORIES}
+
+
+class WaitAccounting:
+    """Đo thời gian theo loại trong mỗi test bằng các span lồng nhau.
+
+    Mỗi span chỉ tính thời gian riêng của nó (trừ thời gian các span con), nên
+    wait_for_selector bên trong get_text được tính là implicit wait chứ không
+    phải action. Phần wall time còn lại (fixture, assert, code test) là "other".
+    Explicit wait, implicit wait và retry sleep được gom thêm theo call site.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._installed: List[Tuple[Any, str, Any]] = []
+        self._test_id: Optional[str] = None
+        self._test_thread: Optional[int] = None
+        self._test_start = 0.0
+        self._test_totals = _new_totals()
+        self._test_sites: Dict[str, float] = {}
+        self._tests: Dict[str, Dict[str, Any]] = {}
+        self._sites: Dict[str, Dict[str, Any]] = {}
+
+    # =====================
+    # Span
+    # =====================
+    def enter(self, category: str, site: Optional[str] = None):
+        """Mở span; trả về token cho exit() (None khi không có test đang chạy)"""
+        if self._test_id is None:
+            return None
+        span = _Span(category, site)
+        return span, _spans.set(_spans.get() + (span,))
+
+    def exit(self, token):
+        """Đóng span, cộng thời gian riêng của span vào test (và call site nếu có)"""
+        if token is None:
+            return
+        span, context_token = token
+        duration = time.perf_counter() - span.start
+        _spans.reset(context_token)
+        parent = _spans.get()
+        if parent:
+            parent[-1].child += duration
+        own = max(0.0, duration - span.child)
+        with self._lock:
+            if self._test_id is None:
+                return
+            self._test_totals[span.category] += own
+            if span.site:
+                key = f"{span.category} {span.site}"
+                self._test_sites[key] = self._test_sites.get(key, 0.0) + own
+                site_stats = self._sites.setdefault(key, {"calls": 0, "time": 0.0})
+                site_stats["calls"] += 1
+                site_stats["time"] += own
+
+    @contextlib.contextmanager
+    def span(self, category: str, with_site: bool = True) -> Iterator[None]:
+        """Đo một đoạn chờ; with_site=True thì gom thêm theo call site"""
+        token = self.enter(category, call_site() if with_site and self._test_id is not None else None)
+        try:
+            yield
+        finally:
+            self.exit(token)
+
+    # =====================
+    # Hook Playwright / time.sleep
+    # =====================
+    def install(self):
+        """Bọc page.wait_for_timeout (sync/async) và time.sleep để đo explicit wait"""
+        if self._installed:
+            return
+        from playwright.async_api import Frame as AsyncFrame, Page as AsyncPage
+        from playwright.sync_api import Frame, Page
+
+        accounting = self
+        for cls in (Page, Frame):
+            original = cls.wait_for_timeout
+
+            def wait_for_timeout(page_self, timeout, _original=original):
+                with accounting.span("explicit_wait"):
+                    return _original(page_self, timeout)
+            self._patch(cls, "wait_for_timeout", wait_for_timeout)
+        for cls in (AsyncPage, AsyncFrame):
+            original = cls.wait_for_timeout
+
+            async def wait_for_timeout_async(page_self, timeout, _original=original):
+                with accounting.span("explicit_wait"):
+                    return await _original(page_self, timeout)
+            self._patch(cls, "wait_for_timeout", wait_for_timeout_async)
+
+        def sleep(seconds):
+            # Chỉ đo sleep trên thread của test, ngoài các span chờ đã được đo (vd. retry_sleep)
+            spans = _spans.get()
+            if (accounting._test_id is None or threading.get_ident() != accounting._test_thread
+                    or (spans and spans[-1].category != "action")):
+                return _original_sleep(seconds)
+            with accounting.span("explicit_wait"):
+                return _original_sleep(seconds)
+        self._patch(time, "sleep", sleep)
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._installed):
+            setattr(owner, name, original)
+        self._installed = []
+
+    def _patch(self, owner: Any, name: str, replacement: Any):
+        self._installed.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    # =====================
+    # Theo test
+    # =====================
+    def begin_test(self, test_id: str):
+        with self._lock:
+            self._test_id = test_id
+            self._test_thread = threading.get_ident()
+            self._test_start = time.perf_counter()
+            self._test_totals = _new_totals()
+            self._test_sites = {}
+
+    def end_test(self) -> Dict[str, Any]:
+        """Tóm tắt thời gian của test vừa chạy; cảnh báo nếu test có sleep cố định"""
+        with self._lock:
+            if self._test_id is None:
+                return {}
+            test_id = self._test_id
+            wall = time.perf_counter() - self._test_start
+            summary: Dict[str, Any] = {name: round(value, 3) for name, value in self._test_totals.items()}
+            summary["wall"] = round(wall, 3)
+            summary["idle"] = round(sum(self._test_totals[name] for name in IDLE_CATEGORIES), 3)
+            # Async test chạy nhiều page song song nên tổng các loại có thể vượt wall time
+            summary["other"] = round(max(0.0, wall - sum(self._test_totals.values())), 3)
+            fixed_sleeps = {key: round(value, 3) for key, value in self._test_sites.items()
+                            if key.startswith("explicit_wait ")}
+            if fixed_sleeps:
+                summary["fixed_sleeps"] = fixed_sleeps
+            self._tests[test_id] = summary
+            self._test_id = None
+            self._test_thread = None
+        if fixed_sleeps:
+            self.logger.warning("%s spent %.2fs in fixed sleeps: %s", test_id, summary["explicit_wait"],
+                                ", ".join(key.split(" ", 1)[1] for key in fixed_sleeps))
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Báo cáo của worker: tổng theo loại, từng test và từng call site"""
+        with self._lock:
+            tests = {test_id: dict(summary) for test_id, summary in self._tests.items()}
+            sites = {key: {"calls": data["calls"], "time": round(data["time"], 3)} for key, data in self._sites.items()}
+        totals = {name: round(sum(summary[name] for summary in tests.values()), 3)
+                  for name in CATEGORIES + ("wall", "idle", "other")}
+        return {"totals": totals, "tests": tests, "sites": sites}
+
+
+def merge_wait_reports() -> Dict[str, Any]:
+    """Gộp báo cáo của mọi worker: logs/perf/wait_accounting.json với test và call site chờ nhiều nhất"""
+    reports = load_worker_reports(WAIT_ACCOUNTING_REPORT)
+    if not reports:
+        return {}
+    totals: Dict[str, float] = {}
+    tests: Dict[str, Dict[str, Any]] = {}
+    sites: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        for name, value in report.get("totals", {}).items():
+            totals[name] = round(totals.get(name, 0.0) + value, 3)
+        tests.update(report.get("tests", {}))
+        for key, data in report.get("sites", {}).items():
+            merged = sites.setdefault(key, {"calls": 0, "time": 0.0})
+            merged["calls"] += data["calls"]
+            merged["time"] = round(merged["time"] + data["time"], 3)
+    ordered_sites = sorted(sites.items(), key=lambda item: item[1]["time"], reverse=True)
+    ordered_tests = sorted(tests.items(), key=lambda item: item[1].get("idle", 0), reverse=True)
+    run_report = {
+        "workers": len(reports),
+        "tests": len(tests),
+        "totals": totals,
+        "idle_share": round(totals.get("idle", 0.0) / totals["wall"], 3) if totals.get("wall") else 0.0,
+        "most_idle_tests": dict(ordered_tests[:TOP_ENTRIES]),
+        "most_idle_sites": dict(ordered_sites[:TOP_ENTRIES]),
+        "fixed_sleeps": {key.split(" ", 1)[1]: data for key, data in ordered_sites if key.startswith("explicit_wait ")},
+    }
+    write_run_report(WAIT_ACCOUNTING_REPORT, run_report)
+    return run_report
+
+
+# Global instance, cài hook trong pytest_configure; BasePage/retry_policy mở span
+wait_accounting = WaitAccounting()